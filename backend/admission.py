@@ -0,0 +1,188 @@
+"""
+이미지 처리 입장 제어 모듈
+워커 프로세스마다 동시에 처리하는 이미지 수와 예상 메모리 사용량을 제한합니다.
+
+스캔 한 건은 원본 바이트, base64 문자열, PIL 이미지, NumPy 배열, BGR 배열을 동시에 들고 있으므로
+업로드가 몰리면 워커 메모리가 부족해질 수 있습니다. 이미지 헤더(가로/세로/채널 수)로 디코딩 후 크기를
+추정하여 예산(OCR_MEMORY_BUDGET_MB) 안에서만 처리하고, 넘치면 잠시 대기시킨 뒤 그래도 안 되면 거절합니다.
+
+사용 예:
+    cost = await run_in_threadpool(estimate_image_memory, file.file, file.size)
+    async with ocr_admission.admit_async(cost):
+        ...
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import BinaryIO, Optional
+from config import config
+from metrics import OCR_ADMISSION_REJECTED, register_admission_metrics
+
+
+class AdmissionRejected(Exception):
+    """처리 예산 초과로 거절 (reason: busy, queue_full, timeout, too_large)"""
+    
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+def estimate_image_memory(file: BinaryIO, size: int) -> int:
+    """
+    이미지 한 건을 처리하는 동안 필요한 최대 메모리 추정 (바이트)
+    
+    전체를 디코딩하지 않고 헤더만 읽으며, 파일 위치는 원래대로 되돌립니다.
+    이미지가 아니면 압축된 크기 기준으로만 계산합니다.
+    """
+    from PIL import Image
+    
+    position = file.tell()
+    try:
+        with Image.open(file) as image:
+            width, height = image.size
+            bands = len(image.getbands())
+    except Image.DecompressionBombError:
+        # 픽셀 수가 PIL 제한을 넘는 이미지는 예산과 관계없이 거절되도록 매우 큰 값으로 계산
+        return 1 << 62
+    except Exception:
+        width = height = 0
+        bands = 0
+    finally:
+        file.seek(position)
+    
+    pixels = width * height
+    # 원본 + base64 문자열 + 디코딩한 바이트, PIL 이미지 + NumPy 배열(RGB) + BGR 배열
+    return int(size * (1 + 4 / 3 + 1)) + pixels * (bands + 3 + 3)
+
+
+class AdmissionController:
+    """동시 처리 수(세마포어)와 메모리 예산을 함께 관리하는 입장 제어 (스레드/이벤트 루프 양쪽에서 사용)"""
+    
+    def __init__(self, max_concurrent: int, budget_bytes: int, max_waiting: int, timeout: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.budget_bytes = budget_bytes
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.active = 0
+        self.bytes_in_use = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+        self._wait_executor = None
+        self._wait_executor_lock = threading.Lock()
+    
+    def _fits(self, cost: int) -> bool:
+        return self.active < self.max_concurrent and self.bytes_in_use + cost <= self.budget_bytes
+    
+    def _reject(self, reason: str, message: str) -> AdmissionRejected:
+        OCR_ADMISSION_REJECTED.inc(reason=reason)
+        return AdmissionRejected(reason, message)
+    
+    def check_size(self, cost: int) -> None:
+        """
+        한 건이 전체 예산 안에 들어가는지 확인 (처리 시점이 아니라 등록 시점에 거절할 때 사용)
+        
+        Raises:
+            AdmissionRejected: 전체 예산보다 큰 경우 (too_large)
+        """
+        if cost > self.budget_bytes:
+            raise self._reject("too_large", "이미지가 너무 커서 처리할 수 없습니다.")
+    
+    def acquire(self, cost: int, timeout: Optional[float] = None, wait: bool = True, queue: bool = True) -> None:
+        """
+        처리 예산 확보 (확보할 때까지 최대 timeout 초 대기, None이면 무한 대기)
+        
+        queue=False 면 요청 대기열(max_waiting)과 별도로 기다리며, 시간 초과는 거절 지표에 남기지 않습니다
+        (OCR 작업 워커처럼 시간 초과 후 다시 기다리는 경우).
+        
+        Raises:
+            AdmissionRejected: 한 건이 전체 예산보다 크거나, 대기열이 가득 찼거나, 시간 초과
+        """
+        self.check_size(cost)
+        with self._condition:
+            if not self._fits(cost):
+                if not wait:
+                    raise AdmissionRejected("busy", "처리 중인 이미지가 많습니다.")
+                if queue and self.waiting >= self.max_waiting:
+                    raise self._reject("queue_full", "처리 대기 중인 이미지가 너무 많습니다.")
+                if queue:
+                    self.waiting += 1
+                try:
+                    admitted = self._condition.wait_for(lambda: self._fits(cost), timeout)
+                finally:
+                    if queue:
+                        self.waiting -= 1
+                if not admitted:
+                    if not queue:
+                        raise AdmissionRejected("timeout", "이미지 처리 대기 시간이 초과되었습니다.")
+                    raise self._reject("timeout", "이미지 처리 대기 시간이 초과되었습니다.")
+            self.active += 1
+            self.bytes_in_use += cost
+    
+    def release(self, cost: int) -> None:
+        with self._condition:
+            self.active -= 1
+            self.bytes_in_use -= cost
+            self._condition.notify_all()
+    
+    @contextmanager
+    def admit(self, cost: int, timeout: Optional[float] = None, queue: bool = True):
+        """스레드에서 사용 (OCR 작업 워커 등)"""
+        self.acquire(cost, timeout, queue=queue)
+        try:
+            yield
+        finally:
+            self.release(cost)
+    
+    def _get_wait_executor(self) -> ThreadPoolExecutor:
+        """
+        대기 요청 전용 스레드 풀 (워커 프로세스마다 처음 사용할 때 생성)
+        
+        대기 중인 요청은 최대 OCR_ADMISSION_TIMEOUT_SECONDS 동안 스레드를 붙잡으므로 기본 스레드 풀을 쓰면
+        같은 풀을 쓰는 다른 작업(SSE 이벤트 조회, 프로파일링 등)이 밀립니다. 대기열 크기만큼만 만듭니다.
+        """
+        if self._wait_executor is None:
+            with self._wait_executor_lock:
+                if self._wait_executor is None:
+                    self._wait_executor = ThreadPoolExecutor(
+                        max_workers=max(1, self.max_waiting), thread_name_prefix="ocr-admission"
+                    )
+        return self._wait_executor
+    
+    @asynccontextmanager
+    async def admit_async(self, cost: int):
+        """
+        이벤트 루프에서 사용 (요청 처리)
+        
+        바로 처리할 수 있으면 대기 없이 진행하고, 아니면 대기 전용 스레드 풀에서
+        최대 OCR_ADMISSION_TIMEOUT_SECONDS 동안 기다립니다.
+        """
+        try:
+            self.acquire(cost, wait=False)
+        except AdmissionRejected as e:
+            if e.reason != "busy":
+                raise
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_wait_executor(), self.acquire, cost, self.timeout)
+            try:
+                await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 대기 중 요청이 취소되어도 나중에 확보된 예산은 돌려줌
+                future.add_done_callback(lambda done: done.exception() is None and self.release(cost))
+                raise
+        
+        try:
+            yield
+        finally:
+            self.release(cost)
+
+
+# 전역 입장 제어 인스턴스 (워커 프로세스마다 따로 동작)
+ocr_admission = AdmissionController(
+    max_concurrent=config.OCR_MAX_CONCURRENT,
+    budget_bytes=config.OCR_MEMORY_BUDGET_MB * 1024 * 1024,
+    max_waiting=config.OCR_ADMISSION_MAX_WAITING,
+    timeout=config.OCR_ADMISSION_TIMEOUT_SECONDS
+)
+register_admission_metrics(ocr_admission)
@@ -3,25 +3,37 @@ API 라우트 모듈
 FastAPI 라우트들을 정의합니다.
 """
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Query
-from fastapi.responses import JSONResponse
-from clova_ocr import ClovaOCREngine
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query, Request, Depends
+from fastapi.responses import StreamingResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from clova_ocr import get_ocr_engine, run_ocr
+from admission import AdmissionRejected, estimate_image_memory, ocr_admission
 from config import config
 from models import MealCreate, MealUpdate, ApiResponse
 from meals_service import meals_service
 from user_service import user_service
+from reference_data import average_nutrition_cache
+from nutrition_service import nutrition_service
+import invalidation
+from auth import SessionClaims, get_session, require_admin, session_manager
+from logger import get_logger
+import metrics
+from tracing import ocr_stage, start_trace
+from responses import APIResponse, api_response, make_etag, etag_headers, not_modified
 from user_models import UserProfileCreate, UserProfileUpdate, GoogleAuthRequest
 from database import Database
+from ocr_jobs import ocr_job_store, ocr_job_runner, job_events
+from warmup import warmup
 from datetime import date, datetime
 from typing import Optional, List
+from uuid import UUID
 import random
 import json
+import io
 
 # 라우터 생성
 router = APIRouter()
-
-# OCR 엔진 초기화
-ocr_engine = ClovaOCREngine(config.CLOVA_OCR_API_URL, config.CLOVA_OCR_SECRET_KEY)
+logger = get_logger(__name__)
 
 def estimate_nutrition_from_image(roi_result, use_roi):
     """
@@ -94,7 +106,7 @@ def estimate_nutrition_from_image(roi_result, use_roi):
         '트랜스지방': 0 if nutrition_type == "상세" else 1  # 상세한 영양성분표는 트랜스지방 0
     }
     
-    print(f"🔍 ROI 분석 결과: {nutrition_type} 타입, 칼로리 {final_calories}kcal, 단백질 {final_protein}g")
+    logger.debug("ROI 분석 결과", extra={"nutrition_type": nutrition_type, "calories": final_calories, "protein": final_protein})
     
     return estimated_nutrition
 
@@ -185,11 +197,11 @@ def analyze_image_content(roi_result, image_data):
                 '트랜스지방': 0
             }
         
-        print(f"🔍 이미지 분석 결과: 밝기 {brightness:.1f}, 텍스트밀도 {text_density:.3f}")
+        logger.debug("이미지 분석 결과", extra={"brightness": round(brightness, 1), "text_density": round(text_density, 3)})
         return nutrition
         
     except Exception as e:
-        print(f"❌ 이미지 내용 분석 실패: {str(e)}")
+        logger.error("이미지 내용 분석 실패: %s", e)
         return None
 
 # 데이터베이스 인스턴스
@@ -205,17 +217,147 @@ async def root():
         "api_configured": config.is_api_configured()
     }
 
+@router.get("/ready")
+async def ready():
+    """준비 상태 확인 (서버 시작 준비 작업이 끝나기 전에는 503)"""
+    return APIResponse(content=warmup.status(), status_code=200 if warmup.ready else 503)
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus 텍스트 형식 메트릭 (요청/OCR 단계/DB 처리 시간, 캐시 적중률, 클로바 오류 수)
+    
+    운영 모드에서는 모든 워커의 값을 합산합니다 (게이지는 worker 레이블로 워커별 출력).
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @router.post("/ocr/upload")
-async def ocr_upload(file: UploadFile = File(...), use_roi: bool = True, roi_bbox: str = None):
-    """파일 업로드를 통한 OCR 처리 (사용자 지정 ROI 포함)"""
+async def ocr_upload(file: UploadFile = File(...), use_roi: bool = True, roi_bbox: str = None, trace: bool = False):
+    """
+    파일 업로드를 통한 OCR 처리 (사용자 지정 ROI 포함)
+    
+    워커의 이미지 처리 예산이 차 있으면 잠시 기다리고, 그래도 처리할 수 없으면 503 (Retry-After)을 반환합니다.
+    trace=true면 단계별 처리 시간과 바이트 크기를 model_info.trace에 포함합니다.
+    """
+    try:
+        # 이미지 헤더로 처리 중 메모리 사용량을 추정하여 예산 안에서만 처리 (예산이 차면 잠시 대기)
+        # 헤더 읽기(디스크에 임시 저장된 업로드, 처음 호출 시 PIL import)는 스레드 풀에서 실행
+        cost = await run_in_threadpool(estimate_image_memory, file.file, file.size or 0)
+        async with ocr_admission.admit_async(cost):
+            # 파일 읽기
+            contents = await file.read()
+            
+            # 이미지 처리와 OCR 호출은 OCR 전용 스레드 풀에서 실행 (이벤트 루프와 다른 요청을 막지 않도록)
+            result = await run_ocr(process_ocr_upload, contents, file.content_type, use_roi, roi_bbox, trace)
+        
+        return APIResponse(content=result)
+    
+    except AdmissionRejected as e:
+        if e.reason == "too_large":
+            raise HTTPException(status_code=413, detail=str(e))
+        raise HTTPException(
+            status_code=503,
+            detail=f"{e} 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(config.OCR_ADMISSION_RETRY_AFTER_SECONDS)}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"OCR 처리 중 오류 발생: {str(e)}")
+
+@router.post("/ocr/jobs")
+async def create_ocr_job(file: UploadFile = File(...), use_roi: bool = True, roi_bbox: str = None, trace: bool = False):
+    """
+    OCR 비동기 작업 등록 (작업 ID를 바로 반환하고 백그라운드에서 처리)
+    
+    결과는 GET /ocr/jobs/{job_id} 로 조회하거나 GET /ocr/jobs/{job_id}/events (SSE)로 단계별로 받을 수 있습니다.
+    워커의 이미지 처리 예산보다 큰 이미지는 등록하지 않고 413을 반환합니다.
+    """
     try:
-        # 파일 읽기
+        # 대기열과 이미지 크기를 먼저 확인 (거절할 요청의 파일은 읽지 않음)
+        queued = await run_in_threadpool(ocr_job_store.count_queued)
+        if queued >= config.OCR_JOB_MAX_QUEUED:
+            raise HTTPException(
+                status_code=503,
+                detail="처리 대기 중인 OCR 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "10"}
+            )
+        ocr_admission.check_size(await run_in_threadpool(estimate_image_memory, file.file, file.size or 0))
+        
         contents = await file.read()
+        job_id = await run_in_threadpool(ocr_job_store.create, contents, file.content_type, {
+            "use_roi": use_roi,
+            "roi_bbox": roi_bbox,
+            "trace": trace
+        })
+        ocr_job_runner.notify()
+        metrics.OCR_JOBS.inc(status="submitted")
+        
+        return APIResponse(
+            status_code=202,
+            content={
+                "success": True,
+                "message": "OCR 작업 등록 성공",
+                "data": {
+                    "job_id": job_id,
+                    "status": "queued",
+                    "status_url": f"/ocr/jobs/{job_id}",
+                    "events_url": f"/ocr/jobs/{job_id}/events"
+                }
+            },
+            headers={"Location": f"/ocr/jobs/{job_id}"}
+        )
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logger.error("OCR 작업 등록 에러: %s", e)
+        raise HTTPException(status_code=500, detail=f"OCR 작업 등록 실패: {str(e)}")
+
+@router.get("/ocr/jobs/{job_id}")
+async def get_ocr_job(job_id: UUID):
+    """OCR 작업 상태/결과 조회 (stages: 끝난 처리 단계 목록, result: 완료 시 OCR 결과)"""
+    try:
+        job = await run_in_threadpool(ocr_job_store.get, str(job_id))
+        if not job:
+            raise HTTPException(status_code=404, detail="OCR 작업을 찾을 수 없습니다")
         
+        return api_response("OCR 작업 조회 성공", job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"OCR 작업 조회 실패: {str(e)}")
+
+@router.get("/ocr/jobs/{job_id}/events")
+async def stream_ocr_job_events(job_id: UUID, request: Request):
+    """OCR 작업 진행 상황 SSE 스트림 (status/stage 이벤트 후 완료되면 done 이벤트로 결과 전송)"""
+    return StreamingResponse(
+        job_events(str(job_id), request.is_disconnected),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # nginx 등 프록시가 응답을 모아서 보내지 않도록
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+def process_ocr_upload(contents: bytes, content_type: str, use_roi: bool, roi_bbox: Optional[str], trace: bool) -> dict:
+    """
+    업로드 이미지의 ROI 크롭, OCR 호출, 영양성분 추출 (CPU 사용이 많으므로 OCR 스레드 풀에서 실행)
+    
+    경로별로 기록되는 처리 단계:
+    - 사용자 지정 ROI (use_roi, roi_bbox): upload_encode → decode → encode → clova_call → parse
+    - 자동 ROI (use_roi, roi_bbox 없음): upload_encode → decode → roi_detect → preprocess → encode → clova_call → parse
+    - ROI 미사용: upload_encode → clova_call → parse
+    (클로바 OCR API가 설정되지 않은 경우 clova_call/parse 대신 모의 데이터를 반환하고 자동 ROI도 건너뜀)
+    """
+    with start_trace("ocr.upload", requested=trace, upload_bytes=len(contents), use_roi=use_roi) as ocr_trace:
         # 이미지 데이터를 base64로 인코딩
         import base64
-        image_base64 = base64.b64encode(contents).decode('utf-8')
-        image_data = f"data:{file.content_type};base64,{image_base64}"
+        with ocr_stage("upload_encode") as span:
+            image_base64 = base64.b64encode(contents).decode('utf-8')
+            span.set("bytes_in", len(contents))
+            span.set("bytes_out", len(image_base64))
+        image_data = f"data:{content_type};base64,{image_base64}"
         
         # 사용자 지정 ROI 처리
         if use_roi and roi_bbox:
@@ -224,24 +366,24 @@ async def ocr_upload(file: UploadFile = File(...), use_roi: bool = True, roi_bbo
                 roi_coords = [int(x) for x in roi_bbox.split(',')]
                 if len(roi_coords) == 4:
                     x, y, w, h = roi_coords
-                    print(f"🎯 사용자 지정 ROI: ({x}, {y}, {w}, {h})")
+                    logger.debug("사용자 지정 ROI", extra={"roi_bbox": roi_coords})
                     
                     # ROI 영역으로 이미지 크롭
                     cropped_image_data = crop_image_by_roi(image_data, x, y, w, h)
                     if cropped_image_data:
                         image_data = cropped_image_data
-                        print(f"✅ ROI 영역으로 이미지 크롭 완료")
+                        logger.debug("ROI 영역으로 이미지 크롭 완료")
                     else:
-                        print(f"⚠️ ROI 크롭 실패, 원본 이미지 사용")
+                        logger.warning("ROI 크롭 실패, 원본 이미지 사용")
                 else:
-                    print(f"⚠️ 잘못된 ROI 형식: {roi_bbox}")
+                    logger.warning("잘못된 ROI 형식", extra={"roi_bbox": roi_bbox})
             except Exception as e:
-                print(f"⚠️ ROI 처리 오류: {str(e)}")
+                logger.warning("ROI 처리 오류: %s", e)
         
         # 클로바 OCR API 설정 확인
         if not config.is_api_configured():
             # API 설정이 없는 경우 모의 데이터 반환
-            print("⚠️ 클로바 OCR API가 설정되지 않았습니다. 모의 데이터를 반환합니다.")
+            logger.warning("클로바 OCR API가 설정되지 않았습니다. 모의 데이터를 반환합니다.")
             
             mock_nutrition = {
                 '칼로리': 300,
@@ -255,7 +397,7 @@ async def ocr_upload(file: UploadFile = File(...), use_roi: bool = True, roi_bbo
                 '트랜스지방': 0
             }
             
-            return JSONResponse(content={
+            result = {
                 'success': True,
                 'full_text': '영양정보 (사용자 지정 ROI 적용)',
                 'nutrition_info': mock_nutrition,
@@ -264,21 +406,24 @@ async def ocr_upload(file: UploadFile = File(...), use_roi: bool = True, roi_bbo
                     'roi_processing': use_roi,
                     'user_roi': roi_bbox if use_roi else None
                 }
-            })
-        
-        # 실제 OCR 처리 (API 설정이 있는 경우)
-        result = ocr_engine.extract_text(image_data, use_roi=False)  # 이미 ROI 처리됨
-        
-        # 영양성분 정보 추출
-        if result['success'] and result['full_text']:
-            nutrition_info = ocr_engine.extract_nutrition_values(result['full_text'])
-            result['nutrition_info'] = nutrition_info
-            result['model_info']['user_roi'] = roi_bbox if use_roi else None
-        
-        return JSONResponse(content=result)
+            }
+        else:
+            # 실제 OCR 처리 (API 설정이 있는 경우)
+            # 사용자 지정 ROI는 이미 크롭했고, 지정하지 않았으면 영양성분표 영역을 자동으로 찾아 전처리
+            ocr_engine = get_ocr_engine()
+            result = ocr_engine.extract_text(image_data, use_roi=use_roi and not roi_bbox)
+            
+            # 영양성분 정보 추출
+            if result['success'] and result['full_text']:
+                nutrition_info = ocr_engine.extract_nutrition_values(result['full_text'])
+                result['nutrition_info'] = nutrition_info
+                result['model_info']['user_roi'] = roi_bbox if use_roi else None
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"OCR 처리 중 오류 발생: {str(e)}")
+        # 요청한 경우 단계별 처리 시간 포함 (실패 응답에도 포함)
+        if trace:
+            result.setdefault('model_info', {})['trace'] = ocr_trace.summary()
+    
+    return result
 
 def crop_image_by_roi(image_data, x, y, w, h):
     """이미지를 ROI 영역으로 크롭"""
@@ -294,166 +439,197 @@ def crop_image_by_roi(image_data, x, y, w, h):
             image_base64 = image_data.split(',')[1]
         else:
             image_base64 = image_data
-            
-        image_bytes = base64.b64decode(image_base64)
-        pil_image = Image.open(io.BytesIO(image_bytes))
-        opencv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        
+        with ocr_stage("decode") as span:
+            image_bytes = base64.b64decode(image_base64)
+            pil_image = Image.open(io.BytesIO(image_bytes))
+            opencv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+            span.set("bytes_in", len(image_bytes))
+            span.set("bytes_out", opencv_image.nbytes)
+            span.set("image_size", (opencv_image.shape[1], opencv_image.shape[0]))
         
         # ROI 영역 크롭
         cropped = opencv_image[y:y+h, x:x+w]
         
         # 크롭된 이미지를 base64로 인코딩
-        _, buffer = cv2.imencode('.jpg', cropped)
-        cropped_base64 = base64.b64encode(buffer).decode('utf-8')
+        with ocr_stage("encode") as span:
+            _, buffer = cv2.imencode('.jpg', cropped)
+            cropped_base64 = base64.b64encode(buffer).decode('utf-8')
+            span.set("bytes_in", cropped.nbytes)
+            span.set("bytes_out", len(buffer))
         
         return f"data:image/jpeg;base64,{cropped_base64}"
-        
+    
     except Exception as e:
-        print(f"❌ 이미지 크롭 실패: {str(e)}")
+        logger.error("이미지 크롭 실패: %s", e)
         return None
 
+def _session_user_id(session: Optional[SessionClaims], user_id: Optional[int]) -> Optional[int]:
+    """
+    세션 토큰이 있으면 토큰의 사용자 ID 사용 (요청한 user_id와 다르면 403)
+    
+    토큰의 생년월일/나이로 영양소 비교 서비스의 연령대 캐시를 채우므로
+    이후 연령대 결정에 프로필 조회가 필요하지 않습니다.
+    """
+    if session is None:
+        return user_id
+    if user_id is not None and user_id != session.user_id:
+        raise HTTPException(status_code=403, detail="다른 사용자의 데이터에는 접근할 수 없습니다")
+    if session_manager.profile_is_current(session):
+        nutrition_service.remember_profile(session.user_id, session.birth, session.age)
+    return session.user_id
+
+def _profile_with_session(profile) -> dict:
+    """프로필 응답에 새 세션 토큰 추가"""
+    data = profile.dict()
+    data["session_token"] = session_manager.issue(profile.id, profile.birth, profile.age)
+    return data
+
 # ===== 식사 관련 API 엔드포인트 =====
 
+@router.get("/meals/range")
+async def get_meals_by_range(
+    start: date,
+    end: date,
+    user_id: Optional[int] = None,
+    include: str = Query("summary", pattern="^(summary|meals)$"),
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """기간 내 날짜별 식사 요약 조회 (캘린더/통계 화면용)"""
+    user_id = _session_user_id(session, user_id)
+    if end < start:
+        raise HTTPException(status_code=400, detail="종료일은 시작일보다 빠를 수 없습니다")
+    if (end - start).days + 1 > config.MEALS_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"조회 기간은 최대 {config.MEALS_RANGE_MAX_DAYS}일까지 가능합니다"
+        )
+    
+    try:
+        include_meals = include == "meals"
+        result = meals_service.get_meals_by_range(start, end, user_id, include_meals)
+        
+        # 요약만 요청한 경우 응답에 meals 키를 넣지 않음
+        exclude = None if include_meals else {"days": {"__all__": {"meals"}}}
+        return api_response("기간별 식사 조회 성공", result.dict(exclude=exclude))
+    except Exception as e:
+        logger.error("기간별 식사 조회 에러: %s", e)
+        raise HTTPException(status_code=500, detail=f"기간별 식사 조회 실패: {str(e)}")
+
+@router.get("/meals/history")
+async def get_meal_history(
+    user_id: Optional[int] = None,
+    before: Optional[str] = None,
+    limit: int = Query(config.MEALS_HISTORY_DEFAULT_LIMIT, ge=1, le=config.MEALS_HISTORY_MAX_LIMIT),
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """사용자 식사 기록 페이지 조회 (최신순, 커서 기반)"""
+    user_id = _session_user_id(session, user_id)
+    if user_id is None:
+        raise HTTPException(status_code=400, detail="user_id 또는 세션 토큰이 필요합니다")
+    try:
+        result = meals_service.get_meal_history(user_id, before, limit)
+        return api_response("식사 기록 조회 성공", result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("식사 기록 조회 에러: %s", e)
+        raise HTTPException(status_code=500, detail=f"식사 기록 조회 실패: {str(e)}")
+
 @router.get("/meals/{target_date}")
-async def get_meals_by_date(target_date: date, user_id: Optional[int] = None):
-    """특정 날짜의 식사 목록 조회"""
+async def get_meals_by_date(
+    request: Request,
+    target_date: date,
+    user_id: Optional[int] = None,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """특정 날짜의 식사 목록 조회 (사용자 지정 시 ETag 조건부 요청 지원)"""
+    user_id = _session_user_id(session, user_id)
     try:
-        print(f"🔍 식사 목록 조회 요청: {target_date}, user_id: {user_id}")
-        result = meals_service.get_meals_by_date(target_date, user_id)
-        print(f"✅ 조회된 식사 수: {len(result.meals)}")
-        
-        # JSON 직렬화 문제 해결을 위해 직접 변환
-        meals_data = []
-        for meal in result.meals:
-            meals_data.append({
-                "id": meal.id,
-                "user_id": meal.user_id,
-                "food_name": meal.food_name,
-                "nutrition_data": {
-                    "amount": meal.nutrition_data.amount,
-                    "calories": meal.nutrition_data.calories,
-                    "protein": meal.nutrition_data.protein,
-                    "carbs": meal.nutrition_data.carbs,
-                    "fat": meal.nutrition_data.fat,
-                    "sodium": meal.nutrition_data.sodium,
-                    "sugar": meal.nutrition_data.sugar,
-                    "cholesterol": meal.nutrition_data.cholesterol,
-                    "saturated_fat": meal.nutrition_data.saturated_fat,
-                    "trans_fat": meal.nutrition_data.trans_fat
-                },
-                "intake_date": meal.intake_date.isoformat(),
-                "created_at": meal.created_at.isoformat()
-            })
+        logger.debug("식사 목록 조회 요청", extra={"date": target_date, "user_id": user_id})
         
-        response_data = {
-            "success": True,
-            "message": "식사 목록 조회 성공",
-            "data": {
-                "date": result.date.isoformat(),
-                "meals": meals_data,
-                "summary": {
-                    "date": result.summary.date.isoformat(),
-                    "total_meals": result.summary.total_meals,
-                    "total_calories": result.summary.total_calories,
-                    "total_protein": result.summary.total_protein,
-                    "total_carbs": result.summary.total_carbs,
-                    "total_fat": result.summary.total_fat,
-                    "total_sodium": result.summary.total_sodium,
-                    "total_sugar": result.summary.total_sugar,
-                    "total_cholesterol": result.summary.total_cholesterol,
-                    "total_saturated_fat": result.summary.total_saturated_fat,
-                    "total_trans_fat": result.summary.total_trans_fat,
-                    "meals_by_period": result.summary.meals_by_period
-                }
-            }
-        }
+        # 변경이 없으면 식사 목록을 읽지 않고 304 반환
+        etag = None
+        if user_id:
+            etag = make_etag("meals", user_id, target_date, meals_service.get_day_version(user_id, target_date))
+            cached = not_modified(request, etag)
+            if cached:
+                return cached
+        
+        result = meals_service.get_meals_by_date(target_date, user_id)
+        logger.debug("식사 목록 조회 완료", extra={"date": target_date, "user_id": user_id, "meals": len(result.meals)})
         
-        return JSONResponse(content=response_data)
+        return api_response("식사 목록 조회 성공", {
+            "date": result.date,
+            "meals": result.meals,
+            "summary": result.summary
+        }, etag=etag)
     except Exception as e:
-        print(f"❌ 식사 목록 조회 에러: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("식사 목록 조회 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"식사 목록 조회 실패: {str(e)}")
 
 @router.post("/meals")
-async def create_meal(meal_data: MealCreate, user_id: Optional[int] = None):
+async def create_meal(
+    meal_data: MealCreate,
+    user_id: Optional[int] = None,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
     """새 식사 추가"""
+    user_id = _session_user_id(session, user_id)
     try:
-        print(f"🔍 식사 추가 요청: {meal_data.dict()}")
-        print(f"🔍 user_id: {user_id}")
         result = meals_service.create_meal(meal_data, user_id)
-        print(f"✅ 식사 추가 성공: {result.id}")
+        logger.info("식사 추가 성공", extra={"meal_id": result.id, "user_id": user_id})
         
-        # JSON 직렬화 문제 해결을 위해 직접 변환
-        response_data = {
-            "success": True,
-            "message": "식사 추가 성공",
-            "data": {
-                "id": result.id,
-                "user_id": result.user_id,
-                "food_name": result.food_name,
-                "nutrition_data": {
-                    "amount": result.nutrition_data.amount,
-                    "calories": result.nutrition_data.calories,
-                    "protein": result.nutrition_data.protein,
-                    "carbs": result.nutrition_data.carbs,
-                    "fat": result.nutrition_data.fat,
-                    "sodium": result.nutrition_data.sodium,
-                    "sugar": result.nutrition_data.sugar,
-                    "cholesterol": result.nutrition_data.cholesterol,
-                    "saturated_fat": result.nutrition_data.saturated_fat,
-                    "trans_fat": result.nutrition_data.trans_fat
-                },
-                "intake_date": result.intake_date.isoformat(),
-                "created_at": result.created_at.isoformat()
-            }
-        }
-        
-        return JSONResponse(content=response_data)
+        return api_response("식사 추가 성공", result)
     except Exception as e:
-        print(f"❌ 식사 추가 에러: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("식사 추가 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"식사 추가 실패: {str(e)}")
 
+@router.post("/meals/import")
+async def import_meals(
+    file: UploadFile = File(...),
+    user_id: Optional[int] = None,
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """CSV/NDJSON 파일로 식사 일괄 등록"""
+    user_id = _session_user_id(session, user_id)
+    # 파일 형식 결정 (format 파라미터 → 확장자 → content type 순)
+    if file_format is None:
+        filename = (file.filename or "").lower()
+        content_type = (file.content_type or "").lower()
+        if filename.endswith(".csv") or "csv" in content_type:
+            file_format = "csv"
+        elif filename.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type:
+            file_format = "ndjson"
+        else:
+            raise HTTPException(status_code=400, detail="파일 형식을 알 수 없습니다 (format=csv|ndjson)")
+    
+    try:
+        # 업로드 파일을 한 행씩 읽어 검증/적재 (파일 읽기와 COPY는 이벤트 루프를 막지 않도록 스레드 풀에서 실행)
+        lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            result = await run_in_threadpool(meals_service.import_meals, lines, file_format, user_id)
+        finally:
+            lines.detach()
+        
+        return api_response(
+            f"식사 일괄 등록 완료: {result.imported}건 등록, {result.failed}건 실패", result
+        )
+    except Exception as e:
+        logger.error("식사 일괄 등록 에러: %s", e)
+        raise HTTPException(status_code=500, detail=f"식사 일괄 등록 실패: {str(e)}")
+
 @router.put("/meals/{meal_id}")
 async def update_meal(meal_id: int, meal_data: MealUpdate):
     """식사 정보 수정"""
     try:
-        print(f"🔍 식사 수정 요청: ID={meal_id}, 데이터={meal_data.dict()}")
         result = meals_service.update_meal(meal_id, meal_data)
-        print(f"✅ 식사 수정 성공: {result.id}")
+        logger.info("식사 수정 성공", extra={"meal_id": result.id})
         
-        # JSON 직렬화 문제 해결을 위해 직접 변환
-        response_data = {
-            "success": True,
-            "message": "식사 수정 성공",
-            "data": {
-                "id": result.id,
-                "user_id": result.user_id,
-                "food_name": result.food_name,
-                "nutrition_data": {
-                    "amount": result.nutrition_data.amount,
-                    "calories": result.nutrition_data.calories,
-                    "protein": result.nutrition_data.protein,
-                    "carbs": result.nutrition_data.carbs,
-                    "fat": result.nutrition_data.fat,
-                    "sodium": result.nutrition_data.sodium,
-                    "sugar": result.nutrition_data.sugar,
-                    "cholesterol": result.nutrition_data.cholesterol,
-                    "saturated_fat": result.nutrition_data.saturated_fat,
-                    "trans_fat": result.nutrition_data.trans_fat
-                },
-                "intake_date": result.intake_date.isoformat(),
-                "created_at": result.created_at.isoformat()
-            }
-        }
-        
-        return JSONResponse(content=response_data)
+        return api_response("식사 수정 성공", result)
     except Exception as e:
-        print(f"❌ 식사 수정 에러: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("식사 수정 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"식사 수정 실패: {str(e)}")
 
 @router.delete("/meals/{meal_id}")
@@ -461,7 +637,7 @@ async def delete_meal(meal_id: int):
     """식사 삭제"""
     try:
         success = meals_service.delete_meal(meal_id)
-        return JSONResponse(content={
+        return APIResponse(content={
             "success": success,
             "message": "식사 삭제 성공" if success else "식사 삭제 실패"
         })
@@ -476,179 +652,106 @@ async def get_meal_by_id(meal_id: int):
         if not result:
             raise HTTPException(status_code=404, detail="식사를 찾을 수 없습니다")
         
-        return JSONResponse(content={
-            "success": True,
-            "message": "식사 조회 성공",
-            "data": result.dict()
-        })
+        return api_response("식사 조회 성공", result)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"식사 조회 실패: {str(e)}")
 
 @router.get("/meals/summary/{target_date}")
-async def get_meal_summary(target_date: date, user_id: Optional[int] = None):
-    """특정 날짜의 식사 요약 통계"""
+async def get_meal_summary(
+    request: Request,
+    target_date: date,
+    user_id: Optional[int] = None,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """특정 날짜의 식사 요약 통계 (사용자 지정 시 ETag 조건부 요청 지원)"""
+    user_id = _session_user_id(session, user_id)
     try:
-        result = meals_service.get_meals_by_date(target_date, user_id)
+        etag = None
+        if user_id:
+            etag = make_etag("summary", user_id, target_date, meals_service.get_day_version(user_id, target_date))
+            cached = not_modified(request, etag)
+            if cached:
+                return cached
         
-        # JSON 직렬화를 위해 date 필드를 문자열로 변환
-        summary_data = result.summary.dict()
-        summary_data['date'] = summary_data['date'].isoformat()
-        
-        return JSONResponse(content={
-            "success": True,
-            "message": "식사 요약 조회 성공",
-            "data": summary_data
-        })
+        result = meals_service.get_daily_summary(target_date, user_id)
+        return api_response("식사 요약 조회 성공", result, etag=etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"식사 요약 조회 실패: {str(e)}")
 
 # ===== 영양소 비교 관련 API 엔드포인트 =====
 
 @router.get("/nutrition/compare/{user_id}/{target_date}")
-async def compare_user_nutrition_with_average(user_id: int, target_date: date):
-    """사용자 영양소 섭취량과 평균 비교 (30세 기준)"""
+async def compare_user_nutrition_with_average(
+    user_id: int,
+    target_date: date,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """사용자 영양소 섭취량과 연령대 평균 비교 (프로필 나이 기준)"""
+    user_id = _session_user_id(session, user_id)
     try:
-        # 1. 사용자의 해당 날짜 영양소 데이터 조회
-        with db.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT food_name, nutrition_data, intake_date
-                    FROM nutrition_records 
-                    WHERE user_id = %s AND intake_date = %s
-                    ORDER BY created_at
-                """, (user_id, target_date))
-                
-                user_records = cursor.fetchall()
+        comparison_result = nutrition_service.compare_day(user_id, target_date)
         
-        if not user_records:
-            return JSONResponse(content={
+        if not comparison_result:
+            return APIResponse(content={
                 "success": False,
                 "message": f"{target_date}에 등록된 영양소 데이터가 없습니다.",
                 "data": None
             })
         
-        # 2. 사용자 영양소 데이터 집계
-        total_nutrition = {
-            "calories": 0,
-            "protein": 0,
-            "carbs": 0,
-            "fat": 0,
-            "sodium": 0,
-            "sugar": 0
-        }
-        
-        for record in user_records:
-            nutrition_data = record['nutrition_data']
-            if isinstance(nutrition_data, str):
-                nutrition_data = json.loads(nutrition_data)
-            
-            # 영양소 데이터 누적
-            for key in total_nutrition.keys():
-                if key in nutrition_data and nutrition_data[key] is not None:
-                    total_nutrition[key] += float(nutrition_data[key])
-        
-        # 3. 30세 연령대 평균 영양소 데이터 조회
-        with db.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT nutrient_name, unit, average_value
-                    FROM average_nutrition 
-                    WHERE age_group = '30-49세'
-                    ORDER BY nutrient_name
-                """)
-                
-                average_data = cursor.fetchall()
-        
-        # 4. 영양소 비교 데이터 생성
-        nutrient_mapping = {
-            '에너지 섭취량': 'calories',
-            '단백질': 'protein',
-            '탄수화물': 'carbs',
-            '지방': 'fat',
-            '나트륨': 'sodium',
-            '당 섭취량': 'sugar'
-        }
-        
-        comparisons = []
-        
-        for row in average_data:
-            nutrient_name = row['nutrient_name']
-            unit = row['unit']
-            average_value = float(row['average_value'])
-            
-            # 매핑된 영양소명 찾기
-            mapped_key = None
-            for db_name, user_key in nutrient_mapping.items():
-                if db_name in nutrient_name:
-                    mapped_key = user_key
-                    break
-            
-            if mapped_key and mapped_key in total_nutrition:
-                user_value = total_nutrition[mapped_key]
-                difference = user_value - average_value
-                percentage_diff = (difference / average_value * 100) if average_value > 0 else 0
-                
-                # 상태 결정 (±20% 범위를 적정으로 간주)
-                if percentage_diff < -20:
-                    status = "부족"
-                elif percentage_diff > 20:
-                    status = "과다"
-                else:
-                    status = "적정"
-                
-                comparisons.append({
-                    "nutrient_name": nutrient_name,
-                    "unit": unit,
-                    "user_intake": user_value,
-                    "average_intake": average_value,
-                    "difference": difference,
-                    "percentage_diff": round(percentage_diff, 2),
-                    "status": status
-                })
-        
-        # 5. 요약 통계 계산
-        total_nutrients = len(comparisons)
-        deficient_nutrients = len([c for c in comparisons if c["status"] == "부족"])
-        adequate_nutrients = len([c for c in comparisons if c["status"] == "적정"])
-        excessive_nutrients = len([c for c in comparisons if c["status"] == "과다"])
-        
-        # 6. 비교 결과 생성
-        comparison_result = {
-            "user_profile": {
-                "user_id": user_id,
-                "age": 30,
-                "age_group": "30-49세"
-            },
-            "comparison_date": target_date.isoformat(),
-            "total_nutrients": total_nutrients,
-            "deficient_nutrients": deficient_nutrients,
-            "adequate_nutrients": adequate_nutrients,
-            "excessive_nutrients": excessive_nutrients,
-            "comparisons": comparisons
-        }
-        
-        return JSONResponse(content={
+        age_group = comparison_result["user_profile"]["age_group"]
+        return APIResponse(content={
             "success": True,
-            "message": "30-49세 평균 대비 영양소 섭취량 비교 완료",
+            "message": f"{age_group} 평균 대비 영양소 섭취량 비교 완료",
             "data": comparison_result
         })
-        
+    
     except Exception as e:
-        print(f"❌ 영양소 비교 에러: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("영양소 비교 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"영양소 비교 실패: {str(e)}")
 
+@router.get("/nutrition/compare/{user_id}")
+async def compare_user_nutrition_range(
+    user_id: int,
+    start: date,
+    end: date,
+    age_group: Optional[str] = None,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """기간 내 날짜별 영양소 섭취량과 연령대 평균 비교 (주간/월간 화면용)"""
+    user_id = _session_user_id(session, user_id)
+    if end < start:
+        raise HTTPException(status_code=400, detail="종료일은 시작일보다 빠를 수 없습니다")
+    if (end - start).days + 1 > config.MEALS_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"조회 기간은 최대 {config.MEALS_RANGE_MAX_DAYS}일까지 가능합니다"
+        )
+    
+    try:
+        comparison_result = nutrition_service.compare_range(user_id, start, end, age_group)
+        age_group = comparison_result["user_profile"]["age_group"]
+        
+        return APIResponse(content={
+            "success": True,
+            "message": f"{age_group} 평균 대비 기간별 영양소 섭취량 비교 완료",
+            "data": comparison_result
+        })
+    except Exception as e:
+        logger.error("기간별 영양소 비교 에러: %s", e)
+        raise HTTPException(status_code=500, detail=f"기간별 영양소 비교 실패: {str(e)}")
+
 @router.post("/nutrition/records")
 async def create_nutrition_record(
     user_id: int,
     food_name: str,
     nutrition_data: dict,
-    intake_date: Optional[date] = None
+    intake_date: Optional[date] = None,
+    session: Optional[SessionClaims] = Depends(get_session)
 ):
     """영양소 기록 생성"""
+    user_id = _session_user_id(session, user_id)
     try:
         if intake_date is None:
             intake_date = date.today()
@@ -662,28 +765,36 @@ async def create_nutrition_record(
                 """, (user_id, food_name, json.dumps(nutrition_data), intake_date))
                 
                 result = cursor.fetchone()
-                conn.commit()
                 
-                return JSONResponse(content={
-                    "success": True,
-                    "message": "영양소 기록 생성 성공",
-                    "data": {
-                        "id": result['id'],
-                        "user_id": user_id,
-                        "food_name": food_name,
-                        "nutrition_data": nutrition_data,
-                        "intake_date": intake_date.isoformat(),
-                        "created_at": result['created_at'].isoformat()
-                    }
-                })
+                # 일별 집계 증감 갱신 (같은 트랜잭션)
+                meals_service.apply_daily_totals_delta(
+                    cursor, user_id, intake_date, nutrition_data,
+                    meal_count=1, created_at=result['created_at']
+                )
+                
+                invalidation.commit(conn, cursor, keys=meals_service.day_cache_keys(user_id, [intake_date]))
                 
+                return api_response("영양소 기록 생성 성공", {
+                    "id": result['id'],
+                    "user_id": user_id,
+                    "food_name": food_name,
+                    "nutrition_data": nutrition_data,
+                    "intake_date": intake_date,
+                    "created_at": result['created_at']
+                })
+    
     except Exception as e:
-        print(f"❌ 영양소 기록 생성 에러: {str(e)}")
+        logger.error("영양소 기록 생성 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"영양소 기록 생성 실패: {str(e)}")
 
 @router.get("/nutrition/records/{user_id}/{target_date}")
-async def get_nutrition_records_by_date(user_id: int, target_date: date):
+async def get_nutrition_records_by_date(
+    user_id: int,
+    target_date: date,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
     """특정 날짜의 영양소 기록 조회"""
+    user_id = _session_user_id(session, user_id)
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
@@ -697,84 +808,113 @@ async def get_nutrition_records_by_date(user_id: int, target_date: date):
                 records = cursor.fetchall()
                 
                 # JSON 데이터 파싱
-                parsed_records = []
                 for record in records:
-                    nutrition_data = record['nutrition_data']
-                    if isinstance(nutrition_data, str):
-                        nutrition_data = json.loads(nutrition_data)
-                    
-                    parsed_records.append({
-                        "id": record['id'],
-                        "food_name": record['food_name'],
-                        "nutrition_data": nutrition_data,
-                        "intake_date": record['intake_date'].isoformat(),
-                        "created_at": record['created_at'].isoformat()
-                    })
+                    if isinstance(record['nutrition_data'], str):
+                        record['nutrition_data'] = json.loads(record['nutrition_data'])
                 
-                return JSONResponse(content={
-                    "success": True,
-                    "message": "영양소 기록 조회 성공",
-                    "data": {
-                        "date": target_date.isoformat(),
-                        "records": parsed_records,
-                        "total_records": len(parsed_records)
-                    }
+                return api_response("영양소 기록 조회 성공", {
+                    "date": target_date,
+                    "records": records,
+                    "total_records": len(records)
                 })
-                
+    
     except Exception as e:
-        print(f"영양소 기록 조회 에러: {str(e)}")
+        logger.error("영양소 기록 조회 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"영양소 기록 조회 실패: {str(e)}")
 
-@router.get("/nutrition/average/{age_group}")
-async def get_average_nutrition_by_age_group(age_group: str):
-    """연령대별 평균 영양소 섭취량 조회"""
+@router.get("/nutrition/average")
+async def get_all_average_nutrition(request: Request):
+    """전체 연령대 평균 영양소 섭취량 조회 (미리 직렬화된 응답)"""
+    try:
+        etag = make_etag("average", average_nutrition_cache.version())
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        
+        return Response(
+            content=average_nutrition_cache.all_groups_payload(),
+            media_type=APIResponse.media_type,
+            headers=etag_headers(etag)
+        )
+    except Exception as e:
+        logger.error("전체 평균 영양소 조회 에러: %s", e)
+        raise HTTPException(status_code=500, detail=f"전체 평균 영양소 조회 실패: {str(e)}")
+
+@router.post("/nutrition/average/reload", dependencies=[Depends(require_admin)])
+async def reload_average_nutrition():
+    """평균 영양소 캐시 다시 읽기 (다른 서버 프로세스에도 갱신 알림, X-Admin-Key 헤더 필요)"""
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT nutrient_name, unit, average_value, standard_error
-                    FROM average_nutrition 
-                    WHERE age_group = %s
-                    ORDER BY nutrient_name
-                """, (age_group,))
-                
-                results = cursor.fetchall()
-                
-                nutrition_data = []
-                for row in results:
-                    nutrition_data.append({
-                        "nutrient_name": row['nutrient_name'],
-                        "unit": row['unit'],
-                        "average_value": float(row['average_value']),
-                        "standard_error": float(row['standard_error']) if row['standard_error'] else None
-                    })
-                
-                return JSONResponse(content={
-                    "success": True,
-                    "message": f"{age_group} 평균 영양소 섭취량 조회 성공",
-                    "data": {
-                        "age_group": age_group,
-                        "nutrition_data": nutrition_data
-                    }
-                })
-                
+                invalidation.commit(conn, cursor, tables=["average_nutrition"])
+        
+        loaded = average_nutrition_cache.reload()
+        return APIResponse(content={
+            "success": True,
+            "message": f"평균 영양소 캐시 갱신 완료: {loaded}개 항목",
+            "data": {"loaded": loaded}
+        })
     except Exception as e:
-        print(f"평균 영양소 조회 에러: {str(e)}")
+        logger.error("평균 영양소 캐시 갱신 에러: %s", e)
+        raise HTTPException(status_code=500, detail=f"평균 영양소 캐시 갱신 실패: {str(e)}")
+
+@router.get("/nutrition/average/{age_group}")
+async def get_average_nutrition_by_age_group(request: Request, age_group: str):
+    """연령대별 평균 영양소 섭취량 조회"""
+    try:
+        etag = make_etag("average", average_nutrition_cache.version(), age_group)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        
+        nutrition_data = [
+            nutrient.to_dict() for nutrient in average_nutrition_cache.get_age_group(age_group)
+        ]
+        
+        return api_response(f"{age_group} 평균 영양소 섭취량 조회 성공", {
+            "age_group": age_group,
+            "nutrition_data": nutrition_data
+        }, etag=etag)
+    except Exception as e:
+        logger.error("평균 영양소 조회 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"평균 영양소 조회 실패: {str(e)}")
 
+# ===== 데이터 내보내기 API 엔드포인트 =====
+
+@router.get("/export/{user_id}")
+async def export_nutrition_records(
+    user_id: int,
+    file_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """사용자 영양소 기록 전체 내보내기 (스트리밍)"""
+    user_id = _session_user_id(session, user_id)
+    media_types = {
+        "csv": "text/csv; charset=utf-8",
+        "ndjson": "application/x-ndjson; charset=utf-8"
+    }
+    
+    return StreamingResponse(
+        meals_service.export_records(user_id, file_format, start, end),
+        media_type=media_types[file_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="nutrition_records_{user_id}.{file_format}"'
+        }
+    )
+
 # ===== 사용자 프로필 관련 API 엔드포인트 =====
 
 @router.post("/auth/google")
 async def google_auth(auth_data: GoogleAuthRequest):
     """구글 인증 처리"""
     try:
-        print(f"🔍 구글 인증 요청: {auth_data.email}")
-        
         # 기존 사용자 프로필 확인
         existing_profile = user_service.get_user_profile_by_google_id(auth_data.google_id)
         
         if existing_profile:
-            return JSONResponse(content={
+            return APIResponse(content={
                 "success": True,
                 "message": "기존 사용자 로그인 성공",
                 "data": {
@@ -782,11 +922,14 @@ async def google_auth(auth_data: GoogleAuthRequest):
                     "google_id": existing_profile.google_id,
                     "email": existing_profile.email,
                     "username": existing_profile.username,
+                    "session_token": session_manager.issue(
+                        existing_profile.id, existing_profile.birth, existing_profile.age
+                    ),
                     "is_new_user": False
                 }
             })
         else:
-            return JSONResponse(content={
+            return APIResponse(content={
                 "success": True,
                 "message": "새 사용자 인증 성공",
                 "data": {
@@ -798,125 +941,85 @@ async def google_auth(auth_data: GoogleAuthRequest):
                 }
             })
     except Exception as e:
-        print(f"❌ 구글 인증 에러: {str(e)}")
+        logger.error("구글 인증 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"구글 인증 실패: {str(e)}")
 
 @router.post("/user/profile")
 async def create_user_profile(profile_data: UserProfileCreate):
     """사용자 프로필 생성"""
     try:
-        print(f"🔍 사용자 프로필 생성 요청: {profile_data.email}")
-        
-        # 기존 프로필 확인
-        existing_profile = user_service.get_user_profile_by_google_id(profile_data.google_id)
-        if existing_profile:
-            raise HTTPException(status_code=400, detail="이미 존재하는 사용자입니다")
-        
+        # 생성과 중복 확인을 한 번에 처리 (이미 있으면 None)
         result = user_service.create_user_profile(profile_data)
+        if not result:
+            raise HTTPException(status_code=400, detail="이미 존재하는 사용자입니다")
         
-        return JSONResponse(content={
-            "success": True,
-            "message": "사용자 프로필 생성 성공",
-            "data": {
-                "id": result.id,
-                "google_id": result.google_id,
-                "email": result.email,
-                "username": result.username,
-                "age": result.age,
-                "birth": result.birth.isoformat(),
-                "height": result.height,
-                "weight": result.weight,
-                "address": result.address,
-                "protector_name": result.protector_name,
-                "protector_phone": result.protector_phone,
-                "protector_relationship": result.protector_relationship,
-                "created_at": result.created_at.isoformat(),
-                "updated_at": result.updated_at.isoformat()
-            }
-        })
+        return api_response("사용자 프로필 생성 성공", _profile_with_session(result))
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 사용자 프로필 생성 에러: {str(e)}")
+        logger.error("사용자 프로필 생성 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"사용자 프로필 생성 실패: {str(e)}")
 
 @router.get("/user/profile/{user_id}")
-async def get_user_profile(user_id: int):
-    """사용자 프로필 조회"""
+async def get_user_profile(
+    request: Request,
+    user_id: int,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
+    """사용자 프로필 조회 (ETag 조건부 요청 지원)"""
+    user_id = _session_user_id(session, user_id)
     try:
+        # 프로필은 캐시에서 읽으므로 버전 확인을 위한 별도 조회 없이 바로 ETag 생성
         result = user_service.get_user_profile_by_id(user_id)
         if not result:
             raise HTTPException(status_code=404, detail="사용자 프로필을 찾을 수 없습니다")
         
-        return JSONResponse(content={
-            "success": True,
-            "message": "사용자 프로필 조회 성공",
-            "data": {
-                "id": result.id,
-                "google_id": result.google_id,
-                "email": result.email,
-                "username": result.username,
-                "age": result.age,
-                "birth": result.birth.isoformat(),
-                "height": result.height,
-                "weight": result.weight,
-                "address": result.address,
-                "protector_name": result.protector_name,
-                "protector_phone": result.protector_phone,
-                "protector_relationship": result.protector_relationship,
-                "created_at": result.created_at.isoformat(),
-                "updated_at": result.updated_at.isoformat()
-            }
-        })
+        etag = make_etag("profile", user_id, result.updated_at.isoformat())
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        
+        return api_response("사용자 프로필 조회 성공", result, etag=etag)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 사용자 프로필 조회 에러: {str(e)}")
+        logger.error("사용자 프로필 조회 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"사용자 프로필 조회 실패: {str(e)}")
 
 @router.put("/user/profile/{user_id}")
-async def update_user_profile(user_id: int, profile_data: UserProfileUpdate):
+async def update_user_profile(
+    user_id: int,
+    profile_data: UserProfileUpdate,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
     """사용자 프로필 수정"""
+    user_id = _session_user_id(session, user_id)
     try:
         result = user_service.update_user_profile(user_id, profile_data)
         if not result:
             raise HTTPException(status_code=404, detail="사용자 프로필을 찾을 수 없습니다")
         
-        return JSONResponse(content={
-            "success": True,
-            "message": "사용자 프로필 수정 성공",
-            "data": {
-                "id": result.id,
-                "google_id": result.google_id,
-                "email": result.email,
-                "username": result.username,
-                "age": result.age,
-                "birth": result.birth.isoformat(),
-                "height": result.height,
-                "weight": result.weight,
-                "address": result.address,
-                "protector_name": result.protector_name,
-                "protector_phone": result.protector_phone,
-                "protector_relationship": result.protector_relationship,
-                "created_at": result.created_at.isoformat(),
-                "updated_at": result.updated_at.isoformat()
-            }
-        })
+        # 나이/생년월일이 바뀌었을 수 있으므로 새 토큰 발급
+        return api_response("사용자 프로필 수정 성공", _profile_with_session(result))
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 사용자 프로필 수정 에러: {str(e)}")
+        logger.error("사용자 프로필 수정 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"사용자 프로필 수정 실패: {str(e)}")
 
 @router.delete("/user/profile/{user_id}")
-async def delete_user_profile(user_id: int):
+async def delete_user_profile(
+    user_id: int,
+    session: Optional[SessionClaims] = Depends(get_session)
+):
     """사용자 프로필 삭제"""
+    user_id = _session_user_id(session, user_id)
     try:
         success = user_service.delete_user_profile(user_id)
-        return JSONResponse(content={
+        return APIResponse(content={
             "success": success,
             "message": "사용자 프로필 삭제 성공" if success else "사용자 프로필 삭제 실패"
         })
     except Exception as e:
-        print(f"❌ 사용자 프로필 삭제 에러: {str(e)}")
+        logger.error("사용자 프로필 삭제 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"사용자 프로필 삭제 실패: {str(e)}")
@@ -3,17 +3,76 @@
 FastAPI 기반의 OCR 서비스
 """
 
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import config
-from api_routes import router
+from api_routes import router, process_ocr_upload
+from partition_manager import partition_manager
+from meals_service import meals_service
+from invalidation import invalidation_listener
+from ocr_jobs import ocr_job_listener, ocr_job_runner
+from logger import get_logger
+from metrics import MetricsMiddleware
+from profiling import ProfilingMiddleware
+from warmup import warmup
+
+logger = get_logger(__name__)
+
+def ensure_partitions():
+    """서버 시작 시 앞으로 사용할 월별 파티션 미리 생성"""
+    try:
+        created = partition_manager.ensure_future_partitions()
+        if created:
+            logger.info("월별 파티션 생성", extra={"partitions": created})
+    except Exception as e:
+        logger.warning("월별 파티션 확인 실패: %s", e)
+
+def ensure_daily_totals():
+    """서버 시작 시 일별 영양소 집계 테이블 확인 (없으면 생성 후 기존 식사 기록으로 채움)"""
+    try:
+        rebuilt = meals_service.ensure_daily_totals_table()
+        if rebuilt >= 0:
+            logger.info("일별 영양소 집계 테이블 생성", extra={"days": rebuilt})
+    except Exception as e:
+        logger.error("일별 영양소 집계 테이블 확인 실패 (식사 기록 저장이 실패할 수 있음): %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 처리"""
+    ensure_partitions()
+    ensure_daily_totals()
+    
+    # 워커마다 캐시 무효화 이벤트 리스너 시작
+    if config.CACHE_INVALIDATION_ENABLED:
+        invalidation_listener.start()
+    
+    # OCR 비동기 작업 처리 워커 시작 (이전 실행에서 남은 작업도 이어서 처리)
+    if config.OCR_JOBS_ENABLED:
+        ocr_job_runner.start(process_ocr_upload)
+        ocr_job_listener.start()
+    
+    # 시작 준비 작업은 백그라운드에서 실행 (끝날 때까지 /ready 는 503, /는 바로 응답)
+    if config.WARMUP_ENABLED:
+        threading.Thread(target=warmup.run, name="warmup", daemon=True).start()
+    else:
+        warmup.mark_ready()
+    
+    yield
+    
+    # OCR 작업 워커/알림 리스너, 캐시 무효화 이벤트 리스너 종료
+    ocr_job_listener.stop()
+    ocr_job_runner.stop()
+    invalidation_listener.stop()
 
 def create_app() -> FastAPI:
     """FastAPI 애플리케이션 생성"""
     app = FastAPI(
         title=config.API_TITLE,
         version=config.API_VERSION,
-        description=config.API_DESCRIPTION
+        description=config.API_DESCRIPTION,
+        lifespan=lifespan
     )
     
     # CORS 설정
@@ -25,6 +84,13 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # 라우트별 요청 처리 시간 기록
+    app.add_middleware(MetricsMiddleware)
+    
+    # 요청 프로파일링 (환경 변수로 켠 경우에만 등록)
+    if config.PROFILE_SAMPLE_RATE > 0 or config.PROFILE_ROUTES:
+        app.add_middleware(ProfilingMiddleware)
+    
     # 라우터 등록
     app.include_router(router)
     
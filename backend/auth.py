@@ -0,0 +1,193 @@
+"""
+세션 토큰 모듈
+/auth/google 로그인 시 사용자 ID와 연령대를 담은 서명 토큰을 발급하고,
+요청마다 데이터베이스 조회 없이 서명만 확인하여 사용자를 식별합니다.
+
+토큰 형식: v1.<payload(base64url JSON)>.<HMAC-SHA256 서명(base64url)>
+    payload = {"uid": 사용자 ID, "ag": 연령대, "b": 생년월일, "a": 나이, "iat": 발급 시각, "exp": 만료 시각}
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import math
+import os
+import secrets
+import time
+from datetime import date
+from typing import Dict, NamedTuple, Optional
+from fastapi import Header, HTTPException
+from config import config
+from cache import LocalCache
+from nutrition_service import age_group_for_age, age_on
+import invalidation
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+TOKEN_VERSION = "v1"
+
+# 예전 기본값 (이 값으로는 누구나 토큰을 위조할 수 있으므로 키로 사용하지 않음)
+PLACEHOLDER_SECRET_KEYS = {"", "your-session-secret-key-here"}
+
+
+class SessionClaims(NamedTuple):
+    """검증된 세션 토큰 내용"""
+    user_id: int
+    age_group: str
+    birth: Optional[date]
+    age: Optional[int]
+    issued_at: float
+    expires_at: int
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+class SessionManager:
+    """세션 토큰 발급/검증 클래스"""
+    
+    def __init__(self, secret_key: str, ttl_seconds: int, cache_max_entries: int = 10000):
+        self.secret_key = secret_key.encode("utf-8")
+        self.ttl_seconds = ttl_seconds
+        # 검증이 끝난 토큰 → SessionClaims (같은 토큰 반복 요청 시 서명 확인 생략)
+        self._verified = LocalCache(cache_max_entries)
+        # 사용자 ID → 프로필 변경 시각 (이보다 먼저 발급된 토큰의 나이 정보는 사용하지 않음)
+        self._profile_changed_at: Dict[int, float] = {}
+        # 이 시각 이전에 발급된 토큰의 나이 정보는 사용하지 않음 (프로세스 시작/이벤트 유실 전의 변경은 알 수 없으므로)
+        self._trusted_since = time.time()
+        invalidation.subscribe(self._on_invalidation)
+        os.register_at_fork(after_in_child=self._distrust_earlier_tokens)
+    
+    def issue(self, user_id: int, birth: Optional[date], age: Optional[int]) -> str:
+        """사용자 프로필로 세션 토큰 발급"""
+        now = time.time()
+        payload = {
+            "uid": user_id,
+            "ag": age_group_for_age(age_on(birth, age, date.today())),
+            "b": birth.isoformat() if birth else None,
+            "a": age,
+            # 밀리초 단위 올림 (프로필 변경 직후 발급한 토큰이 변경 시각보다 앞서지 않도록)
+            "iat": math.ceil(now * 1000) / 1000,
+            "exp": int(now) + self.ttl_seconds
+        }
+        body = _b64encode(json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        return f"{TOKEN_VERSION}.{body}.{self._sign(body)}"
+    
+    def verify(self, token: str) -> Optional[SessionClaims]:
+        """토큰 서명/만료 확인 (유효하지 않으면 None)"""
+        now = time.time()
+        claims = self._verified.get(token)
+        if claims is not None:
+            return claims if claims.expires_at > now else None
+        
+        try:
+            version, body, signature = token.split(".")
+            if version != TOKEN_VERSION or not hmac.compare_digest(signature, self._sign(body)):
+                return None
+            payload = json.loads(_b64decode(body))
+            claims = SessionClaims(
+                user_id=int(payload["uid"]),
+                age_group=payload["ag"],
+                birth=date.fromisoformat(payload["b"]) if payload.get("b") else None,
+                age=payload.get("a"),
+                issued_at=float(payload["iat"]),
+                expires_at=int(payload["exp"])
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+        
+        if claims.expires_at <= now:
+            return None
+        
+        self._verified.set(token, claims, ttl=int(claims.expires_at - now))
+        return claims
+    
+    def profile_is_current(self, claims: SessionClaims) -> bool:
+        """
+        토큰 발급 이후 프로필(생년월일/나이)이 바뀌지 않았는지 확인
+        
+        프로세스가 시작되기 전이나 무효화 이벤트를 놓쳤을 수 있는 시점 이전에 발급된 토큰은
+        확인할 수 없으므로 False (연령대는 프로필을 다시 조회하여 결정)
+        """
+        if claims.issued_at < self._trusted_since:
+            return False
+        changed_at = self._profile_changed_at.get(claims.user_id)
+        return changed_at is None or claims.issued_at >= changed_at
+    
+    def _sign(self, body: str) -> str:
+        return _b64encode(hmac.new(self.secret_key, body.encode("ascii"), hashlib.sha256).digest())
+    
+    def _distrust_earlier_tokens(self) -> None:
+        """지금까지 발급된 토큰의 나이 정보를 사용하지 않음 (워커 fork, 무효화 이벤트 유실 시)"""
+        self._trusted_since = time.time()
+        self._profile_changed_at.clear()
+    
+    def _on_invalidation(self, event: dict) -> None:
+        """프로필 변경 이벤트를 받으면 그 이전에 발급된 토큰의 나이 정보를 무시"""
+        if event.get("reset"):
+            self._verified.clear()
+            self._distrust_earlier_tokens()
+            return
+        for key in event.get("keys", []):
+            if key.startswith("profile:id:"):
+                self._profile_changed_at[int(key.rsplit(":", 1)[1])] = time.time()
+
+
+def _load_secret_key() -> str:
+    """
+    토큰 서명 키 확인
+    
+    운영 모드(SERVER_MODE=production)나 SESSION_REQUIRED=true 에서 키가 없거나 예전 기본값이면 서버를 시작하지 않습니다.
+    개발 모드에서는 프로세스마다 임의 키를 만들어 사용합니다 (재시작하면 기존 토큰은 무효).
+    """
+    if config.SESSION_SECRET_KEY not in PLACEHOLDER_SECRET_KEYS:
+        return config.SESSION_SECRET_KEY
+    if config.SERVER_MODE == "production" or config.SESSION_REQUIRED:
+        raise RuntimeError("SESSION_SECRET_KEY 환경 변수에 세션 토큰 서명 키를 설정해야 합니다.")
+    logger.warning("SESSION_SECRET_KEY가 설정되지 않아 임시 서명 키를 사용합니다 (개발 모드 전용)")
+    return secrets.token_hex(32)
+
+
+# 전역 세션 관리 인스턴스
+session_manager = SessionManager(
+    _load_secret_key(),
+    config.SESSION_TTL_SECONDS,
+    config.SESSION_CACHE_MAX_ENTRIES
+)
+
+
+def get_session(authorization: Optional[str] = Header(None)) -> Optional[SessionClaims]:
+    """
+    Authorization: Bearer <토큰> 헤더 검증 (FastAPI 의존성)
+    
+    헤더가 없으면 None (SESSION_REQUIRED=true면 401), 토큰이 잘못되었거나 만료되면 401.
+    """
+    if not authorization:
+        if config.SESSION_REQUIRED:
+            raise HTTPException(status_code=401, detail="로그인이 필요합니다")
+        return None
+    
+    scheme, _, token = authorization.partition(" ")
+    claims = session_manager.verify(token.strip()) if scheme.lower() == "bearer" else None
+    if claims is None:
+        raise HTTPException(status_code=401, detail="세션이 만료되었거나 올바르지 않습니다")
+    return claims
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """
+    X-Admin-Key 헤더 검증 (관리용 API의 FastAPI 의존성)
+    
+    ADMIN_API_KEY가 설정되지 않았으면 403, 헤더가 없거나 키가 다르면 401.
+    """
+    if not config.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="관리용 API가 설정되지 않았습니다")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode("utf-8"), config.ADMIN_API_KEY.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="관리용 API 키가 올바르지 않습니다")
@@ -0,0 +1,245 @@
+"""
+캐시 모듈
+사용자 프로필과 일별 식사 요약을 캐시하여 반복 조회 시 데이터베이스 접근을 줄입니다.
+
+기본은 프로세스 내 메모리 캐시이며, CACHE_BACKEND=redis로 지정하면
+여러 서버 프로세스가 Redis 프로토콜 서버(Redis, Valkey 등)를 함께 사용합니다.
+쓰기 경로(MealsService/UserService)에서 커밋 후 관련 키를 직접 삭제합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Type
+import orjson
+from pydantic import BaseModel
+from config import config
+from logger import get_logger
+from metrics import register_cache_metrics
+from responses import serialize
+
+logger = get_logger(__name__)
+
+
+class LocalCache:
+    """프로세스 내 LRU 캐시 (TTL 지원)"""
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class RedisCache:
+    """
+    Redis 프로토콜 캐시
+    
+    값은 orjson으로 직렬화해 저장합니다. client에는 redis-py 클라이언트 또는
+    같은 get/set/delete/scan_iter 메서드를 가진 객체(테스트용 가짜 서버 등)를 넘길 수 있습니다.
+    """
+    
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+    
+    def get(self, key: str) -> Any:
+        raw = self.client.get(key)
+        return orjson.loads(raw) if raw is not None else None
+    
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.set(key, orjson.dumps(value, default=serialize), ex=ttl)
+    
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*keys)
+    
+    def clear(self, prefix: str = "") -> None:
+        keys = list(self.client.scan_iter(match=f"{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class ModelCache:
+    """
+    Pydantic 모델 캐시 (문자열/숫자 등 JSON 값도 저장 가능)
+    
+    백엔드 오류는 조회 실패로 처리하지 않고 캐시 미스로 간주하므로
+    캐시 서버가 내려가도 데이터베이스 조회로 계속 동작합니다.
+    
+    조회 후 채우기(cache-aside)는 조회 전에 generation()을 읽어 set(..., generation=)에 넘깁니다.
+    조회하는 사이 해당 키가 무효화되었으면 (조회한 값이 커밋 전 데이터일 수 있으므로) 저장하지 않습니다.
+    """
+    
+    # 무효화 기록을 보관할 최대 키 수 (넘으면 가장 오래된 기록 이전에 시작한 조회는 저장하지 않음)
+    MAX_TRACKED_INVALIDATIONS = 10000
+    
+    def __init__(self, backend, prefix: str = "kiumbapsang:", ttl: int = 300):
+        self.backend = backend
+        self.prefix = prefix
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_fills = 0
+        self._generation = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._cleared: dict = {}
+        self._forgotten_before = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str, model: Optional[Type[BaseModel]] = None) -> Any:
+        """캐시된 값 조회 (없으면 None, model 지정 시 해당 모델로 반환)"""
+        try:
+            value = self.backend.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("캐시 조회 실패: %s", e, extra={"key": key})
+            value = None
+        
+        if value is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        # Redis 백엔드는 dict로 돌려주므로 모델로 다시 변환
+        if model is None or isinstance(value, model):
+            return value
+        return model(**value)
+    
+    def generation(self) -> int:
+        """현재 무효화 세대 (데이터베이스 조회 전에 읽어 set에 전달)"""
+        with self._lock:
+            return self._generation
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, generation: Optional[int] = None) -> None:
+        """
+        값 저장
+        
+        generation을 넘기면 그 이후 이 키가 무효화된 경우 저장하지 않습니다.
+        확인과 저장을 같은 잠금 안에서 하므로 무효화와 엇갈려 이전 값이 남지 않습니다.
+        """
+        with self._lock:
+            if generation is not None and self._invalidated_since(key, generation):
+                self.stale_fills += 1
+                return
+            try:
+                self.backend.set(self.prefix + key, value, ttl or self.ttl)
+            except Exception as e:
+                logger.warning("캐시 저장 실패: %s", e, extra={"key": key})
+    
+    def _invalidated_since(self, key: str, generation: int) -> bool:
+        """generation 이후 key가 삭제되었거나 key가 속한 네임스페이스가 비워졌는지 확인 (잠금 안에서 호출)"""
+        if generation < self._forgotten_before:
+            return True
+        if self._invalidated.get(key, 0) > generation:
+            return True
+        return any(
+            cleared > generation and key.startswith(namespace)
+            for namespace, cleared in self._cleared.items()
+        )
+    
+    def _record_invalidation(self, keys=(), namespace: Optional[str] = None) -> None:
+        """무효화 세대를 올리고 삭제한 키/네임스페이스 기록"""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._invalidated[key] = self._generation
+                self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.MAX_TRACKED_INVALIDATIONS:
+                _, forgotten = self._invalidated.popitem(last=False)
+                self._forgotten_before = max(self._forgotten_before, forgotten)
+            if namespace is not None:
+                self._cleared[namespace] = self._generation
+    
+    def delete(self, *keys: str) -> None:
+        """키 삭제 (쓰기 경로에서 커밋 후 호출)"""
+        self._record_invalidation(keys)
+        try:
+            self.backend.delete(*[self.prefix + key for key in keys])
+        except Exception as e:
+            logger.warning("캐시 삭제 실패: %s", e, extra={"keys": list(keys)})
+    
+    def clear(self, namespace: str = "") -> None:
+        """네임스페이스 전체 삭제 (일괄 재계산 후 호출)"""
+        self._record_invalidation(namespace=namespace)
+        try:
+            self.backend.clear(self.prefix + namespace)
+        except Exception as e:
+            logger.warning("캐시 비우기 실패: %s", e, extra={"namespace": namespace})
+    
+    def stats(self) -> dict:
+        """캐시 적중률 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "stale_fills": self.stale_fills
+        }
+
+
+# ===== 캐시 키 =====
+
+def profile_key(user_id: int) -> str:
+    return f"profile:id:{user_id}"
+
+def profile_google_key(google_id: str) -> str:
+    return f"profile:google:{google_id}"
+
+def summary_key(user_id: int, day) -> str:
+    return f"summary:{user_id}:{day.isoformat()}"
+
+def day_version_key(user_id: int, day) -> str:
+    return f"summary:version:{user_id}:{day.isoformat()}"
+
+
+def create_cache() -> ModelCache:
+    """설정에 따라 캐시 생성 (Redis 연결 실패 시 프로세스 내 캐시 사용)"""
+    backend = None
+    if config.CACHE_BACKEND == "redis":
+        try:
+            backend = RedisCache(config.CACHE_REDIS_URL)
+            backend.client.ping()
+            logger.info("Redis 캐시 연결 완료", extra={"url": config.CACHE_REDIS_URL})
+        except Exception as e:
+            logger.warning("Redis 캐시를 사용할 수 없어 프로세스 내 캐시를 사용합니다: %s", e)
+            backend = None
+    
+    if backend is None:
+        backend = LocalCache(config.CACHE_MAX_ENTRIES)
+    
+    return ModelCache(backend, config.CACHE_KEY_PREFIX, config.CACHE_TTL_SECONDS)
+
+
+# 전역 캐시 인스턴스
+cache = create_cache()
+register_cache_metrics(cache)
@@ -3,12 +3,22 @@
 클로바 OCR API를 사용한 고성능 OCR 처리 및 영양성분 추출
 """
 
-import requests
+import asyncio
 import base64
+import contextvars
+import functools
 import re
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logger import get_logger
+from metrics import CLOVA_ERRORS
+from tracing import ocr_stage
+from profiling import run_profiled
 from roi_processor import ROIProcessor
 
+logger = get_logger(__name__)
+
 class ClovaOCREngine:
     def __init__(self, api_url, secret_key):
         """
@@ -18,8 +28,6 @@ class ClovaOCREngine:
             api_url (str): 클로바 OCR API URL
             secret_key (str): 클로바 OCR API Secret Key
         """
-        print("🌐 네이버 클로바 OCR API 엔진을 초기화하는 중...")
-        
         self.api_url = api_url
         self.secret_key = secret_key
         self.headers = {
@@ -27,10 +35,26 @@ class ClovaOCREngine:
             'Content-Type': 'application/json'
         }
         
+        # 연결 재사용 (요청마다 TCP/TLS 연결을 새로 맺지 않도록)
+        import requests
+        self.session = requests.Session()
+        
         # ROI 프로세서 초기화
         self.roi_processor = ROIProcessor()
         
-        print(f"✅ 클로바 OCR 엔진 초기화 완료! (API URL: {api_url})")
+        logger.info("클로바 OCR 엔진 초기화 완료", extra={"api_url": api_url})
+    
+    def preconnect(self, timeout=5):
+        """
+        OCR API 서버에 미리 연결 (서버 시작 시 TLS 핸드셰이크를 첫 요청에서 치르지 않도록)
+        
+        응답 상태 코드는 확인하지 않으며, 맺은 연결은 세션 연결 풀에 남아 다음 요청에서 재사용됩니다.
+        
+        Returns:
+            int: 응답 상태 코드
+        """
+        response = self.session.head(self.api_url, timeout=timeout)
+        return response.status_code
         
     # OCR 텍스트 추출 (ROI 처리 포함)
     def extract_text(self, image_data, use_roi=True):
@@ -44,6 +68,8 @@ class ClovaOCREngine:
         Returns:
             dict: OCR 처리 결과
         """
+        import requests
+        
         try:
             # 이미지 데이터 처리
             if isinstance(image_data, str):
@@ -69,16 +95,16 @@ class ClovaOCREngine:
             
             # ROI 처리 적용
             if use_roi:
-                print("ROI 처리를 적용하여 영양성분표 영역을 최적화합니다...")
+                logger.debug("ROI 처리를 적용하여 영양성분표 영역을 최적화합니다")
                 roi_result = self.roi_processor.process_image_with_roi(image_data)
                 
                 if roi_result['success']:
-                    print(f"ROI 처리 완료: {roi_result['roi_bbox']}")
+                    logger.debug("ROI 처리 완료", extra={"roi_bbox": roi_result['roi_bbox']})
                     image_base64 = roi_result['processed_image']
                 else:
-                    print(f"ROI 처리 실패, 원본 이미지 사용: {roi_result['error']}")
+                    logger.warning("ROI 처리 실패, 원본 이미지 사용: %s", roi_result['error'])
             else:
-                print("ROI 처리를 건너뛰고 원본 이미지를 사용합니다.")
+                logger.debug("ROI 처리를 건너뛰고 원본 이미지를 사용합니다")
             
             # API 요청 데이터 (클로바 OCR V2 형식)
             request_data = {
@@ -95,30 +121,40 @@ class ClovaOCREngine:
             }
             
             # API 요청
-            response = requests.post(self.api_url, headers=self.headers, json=request_data)
+            try:
+                with ocr_stage("clova_call") as span:
+                    response = self.session.post(self.api_url, headers=self.headers, json=request_data)
+                    span.set("bytes_out", len(image_base64))
+                    span.set("bytes_in", len(response.content))
+                    span.set("status_code", response.status_code)
+            except requests.RequestException as e:
+                CLOVA_ERRORS.inc(reason=type(e).__name__)
+                raise
             
             # 디버깅 정보 출력
-            print(f"🔍 API 요청 URL: {self.api_url}")
-            print(f"🔍 응답 상태 코드: {response.status_code}")
+            logger.debug("클로바 OCR 응답", extra={"status_code": response.status_code})
             if response.status_code != 200:
-                print(f"🔍 응답 내용: {response.text}")
+                CLOVA_ERRORS.inc(reason=f"http_{response.status_code}")
+                logger.warning("클로바 OCR 요청 실패", extra={"status_code": response.status_code, "body": response.text[:500]})
             
             if response.status_code == 200:
-                result = response.json()
-                
-                # 텍스트 추출
-                full_text = ""
-                if 'images' in result and len(result['images']) > 0:
-                    fields = result['images'][0].get('fields', [])
-                    for field in fields:
-                        if 'inferText' in field:
-                            full_text += field['inferText'] + " "
-                
-                # 텍스트 후처리 (영양성분 인식률 향상)
-                if use_roi and full_text.strip():
-                    enhanced_text = self.roi_processor.enhance_nutrition_text_recognition(full_text.strip())
-                    print(f"📝 텍스트 후처리 적용: {len(full_text)} → {len(enhanced_text)} 문자")
-                    full_text = enhanced_text
+                with ocr_stage("parse") as span:
+                    result = response.json()
+                    
+                    # 텍스트 추출
+                    full_text = ""
+                    if 'images' in result and len(result['images']) > 0:
+                        fields = result['images'][0].get('fields', [])
+                        for field in fields:
+                            if 'inferText' in field:
+                                full_text += field['inferText'] + " "
+                    
+                    # 텍스트 후처리 (영양성분 인식률 향상)
+                    if use_roi and full_text.strip():
+                        enhanced_text = self.roi_processor.enhance_nutrition_text_recognition(full_text.strip())
+                        logger.debug("텍스트 후처리 적용", extra={"chars_before": len(full_text), "chars_after": len(enhanced_text)})
+                        full_text = enhanced_text
+                    span.set("chars", len(full_text.strip()))
                 
                 return {
                     'success': True,
@@ -237,3 +273,47 @@ class ClovaOCREngine:
             nutrition[nutrient] = value if value is not None else '정보없음'
         
         return nutrition
+
+
+# 전역 OCR 엔진 (처음 사용할 때 생성)
+_ocr_engine = None
+_ocr_engine_lock = threading.Lock()
+
+def get_ocr_engine() -> ClovaOCREngine:
+    """설정된 클로바 OCR 엔진 반환 (모듈 import 시 생성하지 않고 첫 요청 또는 서버 시작 시 생성)"""
+    global _ocr_engine
+    if _ocr_engine is None:
+        with _ocr_engine_lock:
+            if _ocr_engine is None:
+                from config import config
+                _ocr_engine = ClovaOCREngine(config.CLOVA_OCR_API_URL, config.CLOVA_OCR_SECRET_KEY)
+    return _ocr_engine
+
+
+# OCR 전용 스레드 풀 (워커 프로세스마다 처음 사용할 때 생성)
+_ocr_executor = None
+_ocr_executor_lock = threading.Lock()
+
+def get_ocr_executor() -> ThreadPoolExecutor:
+    """
+    이미지 처리/OCR 호출 전용 스레드 풀 반환
+    
+    CPU를 많이 쓰는 OCR 처리는 OCR_WORKER_THREADS 개까지만 동시에 실행하고,
+    OpenCV 내부 스레드 수도 OCR_CV_THREADS 로 제한하여 워커 여러 개가 코어를 나눠 쓰도록 합니다.
+    """
+    global _ocr_executor
+    if _ocr_executor is None:
+        with _ocr_executor_lock:
+            if _ocr_executor is None:
+                import cv2
+                from config import config
+                if config.OCR_CV_THREADS > 0:
+                    cv2.setNumThreads(config.OCR_CV_THREADS)
+                _ocr_executor = ThreadPoolExecutor(max_workers=config.OCR_WORKER_THREADS, thread_name_prefix="ocr")
+    return _ocr_executor
+
+async def run_ocr(func, *args):
+    """OCR 전용 스레드 풀에서 함수 실행 (요청의 추적 컨텍스트 유지, 프로파일링 중이면 OCR 스레드도 샘플링)"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_ocr_executor(), functools.partial(context.run, run_profiled, func, *args))
@@ -25,6 +25,104 @@ class Config:
     # CORS 설정
     ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
     
+    # 식사 기간 조회 설정 (한 번에 조회 가능한 최대 일수)
+    MEALS_RANGE_MAX_DAYS = int(os.getenv("MEALS_RANGE_MAX_DAYS", 366))
+    
+    # 식사 기록 페이지 크기 설정
+    MEALS_HISTORY_DEFAULT_LIMIT = int(os.getenv("MEALS_HISTORY_DEFAULT_LIMIT", 20))
+    MEALS_HISTORY_MAX_LIMIT = int(os.getenv("MEALS_HISTORY_MAX_LIMIT", 100))
+    
+    # 식사 일괄 등록 설정 (COPY 단위 행 수, 응답에 포함할 최대 오류 수)
+    MEALS_IMPORT_CHUNK_SIZE = int(os.getenv("MEALS_IMPORT_CHUNK_SIZE", 5000))
+    MEALS_IMPORT_MAX_ERRORS = int(os.getenv("MEALS_IMPORT_MAX_ERRORS", 100))
+    
+    # 영양소 기록 내보내기 설정 (서버 측 커서에서 한 번에 가져올 행 수)
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+    
+    # nutrition_records 월별 파티션 설정
+    PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+    PARTITION_ARCHIVE_AFTER_MONTHS = int(os.getenv("PARTITION_ARCHIVE_AFTER_MONTHS", 24))
+    PARTITION_ARCHIVE_SCHEMA = os.getenv("PARTITION_ARCHIVE_SCHEMA", "nutrition_archive")
+    
+    # 캐시 설정 (local: 프로세스 내 캐시, redis: Redis 프로토콜 서버 공유)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local").lower()
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "kiumbapsang:")
+    CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 300))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    
+    # 캐시 무효화 이벤트 설정 (PostgreSQL LISTEN/NOTIFY)
+    CACHE_INVALIDATION_ENABLED = os.getenv("CACHE_INVALIDATION_ENABLED", "True").lower() == "true"
+    CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache_invalidation")
+    
+    # 세션 토큰 설정 (서버 프로세스 간 같은 키를 사용해야 함, 운영 모드/SESSION_REQUIRED=true 에서는 필수)
+    SESSION_SECRET_KEY = os.getenv("SESSION_SECRET_KEY", "")
+    SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 7 * 24 * 3600))
+    SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", 10000))
+    # true면 사용자 데이터 API에 세션 토큰 필수 (false면 기존 user_id 파라미터도 허용)
+    SESSION_REQUIRED = os.getenv("SESSION_REQUIRED", "False").lower() == "true"
+    # 관리용 API 키 (X-Admin-Key 헤더로 전달, 설정하지 않으면 관리용 API를 사용할 수 없음)
+    ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")
+    
+    # 로깅 설정 (LOG_LEVELS 예: "clova_ocr=DEBUG,roi_processor=WARNING")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0))
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    
+    # OCR 처리 추적 설정 (OCR_TRACE_FILE 지정 시 OTLP JSON 형식으로 기록, 비우면 ?trace=true 응답에만 포함)
+    OCR_TRACE_FILE = os.getenv("OCR_TRACE_FILE", "")
+    OCR_TRACE_SAMPLE_RATE = float(os.getenv("OCR_TRACE_SAMPLE_RATE", 1.0))
+    OCR_TRACE_SERVICE_NAME = os.getenv("OCR_TRACE_SERVICE_NAME", "kiumbapsang-ocr")
+    
+    # 요청 프로파일링 설정 (PROFILE_SAMPLE_RATE가 0이고 PROFILE_ROUTES가 비어 있으면 사용 안 함)
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_ROUTES = os.getenv("PROFILE_ROUTES", "")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 5))
+    PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 200))
+    PROFILE_MAX_AGE_HOURS = float(os.getenv("PROFILE_MAX_AGE_HOURS", 72))
+    
+    # 운영 서버 설정 (SERVER_MODE=production 이면 main.py가 워커 프로세스 여러 개로 실행)
+    SERVER_MODE = os.getenv("SERVER_MODE", "development").lower()
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", os.cpu_count() or 1))
+    # 요청을 이만큼 처리한 워커는 처리 중인 요청을 마치고 교체 (OpenCV 등의 메모리 누수 방지, 0이면 교체 안 함)
+    WORKER_MAX_REQUESTS = int(os.getenv("WORKER_MAX_REQUESTS", 5000))
+    WORKER_MAX_REQUESTS_JITTER = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", 500))
+    WORKER_GRACEFUL_TIMEOUT = float(os.getenv("WORKER_GRACEFUL_TIMEOUT", 30))
+    # 워커별 메트릭 파일 디렉터리 (/metrics 가 모든 워커 값을 합산, 비우면 임시 디렉터리 사용)
+    METRICS_DIR = os.getenv("METRICS_DIR", "")
+    
+    # OCR 처리 설정 (워커 프로세스마다 OCR 전용 스레드 수, OpenCV 내부 스레드 수 - 0이면 OpenCV 기본값)
+    OCR_WORKER_THREADS = int(os.getenv("OCR_WORKER_THREADS", 2))
+    OCR_CV_THREADS = int(os.getenv("OCR_CV_THREADS", 1))
+    
+    # 이미지 처리 입장 제어 (워커 프로세스마다 동시 처리 수와 디코딩 후 예상 메모리 사용량 제한)
+    OCR_MAX_CONCURRENT = int(os.getenv("OCR_MAX_CONCURRENT", OCR_WORKER_THREADS))
+    OCR_MEMORY_BUDGET_MB = int(os.getenv("OCR_MEMORY_BUDGET_MB", 512))
+    # 예산이 찰 때 기다릴 수 있는 요청 수와 대기 시간 (넘으면 503 + Retry-After)
+    OCR_ADMISSION_MAX_WAITING = int(os.getenv("OCR_ADMISSION_MAX_WAITING", 16))
+    OCR_ADMISSION_TIMEOUT_SECONDS = float(os.getenv("OCR_ADMISSION_TIMEOUT_SECONDS", 10))
+    OCR_ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("OCR_ADMISSION_RETRY_AFTER_SECONDS", 5))
+    
+    # OCR 비동기 작업 설정 (POST /ocr/jobs - 작업은 DB에 저장되어 서버 재시작 후에도 처리됨)
+    OCR_JOBS_ENABLED = os.getenv("OCR_JOBS_ENABLED", "True").lower() == "true"
+    OCR_JOB_WORKERS = int(os.getenv("OCR_JOB_WORKERS", 2))
+    OCR_JOB_MAX_QUEUED = int(os.getenv("OCR_JOB_MAX_QUEUED", 1000))
+    # 작업 등록/변경 알림 채널 (PostgreSQL LISTEN/NOTIFY), 알림을 놓친 경우를 대비한 대기 작업 확인 간격
+    OCR_JOB_CHANNEL = os.getenv("OCR_JOB_CHANNEL", "ocr_jobs")
+    OCR_JOB_POLL_SECONDS = float(os.getenv("OCR_JOB_POLL_SECONDS", 30.0))
+    # 처리 중인 워커가 이 시간 동안 진행 기록이 없으면 (프로세스 종료 등) 다른 워커가 다시 처리
+    OCR_JOB_LEASE_SECONDS = int(os.getenv("OCR_JOB_LEASE_SECONDS", 120))
+    OCR_JOB_MAX_ATTEMPTS = int(os.getenv("OCR_JOB_MAX_ATTEMPTS", 3))
+    OCR_JOB_RETENTION_HOURS = float(os.getenv("OCR_JOB_RETENTION_HOURS", 24))
+    
+    # 서버 시작 시 준비 작업 설정 (끝나기 전까지 /ready 는 503 응답)
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "True").lower() == "true"
+    WARMUP_OCR_PRECONNECT = os.getenv("WARMUP_OCR_PRECONNECT", "True").lower() == "true"
+    WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", 5))
+    
     # API 설정
     API_TITLE = "키움밥상 OCR API"
     API_VERSION = "1.0.0"
@@ -0,0 +1,24 @@
+-- 일별 영양소 집계 테이블 생성
+-- MealsService의 식사 추가/수정/삭제 시 같은 트랜잭션에서 증감 갱신됩니다.
+-- 서버 시작 시 테이블이 없으면 자동으로 생성 후 기존 데이터를 적재합니다 (MealsService.ensure_daily_totals_table).
+-- 재계산: python rebuild_daily_totals.py
+CREATE TABLE IF NOT EXISTS daily_nutrition_totals (
+    user_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    total_meals INTEGER NOT NULL DEFAULT 0,
+    total_calories DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_protein DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_carbs DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_fat DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_sodium DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_sugar DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_cholesterol DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_saturated_fat DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_trans_fat DOUBLE PRECISION NOT NULL DEFAULT 0,
+    breakfast_meals INTEGER NOT NULL DEFAULT 0,
+    lunch_meals INTEGER NOT NULL DEFAULT 0,
+    dinner_meals INTEGER NOT NULL DEFAULT 0,
+    snack_meals INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, day)
+);
@@ -0,0 +1,8 @@
+-- 식사 기록 조회용 인덱스 생성
+-- 사용자별 날짜/기간 조회 (GET /meals/{date}, GET /meals/range)
+CREATE INDEX IF NOT EXISTS idx_nutrition_records_user_date
+    ON nutrition_records(user_id, intake_date, created_at);
+
+-- 사용자별 최신순 기록 페이지 조회 (GET /meals/history 키셋 페이지네이션)
+CREATE INDEX IF NOT EXISTS idx_nutrition_records_user_created
+    ON nutrition_records(user_id, created_at DESC, id DESC);
@@ -9,9 +9,28 @@ from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from typing import Generator
 from dotenv import load_dotenv
+from logger import get_logger
+from metrics import DB_CONNECT_LATENCY, DB_QUERY_LATENCY, statement_type
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
+class TimedCursor(RealDictCursor):
+    """쿼리 실행 시간을 메트릭으로 기록하는 커서"""
+    
+    def execute(self, query, vars=None):
+        with DB_QUERY_LATENCY.time(statement=statement_type(query)):
+            return super().execute(query, vars)
+    
+    def executemany(self, query, vars_list):
+        with DB_QUERY_LATENCY.time(statement=statement_type(query)):
+            return super().executemany(query, vars_list)
+    
+    def copy_expert(self, sql, file, size=8192):
+        with DB_QUERY_LATENCY.time(statement="COPY"):
+            return super().copy_expert(sql, file, size)
+
 class Database:
     """데이터베이스 연결 관리 클래스"""
     
@@ -31,14 +50,15 @@ class Database:
         """데이터베이스 연결 컨텍스트 매니저"""
         conn = None
         try:
-            conn = psycopg2.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                port=self.port,
-                cursor_factory=RealDictCursor
-            )
+            with DB_CONNECT_LATENCY.time():
+                conn = psycopg2.connect(
+                    host=self.host,
+                    database=self.database,
+                    user=self.user,
+                    password=self.password,
+                    port=self.port,
+                    cursor_factory=TimedCursor
+                )
             yield conn
         except Exception as e:
             if conn:
@@ -56,7 +76,7 @@ class Database:
                     cursor.execute("SELECT 1")
                     return True
         except Exception as e:
-            print(f"데이터베이스 연결 실패: {e}")
+            logger.error("데이터베이스 연결 실패: %s", e)
             return False
 
 # 전역 데이터베이스 인스턴스
@@ -0,0 +1,186 @@
+"""
+캐시 무효화 이벤트 모듈
+PostgreSQL LISTEN/NOTIFY로 여러 서버 프로세스의 캐시를 함께 무효화합니다.
+
+쓰기 경로는 트랜잭션 안에서 pg_notify로 이벤트를 발행하므로 커밋된 변경만 전달되고,
+각 프로세스의 백그라운드 리스너가 이벤트를 받아 해당 키를 바로 삭제합니다.
+
+이벤트 형식 (JSON):
+    {"sender": "호스트:PID", "keys": [...], "clear": [...], "tables": [...]}
+    - keys: 삭제할 캐시 키 (profile:id:1, summary:1:2025-01-01 등)
+    - clear: 통째로 비울 캐시 네임스페이스 (summary: 등)
+    - tables: 다시 읽어야 하는 참조 테이블 (average_nutrition 등)
+"""
+
+import json
+import os
+import select
+import socket
+import threading
+from typing import Callable, Dict, Iterable, List
+from config import config
+from database import db
+from cache import cache
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# NOTIFY 페이로드 최대 크기(8000바이트)보다 작게 나눠 발행
+MAX_PAYLOAD_BYTES = 7000
+
+# 이벤트 처리 함수 목록 (캐시 키 삭제 외에 추가로 처리할 모듈이 등록)
+_handlers: List[Callable[[Dict], None]] = []
+
+
+def sender_id() -> str:
+    """이벤트 발행 프로세스 식별자 (fork된 워커마다 다름)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def subscribe(handler: Callable[[Dict], None]) -> None:
+    """
+    무효화 이벤트 처리 함수 등록
+    
+    리스너가 재연결된 경우(중간에 놓친 이벤트가 있을 수 있음)에는
+    {"reset": True} 이벤트가 전달되므로 보관 중인 데이터를 모두 버려야 합니다.
+    """
+    _handlers.append(handler)
+
+
+def unsubscribe(handler: Callable[[Dict], None]) -> None:
+    """등록한 무효화 이벤트 처리 함수 해제 (등록되지 않았으면 무시)"""
+    if handler in _handlers:
+        _handlers.remove(handler)
+
+
+def apply(event: Dict) -> None:
+    """현재 프로세스에 무효화 이벤트 반영"""
+    if event.get("reset"):
+        cache.clear()
+    if event.get("keys"):
+        cache.delete(*event["keys"])
+    for namespace in event.get("clear", []):
+        cache.clear(namespace)
+    
+    for handler in _handlers:
+        try:
+            handler(event)
+        except Exception as e:
+            logger.warning("캐시 무효화 처리 실패: %s", e)
+
+
+def publish(cursor, keys: Iterable[str] = (), clear: Iterable[str] = (), tables: Iterable[str] = ()) -> None:
+    """
+    현재 트랜잭션에 무효화 이벤트 추가 (커밋될 때 모든 프로세스에 전달)
+    
+    키가 많으면 NOTIFY 페이로드 제한에 맞춰 여러 이벤트로 나눕니다.
+    """
+    keys, clear, tables = list(keys), list(clear), list(tables)
+    if not (keys or clear or tables):
+        return
+    
+    sender = sender_id()
+    events = []
+    current = {"sender": sender, "keys": [], "clear": clear, "tables": tables}
+    size = len(json.dumps(current, ensure_ascii=False).encode("utf-8"))
+    for key in keys:
+        key_size = len(json.dumps(key, ensure_ascii=False).encode("utf-8")) + 1
+        if current["keys"] and size + key_size > MAX_PAYLOAD_BYTES:
+            events.append(current)
+            current = {"sender": sender, "keys": []}
+            size = len(json.dumps(current).encode("utf-8"))
+        current["keys"].append(key)
+        size += key_size
+    events.append(current)
+    
+    for event in events:
+        cursor.execute(
+            "SELECT pg_notify(%s, %s)",
+            (config.CACHE_INVALIDATION_CHANNEL, json.dumps(event, ensure_ascii=False))
+        )
+
+
+def commit(conn, cursor, keys: Iterable[str] = (), clear: Iterable[str] = (), tables: Iterable[str] = ()) -> None:
+    """
+    무효화 이벤트를 발행하고 커밋한 뒤 현재 프로세스에도 바로 반영
+    
+    쓰기 경로의 conn.commit() 대신 사용합니다. 현재 프로세스는 리스너를 기다리지 않고
+    즉시 반영하므로 같은 워커에서의 후속 조회는 항상 새 데이터를 봅니다.
+    """
+    keys, clear, tables = list(keys), list(clear), list(tables)
+    publish(cursor, keys, clear, tables)
+    conn.commit()
+    apply({"keys": keys, "clear": clear, "tables": tables})
+
+
+class InvalidationListener:
+    """무효화 이벤트 백그라운드 리스너 (프로세스당 하나)"""
+    
+    def __init__(self, channel: str = None, poll_timeout: float = 5.0):
+        self.channel = channel or config.CACHE_INVALIDATION_CHANNEL
+        self.poll_timeout = poll_timeout
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+    
+    def start(self) -> None:
+        """리스너 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """리스너 스레드 종료"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_timeout + 1)
+    
+    def _run(self) -> None:
+        """연결이 끊기면 재연결하며 이벤트 수신"""
+        backoff = 1
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                with db.get_connection() as conn:
+                    conn.autocommit = True
+                    with conn.cursor() as cursor:
+                        cursor.execute(f'LISTEN "{self.channel}"')
+                    
+                    # 재연결이면 끊긴 동안 놓친 이벤트가 있을 수 있으므로 전체 무효화
+                    if connected_before:
+                        apply({"reset": True})
+                    connected_before = True
+                    backoff = 1
+                    logger.info("캐시 무효화 리스너 시작", extra={"channel": self.channel})
+                    
+                    self._listen(conn)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning("캐시 무효화 리스너 연결 실패, %s초 후 재시도: %s", backoff, e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+    
+    def _listen(self, conn) -> None:
+        """알림이 오면 즉시 깨어나 처리"""
+        own_sender = sender_id()
+        while not self._stop.is_set():
+            if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                try:
+                    event = json.loads(notify.payload)
+                except ValueError:
+                    continue
+                # 직접 발행한 이벤트는 커밋 시 이미 반영됨
+                if event.get("sender") != own_sender:
+                    apply(event)
+
+
+# 전역 리스너 인스턴스
+invalidation_listener = InvalidationListener()
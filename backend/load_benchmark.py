@@ -0,0 +1,433 @@
+"""
+전체 서비스 부하 벤치마크 스크립트
+로컬 PostgreSQL과 가짜 클로바 OCR 서버로 API 서버를 띄우고, 임시 사용자/식사 데이터를 만든 뒤
+실제 화면 사용 비율에 가까운 요청을 동시에 보내 경로별 처리량과 지연 시간을 측정합니다.
+결과는 JSON으로 출력하므로 커밋 간 비교에 사용할 수 있습니다.
+
+사용법:
+    python load_benchmark.py [--concurrency 16] [--duration 30] [--users 20] [--output result.json]
+    python load_benchmark.py --url http://localhost:8000   # 이미 실행 중인 서버 대상
+
+데이터베이스 접속 정보는 서버와 같은 DB_* 환경 변수를 사용하며, 측정 후 임시 데이터를 삭제합니다.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 가짜 클로바 OCR 응답 텍스트 (영양성분표 인식 결과)
+FAKE_CLOVA_TEXT = (
+    "영양정보 총 내용량 100g 나트륨 250mg 탄수화물 45g 당류 8g 지방 12g "
+    "트랜스지방 0g 포화지방 4g 콜레스테롤 0mg 단백질 15g"
+)
+
+# 기본 요청 비율 (경로 이름=가중치)
+DEFAULT_MIX = {
+    "ocr_upload": 1,
+    "meals_by_date": 4,
+    "meals_summary": 2,
+    "meals_range": 1,
+    "meals_create": 1,
+    "nutrition_compare": 2,
+    "nutrition_compare_range": 1,
+    "user_profile": 2,
+}
+
+
+# ===== 가짜 클로바 OCR 서버 =====
+
+class FakeClovaHandler(BaseHTTPRequestHandler):
+    """클로바 OCR V2 형식으로 고정된 인식 결과를 돌려주는 핸들러"""
+    
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        
+        body = json.dumps({
+            "version": "V2",
+            "requestId": "benchmark",
+            "timestamp": int(time.time() * 1000),
+            "images": [{
+                "inferResult": "SUCCESS",
+                "fields": [{"inferText": word} for word in FAKE_CLOVA_TEXT.split()]
+            }]
+        }, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_clova(latency_ms: float) -> Tuple[ThreadingHTTPServer, str]:
+    """가짜 클로바 OCR 서버 시작 (빈 포트 사용)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeClovaHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000
+    threading.Thread(target=server.serve_forever, name="fake-clova", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/ocr/v1/general"
+
+
+# ===== API 서버 =====
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(port: int, clova_url: str) -> subprocess.Popen:
+    """가짜 클로바 OCR을 바라보는 API 서버 실행 후 시작 준비 작업(/ready)이 끝날 때까지 대기"""
+    env = dict(os.environ)
+    env.update({
+        "CLOVA_OCR_API_URL": clova_url,
+        "CLOVA_OCR_SECRET_KEY": "benchmark",
+        "LOG_LEVEL": env.get("LOG_LEVEL", "WARNING"),
+    })
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        # 서버 로그가 결과 JSON(stdout)과 섞이지 않도록 stderr로 출력
+        stdout=sys.stderr
+    )
+    
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API 서버가 종료되었습니다 (종료 코드 {process.returncode})")
+        try:
+            if requests.get(base_url + "/ready", timeout=1).status_code == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    
+    process.terminate()
+    raise RuntimeError("API 서버가 60초 안에 시작되지 않았습니다")
+
+
+# ===== 데이터 준비/정리 =====
+
+def sample_image() -> bytes:
+    """OCR 업로드용 합성 영양성분표 이미지 (JPEG)"""
+    import cv2
+    import numpy as np
+    
+    image = np.full((900, 600, 3), 255, np.uint8)
+    cv2.rectangle(image, (60, 60), (540, 840), (0, 0, 0), 4)
+    for row in range(10):
+        y = 130 + row * 70
+        cv2.line(image, (60, y), (540, y), (0, 0, 0), 2)
+        cv2.putText(image, f"Nutrient {row} {random.randint(1, 500)}g", (90, y - 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+    return cv2.imencode(".jpg", image)[1].tobytes()
+
+
+def seed_users(base_url: str, users: int, meals_per_user: int, days: int, seeded: List[Dict]) -> List[Dict]:
+    """
+    API로 임시 사용자를 만들고 최근 days일에 걸친 식사를 일괄 등록
+    
+    만든 사용자는 바로 seeded에 추가하므로 중간에 실패해도 호출한 쪽에서 이미 만든 데이터를 정리할 수 있습니다.
+    """
+    session = requests.Session()
+    suffix = uuid.uuid4().hex[:8]
+    today = date.today()
+    
+    for index in range(users):
+        response = session.post(f"{base_url}/user/profile", json={
+            "google_id": f"load-{suffix}-{index}",
+            "email": f"load-{suffix}-{index}@example.com",
+            "username": f"load-{suffix}-{index}",
+            "age": 20 + index % 60,
+            "birth": date(today.year - 20 - index % 60, 1 + index % 12, 1).isoformat(),
+            "height": 150.0 + index % 40,
+            "weight": 45.0 + index % 50,
+            "address": "벤치마크"
+        })
+        response.raise_for_status()
+        profile = response.json()["data"]
+        user = {"id": profile["id"], "token": profile.get("session_token")}
+        seeded.append(user)
+        
+        meals = "\n".join(json.dumps({
+            "food_name": f"벤치마크 식사 {meal}",
+            "intake_date": (today - timedelta(days=meal % days)).isoformat(),
+            "nutrition_data": {
+                "amount": 100, "calories": 200 + meal % 300, "protein": 10 + meal % 20,
+                "carbs": 30 + meal % 40, "fat": 5 + meal % 15, "sodium": 200 + meal % 500, "sugar": meal % 20
+            }
+        }, ensure_ascii=False) for meal in range(meals_per_user))
+        response = session.post(
+            f"{base_url}/meals/import",
+            params={"user_id": user["id"], "format": "ndjson"},
+            headers=auth_headers(user),
+            files={"file": ("meals.ndjson", meals.encode("utf-8"), "application/x-ndjson")}
+        )
+        response.raise_for_status()
+    
+    return seeded
+
+
+def cleanup_users(user_ids: List[int]) -> None:
+    """임시 사용자와 식사 기록/일별 집계 삭제"""
+    from database import db
+    
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM nutrition_records WHERE user_id = ANY(%s)", (user_ids,))
+            cursor.execute("DELETE FROM daily_nutrition_totals WHERE user_id = ANY(%s)", (user_ids,))
+            cursor.execute("DELETE FROM user_profiles WHERE id = ANY(%s)", (user_ids,))
+        conn.commit()
+
+
+def auth_headers(user: Dict) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {user['token']}"} if user.get("token") else {}
+
+
+# ===== 요청 시나리오 =====
+
+def make_scenarios(base_url: str, image: bytes, days: int):
+    """경로 이름 → 요청 함수(session, user, rng) 목록"""
+    today = date.today()
+    
+    def random_day(rng) -> str:
+        return (today - timedelta(days=rng.randrange(days))).isoformat()
+    
+    def ocr_upload(session, user, rng):
+        return session.post(
+            f"{base_url}/ocr/upload",
+            params={"roi_bbox": "40,40,520,820"},
+            files={"file": ("label.jpg", image, "image/jpeg")}
+        )
+    
+    def meals_by_date(session, user, rng):
+        return session.get(f"{base_url}/meals/{random_day(rng)}",
+                           params={"user_id": user["id"]}, headers=auth_headers(user))
+    
+    def meals_summary(session, user, rng):
+        return session.get(f"{base_url}/meals/summary/{random_day(rng)}",
+                           params={"user_id": user["id"]}, headers=auth_headers(user))
+    
+    def meals_range(session, user, rng):
+        return session.get(f"{base_url}/meals/range", params={
+            "user_id": user["id"], "start": (today - timedelta(days=29)).isoformat(), "end": today.isoformat()
+        }, headers=auth_headers(user))
+    
+    def meals_create(session, user, rng):
+        return session.post(f"{base_url}/meals", params={"user_id": user["id"]}, headers=auth_headers(user), json={
+            "food_name": "벤치마크 추가 식사",
+            "intake_date": random_day(rng),
+            "nutrition_data": {"amount": 100, "calories": 300, "protein": 15, "carbs": 45, "fat": 12}
+        })
+    
+    def nutrition_compare(session, user, rng):
+        return session.get(f"{base_url}/nutrition/compare/{user['id']}/{random_day(rng)}",
+                           headers=auth_headers(user))
+    
+    def nutrition_compare_range(session, user, rng):
+        return session.get(f"{base_url}/nutrition/compare/{user['id']}", params={
+            "start": (today - timedelta(days=6)).isoformat(), "end": today.isoformat()
+        }, headers=auth_headers(user))
+    
+    def user_profile(session, user, rng):
+        return session.get(f"{base_url}/user/profile/{user['id']}", headers=auth_headers(user))
+    
+    return {
+        "ocr_upload": ocr_upload,
+        "meals_by_date": meals_by_date,
+        "meals_summary": meals_summary,
+        "meals_range": meals_range,
+        "meals_create": meals_create,
+        "nutrition_compare": nutrition_compare,
+        "nutrition_compare_range": nutrition_compare_range,
+        "user_profile": user_profile,
+    }
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """--mix 값(경로=가중치,경로=가중치) 파싱 (지정하지 않은 경로는 0)"""
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise ValueError(f"알 수 없는 경로 이름: {name.strip()} (사용 가능: {', '.join(DEFAULT_MIX)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# ===== 부하 생성 및 집계 =====
+
+def run_load(scenarios, mix: Dict[str, float], users: List[Dict], concurrency: int,
+             duration: float, warmup: float, seed: int) -> Tuple[Dict[str, List[Tuple[float, bool]]], float]:
+    """concurrency개 스레드로 duration초 동안 요청 (워밍업 구간은 집계 제외)"""
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    results: Dict[str, List[Tuple[float, bool]]] = {name: [] for name in names}
+    lock = threading.Lock()
+    
+    start = time.monotonic()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    
+    def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        session = requests.Session()
+        local: Dict[str, List[Tuple[float, bool]]] = {name: [] for name in names}
+        while True:
+            name = rng.choices(names, weights)[0]
+            user = rng.choice(users)
+            request_start = time.monotonic()
+            if request_start >= deadline:
+                break
+            try:
+                ok = scenarios[name](session, user, rng).status_code < 400
+            except requests.RequestException:
+                ok = False
+            if request_start >= measure_from:
+                local[name].append(((time.monotonic() - request_start) * 1000, ok))
+        with lock:
+            for name, samples in local.items():
+                results[name].extend(samples)
+    
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # 마지막 요청이 끝난 시점까지를 측정 시간으로 사용
+    return results, max(time.monotonic() - measure_from, 1e-9)
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """정렬된 목록의 백분위 값 (nearest-rank)"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return round(ordered[index], 2)
+
+
+def summarize(samples: List[Tuple[float, bool]], elapsed: float) -> Dict:
+    latencies = sorted(latency for latency, _ in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, ok in samples if not ok),
+        "rps": round(len(samples) / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키움밥상 API 부하 벤치마크")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (지정하지 않으면 가짜 클로바 OCR과 함께 서버 실행)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수 (기본 16)")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초, 기본 30)")
+    parser.add_argument("--warmup", type=float, default=3, help="집계에서 제외할 워밍업 시간(초, 기본 3)")
+    parser.add_argument("--users", type=int, default=20, help="임시 사용자 수 (기본 20)")
+    parser.add_argument("--meals-per-user", type=int, default=90, help="사용자당 식사 수 (기본 90)")
+    parser.add_argument("--days", type=int, default=30, help="식사를 나눌 최근 일수 (기본 30)")
+    parser.add_argument("--mix", default="", help="요청 비율 (예: ocr_upload=1,meals_by_date=4)")
+    parser.add_argument("--clova-latency-ms", type=float, default=300, help="가짜 클로바 OCR 응답 지연 (기본 300ms)")
+    parser.add_argument("--seed", type=int, default=1, help="요청 순서 난수 시드")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--keep-data", action="store_true", help="측정 후 임시 데이터를 삭제하지 않음")
+    args = parser.parse_args()
+    
+    mix = parse_mix(args.mix)
+    clova_server = process = None
+    users: List[Dict] = []
+    
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            clova_server, clova_url = start_fake_clova(args.clova_latency_ms)
+            port = free_port()
+            process = start_app(port, clova_url)
+            base_url = f"http://127.0.0.1:{port}"
+        
+        print(f"🧪 임시 사용자 {args.users}명, 사용자당 식사 {args.meals_per_user}개 준비 중...", file=sys.stderr)
+        seed_users(base_url, args.users, args.meals_per_user, args.days, users)
+        
+        print(f"🚀 동시 요청 {args.concurrency}개로 {args.duration:g}초 측정 중...", file=sys.stderr)
+        scenarios = make_scenarios(base_url, sample_image(), args.days)
+        results, elapsed = run_load(
+            scenarios, mix, users, args.concurrency, args.duration, args.warmup, args.seed
+        )
+        
+        all_samples = [sample for samples in results.values() for sample in samples]
+        report = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "warmup_s": args.warmup,
+                "users": args.users,
+                "meals_per_user": args.meals_per_user,
+                "clova_latency_ms": None if args.url else args.clova_latency_ms,
+                "mix": mix,
+            },
+            "elapsed_s": round(elapsed, 2),
+            "total": summarize(all_samples, elapsed),
+            "routes": {name: summarize(samples, elapsed) for name, samples in results.items()},
+        }
+        
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        print(output)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+    finally:
+        if users and not args.keep_data:
+            try:
+                cleanup_users([user["id"] for user in users])
+                print("🗑️ 벤치마크 데이터 정리 완료", file=sys.stderr)
+            except Exception as e:
+                print(f"⚠️ 벤치마크 데이터 정리 실패: {e}", file=sys.stderr)
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        if clova_server:
+            clova_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
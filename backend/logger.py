@@ -0,0 +1,151 @@
+"""
+로깅 모듈
+요청 처리 스레드는 로그 레코드를 큐에 넣기만 하고, 백그라운드 스레드가 포맷/출력을 담당하여
+stdout 쓰기 때문에 요청이 대기하지 않도록 합니다.
+
+설정 (환경 변수):
+    LOG_LEVEL=INFO                                  기본 로그 레벨
+    LOG_LEVELS=clova_ocr=DEBUG,roi_processor=WARNING  모듈별 로그 레벨
+    LOG_FORMAT=json | text                           출력 형식
+    LOG_DEBUG_SAMPLE_RATE=0.1                        DEBUG 로그 샘플링 비율 (0~1)
+    LOG_QUEUE_SIZE=10000                             큐가 가득 차면 새 로그는 버림
+
+사용 예:
+    from logger import get_logger
+    logger = get_logger(__name__)
+    logger.info("식사 추가 성공", extra={"meal_id": 1, "user_id": 2})
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import traceback
+from typing import Dict
+import orjson
+from config import config
+
+ROOT_LOGGER_NAME = "kiumbapsang"
+
+# LogRecord 기본 속성 (이외의 속성은 extra로 전달된 구조화 필드로 출력)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 로그를 버리는 핸들러"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        메시지 인자를 미리 합치고 예외는 문자열로 변환
+        (다른 스레드에서 포맷할 때 인자 객체나 트레이스백 프레임이 바뀌거나 붙잡히지 않도록)
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """DEBUG 로그는 지정한 비율만 통과"""
+    
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class StructuredFormatter(logging.Formatter):
+    """JSON 한 줄 또는 "시각 레벨 모듈: 메시지 key=value" 형식으로 출력"""
+    
+    def __init__(self, fmt: str = "json"):
+        super().__init__()
+        self.json = fmt == "json"
+    
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+        timestamp += f".{int(record.msecs):03d}"
+        name = record.name[len(ROOT_LOGGER_NAME) + 1:] or record.name
+        
+        if self.json:
+            entry = {"ts": timestamp, "level": record.levelname, "logger": name, "msg": record.getMessage()}
+            entry.update(fields)
+            if record.exc_text:
+                entry["exc"] = record.exc_text
+            return orjson.dumps(entry, default=str).decode("utf-8")
+        
+        line = f"{timestamp} {record.levelname:<7} {name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """LOG_LEVELS 값(모듈=레벨,모듈=레벨) 파싱"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """큐 핸들러와 백그라운드 출력 스레드 설정 (모듈 import 시 한 번 실행)"""
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(config.LOG_LEVEL)
+    root.propagate = False
+    
+    for name, level in _parse_levels(config.LOG_LEVELS).items():
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}").setLevel(level)
+    
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(StructuredFormatter(config.LOG_FORMAT))
+    
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter(config.LOG_DEBUG_SAMPLE_RATE))
+    root.handlers = [handler]
+    
+    listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    # 종료 시 큐에 남은 로그 출력
+    atexit.register(listener.stop)
+    return listener
+
+
+def get_logger(name: str) -> logging.Logger:
+    """모듈별 로거 반환 (LOG_LEVELS의 모듈 이름으로 레벨 지정 가능)"""
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def _restart_after_fork() -> None:
+    """fork로 만든 워커 프로세스에서 새 큐와 출력 스레드로 다시 설정 (부모의 출력 스레드는 복제되지 않음)"""
+    global log_listener
+    log_listener = setup_logging()
+
+
+# 전역 로그 출력 스레드
+log_listener = setup_logging()
+os.register_at_fork(after_in_child=_restart_after_fork)
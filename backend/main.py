@@ -2,11 +2,52 @@
 # -*- coding: utf-8 -*-
 """
 키움밥상 OCR API 서버 실행 파일
+
+개발 모드 (기본): 프로세스 하나로 실행하며 DEBUG=True 면 코드 변경 시 자동 재시작
+운영 모드 (SERVER_MODE=production): WEB_WORKERS 개의 워커 프로세스로 실행 (코드 변경 자동 반영 없음)
 """
 
+import os
 import uvicorn
 from config import config
 
+def preload_shared_data():
+    """워커를 만들기 전에 부모 프로세스에서 읽기 전용 공용 데이터 로드 (워커들이 메모리 페이지를 공유)"""
+    from reference_data import average_nutrition_cache
+    try:
+        count = average_nutrition_cache.reload()
+        print(f"📚 평균 영양소 참조 데이터 {count}건 로드")
+    except Exception as e:
+        print(f"⚠️  참조 데이터 로드 실패 (워커에서 처음 사용할 때 다시 시도): {e}")
+    
+    # 이미지 처리 모듈 코드도 미리 불러옴 (OpenCV 스레드 풀은 워커에서 처음 사용할 때 생성)
+    import cv2
+    import numpy
+    from PIL import Image
+
+def serve_production():
+    """운영 모드 실행"""
+    print(f"👷 워커 {config.WEB_WORKERS}개, 워커당 OCR 스레드 {config.OCR_WORKER_THREADS}개, "
+          f"워커 교체 기준 요청 {config.WORKER_MAX_REQUESTS}건")
+    
+    if not hasattr(os, "fork"):
+        # fork를 지원하지 않는 운영체제: uvicorn 다중 워커 (공용 데이터 공유/워커 교체 없음)
+        print("⚠️  이 운영체제는 fork를 지원하지 않아 공용 데이터 미리 로드와 워커 교체 없이 실행합니다.")
+        uvicorn.run("app:app", host=config.HOST, port=config.PORT, workers=config.WEB_WORKERS, log_level="warning")
+        return
+    
+    from prefork import PreforkServer
+    PreforkServer(
+        "app:app",
+        host=config.HOST,
+        port=config.PORT,
+        workers=config.WEB_WORKERS,
+        max_requests=config.WORKER_MAX_REQUESTS,
+        max_requests_jitter=config.WORKER_MAX_REQUESTS_JITTER,
+        graceful_timeout=config.WORKER_GRACEFUL_TIMEOUT,
+        metrics_dir=config.METRICS_DIR
+    ).run(preload=preload_shared_data)
+
 def main():
     """메인 실행 함수"""
     print("🚀 키움밥상 OCR API 서버를 시작합니다...")
@@ -18,6 +59,10 @@ def main():
         print("⚠️  .env 파일에 올바른 API 키를 설정해주세요.")
         print("📝 env_example.txt 파일을 참고하세요.")
     
+    if config.SERVER_MODE == "production":
+        serve_production()
+        return
+    
     # 서버 실행
     uvicorn.run(
         "app:app",
@@ -3,13 +3,76 @@
 식사 데이터의 CRUD 작업을 처리합니다.
 """
 
+import io
+import csv
 import json
-from datetime import datetime, date
-from typing import List, Optional
+import base64
+from datetime import datetime, date, timedelta
+from typing import List, Optional, Iterable, Iterator, Tuple
+from config import config
 from database import db
-from models import Meal, MealCreate, MealUpdate, MealSummary, MealListResponse, NutritionData
+from cache import cache, summary_key, day_version_key
+import invalidation
+from models import (
+    Meal, MealCreate, MealUpdate, MealSummary, MealListResponse, NutritionData,
+    DailyMeals, MealRangeResponse, MealHistoryResponse, MealImportError, MealImportResult
+)
 import psycopg2
 
+# 일별 집계 테이블에서 관리하는 영양소 (nutrition_data 키 → 집계 컬럼)
+DAILY_TOTAL_NUTRIENTS = [
+    ('calories', 'total_calories'),
+    ('protein', 'total_protein'),
+    ('carbs', 'total_carbs'),
+    ('fat', 'total_fat'),
+    ('sodium', 'total_sodium'),
+    ('sugar', 'total_sugar'),
+    ('cholesterol', 'total_cholesterol'),
+    ('saturated_fat', 'total_saturated_fat'),
+    ('trans_fat', 'total_trans_fat'),
+]
+
+# 식사 시간대 → 집계 컬럼
+MEAL_PERIOD_COLUMNS = {
+    "아침": "breakfast_meals",
+    "점심": "lunch_meals",
+    "저녁": "dinner_meals",
+    "간식": "snack_meals",
+}
+
+DAILY_TOTAL_COLUMNS = (
+    ['total_meals']
+    + [column for _, column in DAILY_TOTAL_NUTRIENTS]
+    + list(MEAL_PERIOD_COLUMNS.values())
+)
+
+# 일별 집계 테이블 (create_daily_nutrition_totals_table.sql과 동일)
+DAILY_TOTALS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS daily_nutrition_totals (
+        user_id INTEGER NOT NULL,
+        day DATE NOT NULL,
+        total_meals INTEGER NOT NULL DEFAULT 0,
+        total_calories DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_protein DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_carbs DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_fat DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_sodium DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_sugar DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_cholesterol DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_saturated_fat DOUBLE PRECISION NOT NULL DEFAULT 0,
+        total_trans_fat DOUBLE PRECISION NOT NULL DEFAULT 0,
+        breakfast_meals INTEGER NOT NULL DEFAULT 0,
+        lunch_meals INTEGER NOT NULL DEFAULT 0,
+        dinner_meals INTEGER NOT NULL DEFAULT 0,
+        snack_meals INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, day)
+    )
+"""
+
+# 여러 워커 프로세스가 동시에 시작해도 집계 테이블 생성/초기 적재는 한 번만 실행
+DAILY_TOTALS_SETUP_LOCK = 7242001
+
 class MealsService:
     """식사 서비스 클래스"""
     
@@ -53,6 +116,139 @@ class MealsService:
         except Exception as e:
             raise Exception(f"식사 목록 조회 실패: {str(e)}")
     
+    def get_meals_by_range(
+        self,
+        start_date: date,
+        end_date: date,
+        user_id: Optional[int] = None,
+        include_meals: bool = False
+    ) -> MealRangeResponse:
+        """기간 내 날짜별 식사 요약 조회 (단일 쿼리)"""
+        if user_id and not include_meals:
+            # 요약만 필요한 경우 일별 집계 테이블에서 바로 조회
+            summaries = self.get_daily_summaries(start_date, end_date, user_id)
+            return MealRangeResponse(
+                start_date=start_date,
+                end_date=end_date,
+                days=[DailyMeals(date=summary.date, summary=summary) for summary in summaries]
+            )
+        
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # idx_nutrition_records_user_date 인덱스를 사용하는 단일 범위 조회
+                    if user_id:
+                        cursor.execute("""
+                            SELECT 
+                                id, user_id, food_name, nutrition_data, intake_date, created_at
+                            FROM nutrition_records 
+                            WHERE user_id = %s AND intake_date BETWEEN %s AND %s
+                            ORDER BY intake_date ASC, created_at ASC
+                        """, (user_id, start_date, end_date))
+                    else:
+                        cursor.execute("""
+                            SELECT 
+                                id, user_id, food_name, nutrition_data, intake_date, created_at
+                            FROM nutrition_records 
+                            WHERE intake_date BETWEEN %s AND %s
+                            ORDER BY intake_date ASC, created_at ASC
+                        """, (start_date, end_date))
+                    
+                    rows = cursor.fetchall()
+            
+            # 날짜별로 묶기 (식사가 없는 날도 빈 요약으로 포함)
+            meals_by_date = {}
+            for row in rows:
+                meals_by_date.setdefault(row['intake_date'], []).append(self._dict_to_meal(row))
+            
+            days = []
+            current = start_date
+            while current <= end_date:
+                day_meals = meals_by_date.get(current, [])
+                days.append(DailyMeals(
+                    date=current,
+                    summary=self._calculate_summary(current, day_meals),
+                    meals=day_meals if include_meals else None
+                ))
+                current += timedelta(days=1)
+            
+            return MealRangeResponse(
+                start_date=start_date,
+                end_date=end_date,
+                days=days
+            )
+        except Exception as e:
+            raise Exception(f"기간별 식사 조회 실패: {str(e)}")
+    
+    def get_meal_history(self, user_id: int, before: Optional[str] = None, limit: int = 20) -> MealHistoryResponse:
+        """
+        사용자의 식사 기록을 최신순으로 페이지 단위 조회 (키셋 페이지네이션)
+        
+        Args:
+            user_id: 사용자 ID
+            before: 이전 페이지 응답의 next_cursor (없으면 첫 페이지)
+            limit: 페이지 크기
+            
+        Returns:
+            MealHistoryResponse: 식사 목록과 다음 페이지 커서
+        """
+        cursor_created_at, cursor_id = self.decode_history_cursor(before) if before else (None, None)
+        
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # (created_at, id) 인덱스를 따라 읽으므로 페이지 깊이와 무관하게 일정한 비용
+                    # 다음 페이지 존재 여부 확인을 위해 limit + 1개 조회
+                    if cursor_id is not None:
+                        cursor.execute("""
+                            SELECT 
+                                id, user_id, food_name, nutrition_data, intake_date, created_at
+                            FROM nutrition_records 
+                            WHERE user_id = %s AND (created_at, id) < (%s, %s)
+                            ORDER BY created_at DESC, id DESC
+                            LIMIT %s
+                        """, (user_id, cursor_created_at, cursor_id, limit + 1))
+                    else:
+                        cursor.execute("""
+                            SELECT 
+                                id, user_id, food_name, nutrition_data, intake_date, created_at
+                            FROM nutrition_records 
+                            WHERE user_id = %s
+                            ORDER BY created_at DESC, id DESC
+                            LIMIT %s
+                        """, (user_id, limit + 1))
+                    
+                    rows = cursor.fetchall()
+            
+            has_more = len(rows) > limit
+            meals = [self._dict_to_meal(row) for row in rows[:limit]]
+            next_cursor = None
+            if has_more:
+                last = meals[-1]
+                next_cursor = self.encode_history_cursor(last.created_at, last.id)
+            
+            return MealHistoryResponse(
+                meals=meals,
+                next_cursor=next_cursor,
+                has_more=has_more
+            )
+        except Exception as e:
+            raise Exception(f"식사 기록 조회 실패: {str(e)}")
+    
+    def encode_history_cursor(self, created_at: datetime, meal_id: int) -> str:
+        """페이지 커서 생성 (created_at, id)"""
+        raw = f"{created_at.isoformat()}|{meal_id}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+    
+    def decode_history_cursor(self, cursor_value: str):
+        """페이지 커서 해석 (잘못된 커서면 ValueError)"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor_value.encode('ascii')).decode('utf-8')
+            created_at, meal_id = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(meal_id)
+        except Exception:
+            raise ValueError("잘못된 페이지 커서입니다")
+    
     def create_meal(self, meal_data: MealCreate, user_id: Optional[int] = None) -> Meal:
         """새 식사 추가"""
         try:
@@ -80,7 +276,13 @@ class MealsService:
                     meal_id = result['id']
                     created_at = result['created_at']
                     
-                    conn.commit()
+                    # 일별 집계 증감 갱신 (같은 트랜잭션)
+                    self.apply_daily_totals_delta(
+                        cursor, user_id, intake_date, nutrition_json,
+                        meal_count=1, created_at=created_at
+                    )
+                    
+                    invalidation.commit(conn, cursor, keys=self.day_cache_keys(user_id, [intake_date]))
                     
                     return Meal(
                         id=meal_id,
@@ -93,55 +295,277 @@ class MealsService:
         except Exception as e:
             raise Exception(f"식사 생성 실패: {str(e)}")
     
-    def update_meal(self, meal_id: int, meal_data: MealUpdate) -> Meal:
-        """식사 정보 수정"""
+    def import_meals(self, lines: Iterable[str], file_format: str, user_id: Optional[int] = None) -> MealImportResult:
+        """
+        CSV/NDJSON 식사 데이터 일괄 등록
+        
+        행을 하나씩 MealCreate로 검증하고, 유효한 행만 COPY FROM STDIN으로
+        청크 단위 적재합니다. 전체 적재는 하나의 트랜잭션으로 처리됩니다.
+        
+        Args:
+            lines: 텍스트 행 이터레이터 (업로드 파일 스트림)
+            file_format: 'csv' 또는 'ndjson'
+            user_id: 사용자 ID
+            
+        Returns:
+            MealImportResult: 등록/실패 건수와 행별 오류
+        """
+        imported = 0
+        failed = 0
+        errors = []
+        # 일별 집계 반영용 (날짜 → 영양소 합계, 식사 수)
+        daily_totals = {}
+        
         try:
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    # 기존 데이터 조회
-                    cursor.execute("""
-                        SELECT user_id, food_name, nutrition_data, intake_date, created_at
-                        FROM nutrition_records 
-                        WHERE id = %s
-                    """, (meal_id,))
-                    
-                    existing = cursor.fetchone()
-                    if not existing:
-                        raise Exception("수정할 식사를 찾을 수 없습니다")
+                    buffer = io.StringIO()
+                    buffered = 0
                     
-                    # 업데이트할 데이터 준비
-                    update_fields = []
-                    values = []
+                    for row_number, parsed in self._iter_import_rows(lines, file_format):
+                        try:
+                            if isinstance(parsed, Exception):
+                                raise parsed
+                            meal_data = MealCreate(**parsed)
+                        except Exception as e:
+                            failed += 1
+                            if len(errors) < config.MEALS_IMPORT_MAX_ERRORS:
+                                errors.append(MealImportError(row=row_number, error=str(e)))
+                            continue
+                        
+                        intake_date = meal_data.intake_date or date.today()
+                        nutrition_json = meal_data.nutrition_data.dict()
+                        buffer.write('\t'.join([
+                            self._copy_value(user_id),
+                            self._copy_value(meal_data.food_name),
+                            self._copy_value(json.dumps(nutrition_json)),
+                            self._copy_value(intake_date.isoformat())
+                        ]) + '\n')
+                        buffered += 1
+                        imported += 1
+                        
+                        day_totals = daily_totals.setdefault(intake_date, {'meals': 0})
+                        day_totals['meals'] += 1
+                        for key, _ in DAILY_TOTAL_NUTRIENTS:
+                            day_totals[key] = day_totals.get(key, 0) + (nutrition_json.get(key) or 0)
+                        
+                        if buffered >= config.MEALS_IMPORT_CHUNK_SIZE:
+                            self._copy_meals(cursor, buffer)
+                            buffer = io.StringIO()
+                            buffered = 0
                     
-                    if meal_data.food_name is not None:
-                        update_fields.append("food_name = %s")
-                        values.append(meal_data.food_name)
-                    
-                    if meal_data.nutrition_data is not None:
-                        update_fields.append("nutrition_data = %s")
-                        values.append(json.dumps(meal_data.nutrition_data.dict()))
+                    if buffered:
+                        self._copy_meals(cursor, buffer)
                     
-                    if not update_fields:
-                        raise Exception("수정할 필드가 없습니다")
+                    if imported:
+                        # COPY로 들어간 행은 모두 같은 트랜잭션 시작 시각을 created_at으로 가짐
+                        cursor.execute("SELECT CURRENT_TIMESTAMP AS created_at")
+                        created_at = cursor.fetchone()['created_at']
+                        for intake_date, totals in daily_totals.items():
+                            self.apply_daily_totals_delta(
+                                cursor, user_id, intake_date, totals,
+                                meal_count=totals['meals'], created_at=created_at
+                            )
                     
-                    values.append(meal_id)
+                    invalidation.commit(conn, cursor, keys=self.day_cache_keys(user_id, daily_totals.keys()))
+            
+            return MealImportResult(imported=imported, failed=failed, errors=errors)
+        except Exception as e:
+            raise Exception(f"식사 일괄 등록 실패: {str(e)}")
+    
+    def _iter_import_rows(self, lines: Iterable[str], file_format: str) -> Iterator[Tuple[int, object]]:
+        """일괄 등록 파일을 (행 번호, MealCreate 입력 dict 또는 파싱 오류)로 변환"""
+        if file_format == 'ndjson':
+            for row_number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_number, json.loads(line)
+                except ValueError as e:
+                    yield row_number, ValueError(f"JSON 파싱 실패: {str(e)}")
+        elif file_format == 'csv':
+            # 헤더: food_name, intake_date, amount, calories, protein, carbs, fat, sodium, ...
+            nutrient_fields = list(NutritionData.__fields__.keys())
+            reader = csv.DictReader(lines)
+            row_number = 1
+            while True:
+                row_number += 1
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    # 잘못된 행(NUL 문자, 너무 긴 필드 등)만 실패 처리하고 다음 행부터 계속 읽음
+                    yield row_number, ValueError(f"CSV 파싱 실패: {str(e)}")
+                    continue
+                yield row_number, {
+                    'food_name': row.get('food_name'),
+                    'intake_date': row.get('intake_date') or None,
+                    'nutrition_data': {
+                        field: row[field]
+                        for field in nutrient_fields
+                        if row.get(field) not in (None, '')
+                    }
+                }
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {file_format}")
+    
+    def _copy_meals(self, cursor, buffer: io.StringIO) -> None:
+        """버퍼에 쌓인 행을 COPY FROM STDIN으로 적재"""
+        buffer.seek(0)
+        cursor.copy_expert(
+            "COPY nutrition_records (user_id, food_name, nutrition_data, intake_date) FROM STDIN",
+            buffer
+        )
+    
+    def _copy_value(self, value) -> str:
+        """COPY 텍스트 형식에 맞게 값 변환"""
+        if value is None:
+            return '\\N'
+        return (
+            str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r')
+        )
+    
+    def export_records(
+        self,
+        user_id: int,
+        file_format: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Iterator[str]:
+        """
+        사용자의 영양소 기록을 CSV/NDJSON 텍스트 조각으로 내보내기
+        
+        서버 측(named) 커서로 EXPORT_BATCH_SIZE 행씩 읽어 바로 내보내므로
+        기록 양과 관계없이 메모리 사용량이 일정합니다.
+        
+        Args:
+            user_id: 사용자 ID
+            file_format: 'csv' 또는 'ndjson'
+            start_date: 시작 날짜 (선택)
+            end_date: 종료 날짜 (선택)
+            
+        Yields:
+            str: 응답 본문 조각
+        """
+        nutrient_fields = list(NutritionData.__fields__.keys())
+        
+        if file_format == 'csv':
+            # 헤더는 쿼리 실행 전에 먼저 내보냄
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['id', 'food_name', 'intake_date', 'created_at'] + nutrient_fields)
+            yield buffer.getvalue()
+        
+        conditions = ["user_id = %s"]
+        params = [user_id]
+        if start_date:
+            conditions.append("intake_date >= %s")
+            params.append(start_date)
+        if end_date:
+            conditions.append("intake_date <= %s")
+            params.append(end_date)
+        
+        with self.db.get_connection() as conn:
+            with conn.cursor(name='export_records') as cursor:
+                cursor.itersize = config.EXPORT_BATCH_SIZE
+                cursor.execute(f"""
+                    SELECT id, food_name, nutrition_data, intake_date, created_at
+                    FROM nutrition_records 
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY intake_date ASC, created_at ASC, id ASC
+                """, params)
+                
+                while True:
+                    rows = cursor.fetchmany(config.EXPORT_BATCH_SIZE)
+                    if not rows:
+                        break
                     
+                    buffer = io.StringIO()
+                    if file_format == 'csv':
+                        writer = csv.writer(buffer)
+                        for row in rows:
+                            nutrition_data = row['nutrition_data'] or {}
+                            writer.writerow([
+                                row['id'],
+                                row['food_name'],
+                                row['intake_date'].isoformat(),
+                                row['created_at'].isoformat()
+                            ] + [nutrition_data.get(field) for field in nutrient_fields])
+                    else:
+                        for row in rows:
+                            buffer.write(json.dumps({
+                                "id": row['id'],
+                                "food_name": row['food_name'],
+                                "nutrition_data": row['nutrition_data'],
+                                "intake_date": row['intake_date'].isoformat(),
+                                "created_at": row['created_at'].isoformat()
+                            }, ensure_ascii=False) + '\n')
+                    yield buffer.getvalue()
+    
+    def update_meal(self, meal_id: int, meal_data: MealUpdate) -> Meal:
+        """식사 정보 수정"""
+        try:
+            # 업데이트할 데이터 준비
+            update_fields = []
+            values = []
+            
+            if meal_data.food_name is not None:
+                update_fields.append("food_name = %s")
+                values.append(meal_data.food_name)
+            
+            if meal_data.nutrition_data is not None:
+                new_nutrition = meal_data.nutrition_data.dict()
+                update_fields.append("nutrition_data = %s")
+                values.append(json.dumps(new_nutrition))
+            
+            if not update_fields:
+                raise Exception("수정할 필드가 없습니다")
+            
+            values.append(meal_id)
+            
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # 수정과 결과 조회를 한 번에 처리 (이전 영양소 값도 함께 반환)
                     cursor.execute(f"""
-                        UPDATE nutrition_records 
+                        UPDATE nutrition_records AS n
                         SET {', '.join(update_fields)}
-                        WHERE id = %s
+                        FROM (
+                            SELECT id, nutrition_data
+                            FROM nutrition_records 
+                            WHERE id = %s
+                            FOR UPDATE
+                        ) AS previous
+                        WHERE n.id = previous.id
+                        RETURNING n.id, n.user_id, n.food_name, n.nutrition_data, n.intake_date, n.created_at,
+                                  previous.nutrition_data AS previous_nutrition_data
                     """, values)
                     
-                    conn.commit()
+                    result = cursor.fetchone()
+                    if not result:
+                        raise Exception("수정할 식사를 찾을 수 없습니다")
                     
-                    # 수정된 데이터 조회
-                    cursor.execute("""
-                        SELECT id, user_id, food_name, nutrition_data, intake_date, created_at
-                        FROM nutrition_records 
-                        WHERE id = %s
-                    """, (meal_id,))
+                    # 영양소가 바뀐 경우 일별 집계에 차이만큼 반영
+                    # (이름만 바뀐 경우에도 updated_at이 갱신되어 날짜별 ETag가 바뀜)
+                    delta = {}
+                    if meal_data.nutrition_data is not None:
+                        old_nutrition = result['previous_nutrition_data']
+                        delta = {
+                            key: (new_nutrition.get(key) or 0) - (old_nutrition.get(key) or 0)
+                            for key, _ in DAILY_TOTAL_NUTRIENTS
+                        }
+                    self.apply_daily_totals_delta(
+                        cursor, result['user_id'], result['intake_date'], delta
+                    )
+                    
+                    invalidation.commit(
+                        conn, cursor, keys=self.day_cache_keys(result['user_id'], [result['intake_date']])
+                    )
                     
-                    result = cursor.fetchone()
                     return self._dict_to_meal(result)
         except Exception as e:
             raise Exception(f"식사 수정 실패: {str(e)}")
@@ -151,12 +575,25 @@ class MealsService:
         try:
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("DELETE FROM nutrition_records WHERE id = %s", (meal_id,))
+                    cursor.execute("""
+                        DELETE FROM nutrition_records 
+                        WHERE id = %s
+                        RETURNING user_id, nutrition_data, intake_date, created_at
+                    """, (meal_id,))
                     
-                    if cursor.rowcount == 0:
+                    deleted = cursor.fetchone()
+                    if not deleted:
                         raise Exception("삭제할 식사를 찾을 수 없습니다")
                     
-                    conn.commit()
+                    # 일별 집계에서 삭제된 식사만큼 차감
+                    self.apply_daily_totals_delta(
+                        cursor, deleted['user_id'], deleted['intake_date'], deleted['nutrition_data'],
+                        sign=-1, meal_count=-1, created_at=deleted['created_at']
+                    )
+                    
+                    invalidation.commit(
+                        conn, cursor, keys=self.day_cache_keys(deleted['user_id'], [deleted['intake_date']])
+                    )
                     return True
         except Exception as e:
             raise Exception(f"식사 삭제 실패: {str(e)}")
@@ -177,6 +614,254 @@ class MealsService:
         except Exception as e:
             raise Exception(f"식사 조회 실패: {str(e)}")
     
+    def get_daily_summary(self, target_date: date, user_id: Optional[int] = None) -> MealSummary:
+        """특정 날짜의 식사 요약 조회 (사용자 지정 시 캐시 → 일별 집계 테이블 기본키 조회)"""
+        if not user_id:
+            return self.get_meals_by_date(target_date).summary
+        
+        key = summary_key(user_id, target_date)
+        cached = cache.get(key, MealSummary)
+        if cached:
+            return cached
+        
+        # 조회하는 사이 무효화되면 이전 요약을 캐시에 넣지 않도록 조회 전 세대 기록
+        generation = cache.generation()
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT *
+                        FROM daily_nutrition_totals 
+                        WHERE user_id = %s AND day = %s
+                    """, (user_id, target_date))
+                    
+                    row = cursor.fetchone()
+            
+            summary = self._row_to_summary(target_date, row)
+            cache.set(key, summary, generation=generation)
+            return summary
+        except Exception as e:
+            raise Exception(f"식사 요약 조회 실패: {str(e)}")
+    
+    def get_day_version(self, user_id: int, target_date: date) -> str:
+        """
+        사용자/날짜별 데이터 버전 (ETag 생성용)
+        
+        식사 추가/수정/삭제 시 함께 갱신되는 일별 집계 행의 updated_at과 식사 수를 사용하므로
+        식사 목록을 읽지 않고 기본키 조회 한 번으로 변경 여부를 판단할 수 있습니다.
+        요약과 같은 시점에 캐시에서 삭제되고, 조회 중 무효화된 버전은 캐시에 넣지 않으므로
+        이전 버전이 캐시에 남아 변경된 데이터에 304를 돌려주지 않습니다.
+        (다른 프로세스의 변경은 무효화 이벤트가 도착한 뒤부터 반영됩니다.)
+        """
+        key = day_version_key(user_id, target_date)
+        cached = cache.get(key)
+        if cached:
+            return cached
+        
+        generation = cache.generation()
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT updated_at, total_meals
+                        FROM daily_nutrition_totals 
+                        WHERE user_id = %s AND day = %s
+                    """, (user_id, target_date))
+                    
+                    row = cursor.fetchone()
+            
+            version = f"{row['updated_at'].isoformat()}|{row['total_meals']}" if row else "empty"
+            cache.set(key, version, generation=generation)
+            return version
+        except Exception as e:
+            raise Exception(f"데이터 버전 조회 실패: {str(e)}")
+    
+    def get_daily_summaries(self, start_date: date, end_date: date, user_id: int) -> List[MealSummary]:
+        """기간 내 날짜별 식사 요약 조회 (일별 집계 테이블 범위 조회)"""
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT *
+                        FROM daily_nutrition_totals 
+                        WHERE user_id = %s AND day BETWEEN %s AND %s
+                    """, (user_id, start_date, end_date))
+                    
+                    rows_by_day = {row['day']: row for row in cursor.fetchall()}
+            
+            summaries = []
+            current = start_date
+            while current <= end_date:
+                summaries.append(self._row_to_summary(current, rows_by_day.get(current)))
+                current += timedelta(days=1)
+            return summaries
+        except Exception as e:
+            raise Exception(f"기간별 식사 요약 조회 실패: {str(e)}")
+    
+    def apply_daily_totals_delta(
+        self,
+        cursor,
+        user_id: Optional[int],
+        day: date,
+        nutrition: dict,
+        sign: int = 1,
+        meal_count: int = 0,
+        created_at: Optional[datetime] = None
+    ) -> None:
+        """
+        일별 집계 테이블에 증감분 반영 (호출자의 트랜잭션 안에서 실행)
+        
+        Args:
+            cursor: 현재 트랜잭션의 커서
+            user_id: 사용자 ID (없으면 집계하지 않음)
+            day: 섭취 날짜
+            nutrition: 영양소 값 또는 증감분 (nutrition_data 키 기준)
+            sign: 영양소 값에 곱할 부호 (삭제 시 -1)
+            meal_count: 식사 수 증감
+            created_at: 식사 생성 시간 (식사 수 증감을 반영할 시간대 판단용)
+        """
+        if not user_id:
+            return
+        
+        period = self._get_meal_period(created_at) if created_at else None
+        
+        columns = DAILY_TOTAL_COLUMNS
+        values = [meal_count]
+        values += [sign * float(nutrition.get(key) or 0) for key, _ in DAILY_TOTAL_NUTRIENTS]
+        values += [meal_count if p == period else 0 for p in MEAL_PERIOD_COLUMNS]
+        
+        updates = ', '.join(
+            f"{column} = daily_nutrition_totals.{column} + EXCLUDED.{column}" for column in columns
+        )
+        
+        cursor.execute(f"""
+            INSERT INTO daily_nutrition_totals (user_id, day, {', '.join(columns)})
+            VALUES (%s, %s, {', '.join(['%s'] * len(columns))})
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                {updates},
+                updated_at = CURRENT_TIMESTAMP
+        """, [user_id, day] + values)
+    
+    def day_cache_keys(self, user_id: Optional[int], days: Iterable[date]) -> List[str]:
+        """날짜별 요약/버전 캐시 키 (쓰기 경로에서 invalidation.commit에 전달)"""
+        keys = []
+        if user_id:
+            for day in days:
+                keys += [summary_key(user_id, day), day_version_key(user_id, day)]
+        return keys
+    
+    def ensure_daily_totals_table(self) -> int:
+        """
+        일별 집계 테이블이 없으면 생성하고 기존 식사 기록으로 채움 (서버 시작 시)
+        
+        생성과 적재를 한 트랜잭션으로 처리하므로 다른 프로세스에는 채워진 테이블만 보입니다.
+        
+        Returns:
+            int: 새로 만든 경우 적재한 일자 수, 이미 있으면 -1
+        """
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", (DAILY_TOTALS_SETUP_LOCK,))
+                    cursor.execute("SELECT to_regclass('daily_nutrition_totals') IS NOT NULL AS exists")
+                    if cursor.fetchone()['exists']:
+                        conn.rollback()
+                        return -1
+                    
+                    cursor.execute(DAILY_TOTALS_TABLE_SQL)
+                    rebuilt = self._fill_daily_totals(cursor)
+                    invalidation.commit(conn, cursor, clear=["summary:"])
+            
+            return rebuilt
+        except Exception as e:
+            raise Exception(f"일별 집계 테이블 생성 실패: {str(e)}")
+    
+    def rebuild_daily_totals(self, user_id: Optional[int] = None) -> int:
+        """원본 식사 기록으로부터 일별 집계 테이블 재계산 (기존 데이터 적재용)"""
+        try:
+            user_filter = "AND user_id = %s" if user_id else ""
+            params = (user_id,) if user_id else ()
+            
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        f"DELETE FROM daily_nutrition_totals WHERE TRUE {user_filter}", params
+                    )
+                    rebuilt = self._fill_daily_totals(cursor, user_id)
+                    # 재계산된 날짜를 알 수 없으므로 모든 프로세스의 요약 캐시 전체 삭제
+                    invalidation.commit(conn, cursor, clear=["summary:"])
+            
+            return rebuilt
+        except Exception as e:
+            raise Exception(f"일별 집계 재계산 실패: {str(e)}")
+    
+    def _fill_daily_totals(self, cursor, user_id: Optional[int] = None) -> int:
+        """nutrition_records 를 사용자/일자별로 집계하여 daily_nutrition_totals 에 추가 (추가한 일자 수 반환)"""
+        user_filter = "AND user_id = %s" if user_id else ""
+        params = (user_id,) if user_id else ()
+        
+        nutrient_sums = ',\n'.join(
+            f"COALESCE(SUM((nutrition_data->>'{key}')::float8), 0)"
+            for key, _ in DAILY_TOTAL_NUTRIENTS
+        )
+        columns = DAILY_TOTAL_COLUMNS
+        
+        cursor.execute(f"""
+            INSERT INTO daily_nutrition_totals (user_id, day, {', '.join(columns)})
+            SELECT
+                user_id,
+                intake_date,
+                COUNT(*),
+                {nutrient_sums},
+                COUNT(*) FILTER (WHERE EXTRACT(HOUR FROM created_at) < 11),
+                COUNT(*) FILTER (WHERE EXTRACT(HOUR FROM created_at) >= 11 AND EXTRACT(HOUR FROM created_at) < 15),
+                COUNT(*) FILTER (WHERE EXTRACT(HOUR FROM created_at) >= 15 AND EXTRACT(HOUR FROM created_at) < 20),
+                COUNT(*) FILTER (WHERE EXTRACT(HOUR FROM created_at) >= 20)
+            FROM nutrition_records
+            WHERE user_id IS NOT NULL {user_filter}
+            GROUP BY user_id, intake_date
+        """, params)
+        return cursor.rowcount
+    
+    def _get_meal_period(self, created_at: datetime) -> str:
+        """생성 시간을 기준으로 식사 시간대 판단"""
+        hour = created_at.hour
+        if hour < 11:
+            return "아침"
+        elif hour < 15:
+            return "점심"
+        elif hour < 20:
+            return "저녁"
+        return "간식"
+    
+    def _row_to_summary(self, target_date: date, row: Optional[dict]) -> MealSummary:
+        """일별 집계 행을 MealSummary 객체로 변환 (_calculate_summary와 같은 형식)"""
+        if not row or row['total_meals'] <= 0:
+            return self._calculate_summary(target_date, [])
+        
+        def optional_total(column: str) -> Optional[float]:
+            value = float(row[column])
+            return value if value > 0 else None
+        
+        return MealSummary(
+            date=target_date,
+            total_meals=row['total_meals'],
+            total_calories=float(row['total_calories']),
+            total_protein=float(row['total_protein']),
+            total_carbs=float(row['total_carbs']),
+            total_fat=float(row['total_fat']),
+            total_sodium=optional_total('total_sodium'),
+            total_sugar=optional_total('total_sugar'),
+            total_cholesterol=optional_total('total_cholesterol'),
+            total_saturated_fat=optional_total('total_saturated_fat'),
+            total_trans_fat=optional_total('total_trans_fat'),
+            meals_by_period={
+                period: row[column]
+                for period, column in MEAL_PERIOD_COLUMNS.items()
+                if row[column] > 0
+            }
+        )
+    
     def _dict_to_meal(self, row: dict) -> Meal:
         """데이터베이스 행을 Meal 객체로 변환"""
         # JSONB 데이터를 파싱
@@ -218,17 +903,7 @@ class MealsService:
         # 시간대별 식사 수 계산 (생성 시간 기준)
         meals_by_period = {}
         for meal in meals:
-            # created_at 시간을 기준으로 식사 시간대 판단
-            hour = meal.created_at.hour
-            if hour < 11:
-                period = "아침"
-            elif hour < 15:
-                period = "점심"
-            elif hour < 20:
-                period = "저녁"
-            else:
-                period = "간식"
-            
+            period = self._get_meal_period(meal.created_at)
             meals_by_period[period] = meals_by_period.get(period, 0) + 1
         
         return MealSummary(
@@ -0,0 +1,429 @@
+"""
+메트릭 모듈
+요청/OCR 단계/데이터베이스 처리 시간과 오류 수를 모아 /metrics 에서 Prometheus 텍스트 형식으로 제공합니다.
+
+값은 프로세스별로 집계됩니다. 운영 모드(prefork.py)에서는 워커마다 값을 METRICS_DIR 의 파일에 주기적으로 기록하고,
+/metrics 는 어느 워커가 응답하든 모든 워커(교체된 워커 포함)의 카운터/히스토그램을 합산하며
+게이지는 worker 레이블(PID)을 붙여 워커별로 보여줍니다.
+
+사용 예:
+    from metrics import DB_QUERY_LATENCY
+    with DB_QUERY_LATENCY.time(statement="SELECT"):
+        ...
+"""
+
+import atexit
+import bisect
+import copy
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 기본 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """메트릭 공통 클래스 (레이블 값 조합별로 값을 보관)"""
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._render_items(items)
+    
+    def snapshot(self) -> List[list]:
+        """현재 값 목록 [[레이블 값 목록, 값], ...] (워커별 파일 기록용)"""
+        with self._lock:
+            return [[list(key), copy.deepcopy(value)] for key, value in self._values.items()]
+    
+    def render_merged(self, snapshots: Dict[str, List[list]]) -> List[str]:
+        """워커별 값을 레이블 조합마다 합산하여 출력"""
+        merged: Dict[Tuple, object] = {}
+        for values in snapshots.values():
+            for key, value in values:
+                key = tuple(key)
+                merged[key] = _add(merged[key], value) if key in merged else value
+        return self._render_items(sorted(merged.items()))
+    
+    def _render_items(self, items, labelnames: Tuple[str, ...] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for key, value in items:
+            lines.extend(self._render_value(key, value, self.labelnames if labelnames is None else labelnames))
+        return lines
+    
+    def _render_value(self, key: Tuple, value, labelnames: Tuple[str, ...]) -> List[str]:
+        return [f"{self.name}{_format_labels(labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    """누적 카운터"""
+    
+    type_name = "counter"
+    
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """처리 시간 히스토그램"""
+    
+    type_name = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [구간별 개수(마지막은 +Inf), 합계, 전체 개수]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+    
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def _render_value(self, key: Tuple, value, labelnames: Tuple[str, ...]) -> List[str]:
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            labels = _format_labels(labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """조회 시점에 함수를 호출해 값을 구하는 메트릭 (캐시 적중률 등)"""
+    
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float], type_name: str = "gauge"):
+        super().__init__(name, documentation)
+        self.callback = callback
+        self.type_name = type_name
+    
+    def render(self) -> List[str]:
+        return self._render_items([((), self.callback())])
+    
+    def snapshot(self) -> List[list]:
+        return [[[], self.callback()]]
+    
+    def render_merged(self, snapshots: Dict[str, List[list]]) -> List[str]:
+        """카운터는 합산, 게이지는 worker 레이블을 붙여 워커별로 출력 (종료한 워커의 게이지는 제외)"""
+        if self.type_name == "counter":
+            return super().render_merged(snapshots)
+        items = [((worker,), values[0][1]) for worker, values in sorted(snapshots.items()) if values]
+        return self._render_items(items, ("worker",))
+
+
+def _add(left, right):
+    """카운터 값(숫자) 또는 히스토그램 값([구간별 개수], 합계, 개수) 합산"""
+    if isinstance(left, list):
+        return [_add(a, b) for a, b in zip(left, right)]
+    return left + right
+
+
+class Registry:
+    """메트릭 목록과 텍스트 출력"""
+    
+    def __init__(self):
+        self._metrics: List[Metric] = []
+    
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                lines.append(f"# {metric.name} 수집 실패: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+    
+    def snapshot(self) -> Dict[str, List[list]]:
+        """메트릭 이름 → 현재 값 목록"""
+        values = {}
+        for metric in self._metrics:
+            try:
+                values[metric.name] = metric.snapshot()
+            except Exception:
+                continue
+        return values
+    
+    def render_merged(self, snapshots: Dict[str, Dict[str, List[list]]]) -> str:
+        """워커별 값(워커 → 메트릭 이름 → 값 목록)을 합쳐 출력"""
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render_merged({
+                    worker: values[metric.name] for worker, values in snapshots.items() if metric.name in values
+                }))
+            except Exception as e:
+                lines.append(f"# {metric.name} 수집 실패: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+
+class MultiprocessStore:
+    """
+    워커별 메트릭 파일 관리 (운영 모드)
+    
+    - 워커: <PID>.json 에 현재 값을 FLUSH_INTERVAL 마다, 그리고 종료 시 기록
+    - 부모: 종료한 워커의 카운터/히스토그램을 dead.json 에 누적하고 워커 파일 삭제 (게이지는 버림)
+    - /metrics: 자기 값은 바로, 다른 워커 값은 마지막으로 기록된 파일에서 읽어 합산
+    """
+    
+    FLUSH_INTERVAL = 5.0
+    DEAD_FILE = "dead.json"
+    
+    def __init__(self, directory: str, registry: "Registry"):
+        self.directory = directory
+        self.registry = registry
+        self._stop = threading.Event()
+    
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+    
+    def _read(self, name: str) -> Dict[str, List[list]]:
+        try:
+            with open(self._path(name), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+    
+    def _write(self, name: str, values: Dict[str, List[list]]) -> None:
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 이름 변경
+        temp_path = self._path(f".{name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(values, file)
+        os.replace(temp_path, self._path(name))
+    
+    def clear(self) -> None:
+        """이전 실행에서 남은 파일 삭제 (부모 프로세스 시작 시)"""
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") or name.endswith(".tmp"):
+                os.remove(self._path(name))
+    
+    def flush(self) -> None:
+        """현재 워커의 값 기록"""
+        try:
+            self._write(f"{os.getpid()}.json", self.registry.snapshot())
+        except OSError:
+            pass
+    
+    def start_worker(self) -> None:
+        """워커 프로세스에서 호출 (주기적 기록 스레드 시작, 종료 시 마지막 값 기록)"""
+        self._stop.clear()
+        threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+        atexit.register(self.flush)
+    
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.FLUSH_INTERVAL):
+            self.flush()
+    
+    def mark_dead(self, pid: int) -> None:
+        """부모 프로세스에서 호출 (종료한 워커의 누적 값을 dead.json 에 합치고 워커 파일 삭제)"""
+        values = self._read(f"{pid}.json")
+        if values:
+            dead = self._read(self.DEAD_FILE)
+            for metric in self.registry._metrics:
+                if isinstance(metric, CallbackMetric) and metric.type_name != "counter":
+                    continue
+                merged = {tuple(key): value for key, value in dead.get(metric.name, [])}
+                for key, value in values.get(metric.name, []):
+                    key = tuple(key)
+                    merged[key] = _add(merged[key], value) if key in merged else value
+                dead[metric.name] = [[list(key), value] for key, value in merged.items()]
+            self._write(self.DEAD_FILE, dead)
+        try:
+            os.remove(self._path(f"{pid}.json"))
+        except OSError:
+            pass
+    
+    def render(self) -> str:
+        """모든 워커 값을 합쳐 출력"""
+        snapshots = {}
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and name != self.DEAD_FILE:
+                snapshots[name[:-len(".json")]] = self._read(name)
+        snapshots[str(os.getpid())] = self.registry.snapshot()
+        
+        # 종료한 워커의 누적 값 (게이지는 없으므로 worker 레이블로 나타나지 않음)
+        dead = self._read(self.DEAD_FILE)
+        if dead:
+            snapshots[self.DEAD_FILE] = dead
+        return self.registry.render_merged(snapshots)
+
+
+# 전역 메트릭 레지스트리
+registry = Registry()
+
+# 운영 모드에서 워커 간 메트릭 합산 (prefork.py 에서 enable_multiprocess 로 설정)
+multiprocess: Optional[MultiprocessStore] = None
+
+
+def enable_multiprocess(directory: str) -> MultiprocessStore:
+    """워커 fork 전에 부모 프로세스에서 호출"""
+    global multiprocess
+    multiprocess = MultiprocessStore(directory, registry)
+    multiprocess.clear()
+    return multiprocess
+
+
+def render() -> str:
+    """/metrics 응답 본문 (운영 모드면 모든 워커 합산)"""
+    if multiprocess is not None:
+        return multiprocess.render()
+    return registry.render()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+))
+OCR_STAGE_LATENCY = registry.register(Histogram(
+    "ocr_stage_duration_seconds", "OCR 처리 단계별 시간", ("stage",)
+))
+CLOVA_ERRORS = registry.register(Counter(
+    "clova_ocr_errors_total", "클로바 OCR API 호출 오류 수", ("reason",)
+))
+OCR_JOBS = registry.register(Counter(
+    "ocr_jobs_total", "OCR 비동기 작업 수 (submitted/succeeded/failed/retried)", ("status",)
+))
+OCR_ADMISSION_REJECTED = registry.register(Counter(
+    "ocr_admission_rejected_total", "처리 예산 초과로 거절한 이미지 처리 요청 수", ("reason",)
+))
+DB_QUERY_LATENCY = registry.register(Histogram(
+    "db_query_duration_seconds", "데이터베이스 쿼리 실행 시간", ("statement",)
+))
+DB_CONNECT_LATENCY = registry.register(Histogram(
+    "db_connect_seconds", "데이터베이스 새 연결 수립 시간 (연결 풀 없이 매번 연결, 인증 포함)"
+))
+
+
+def statement_type(query) -> str:
+    """쿼리 종류 (SELECT/INSERT/...) - 쿼리 전문을 레이블로 쓰지 않기 위함"""
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    if not isinstance(query, str):
+        return "UNKNOWN"
+    words = query.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 처리 시간 기록 (ASGI 미들웨어)
+    
+    레이블에는 실제 경로 대신 라우트 템플릿(/meals/{target_date})을 사용합니다.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = {"code": 500}
+        
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"]
+            )
+
+
+def register_cache_metrics(cache) -> None:
+    """캐시 적중/미스 수와 적중률 등록 (cache.stats() 사용)"""
+    registry.register(CallbackMetric(
+        "cache_hits_total", "캐시 적중 수", lambda: cache.stats()["hits"], "counter"
+    ))
+    registry.register(CallbackMetric(
+        "cache_misses_total", "캐시 미스 수", lambda: cache.stats()["misses"], "counter"
+    ))
+    registry.register(CallbackMetric(
+        "cache_hit_ratio", "캐시 적중률", lambda: cache.stats()["hit_ratio"]
+    ))
+
+
+def register_admission_metrics(controller) -> None:
+    """이미지 처리 입장 제어 상태 등록 (처리 중 수, 예상 메모리 사용량/예산, 대기 수)"""
+    registry.register(CallbackMetric(
+        "ocr_admission_active", "처리 중인 이미지 수", lambda: controller.active
+    ))
+    registry.register(CallbackMetric(
+        "ocr_admission_max_concurrent", "동시에 처리할 수 있는 이미지 수", lambda: controller.max_concurrent
+    ))
+    registry.register(CallbackMetric(
+        "ocr_admission_bytes_in_use", "처리 중인 이미지의 예상 메모리 사용량 (바이트)", lambda: controller.bytes_in_use
+    ))
+    registry.register(CallbackMetric(
+        "ocr_admission_budget_bytes", "이미지 처리 메모리 예산 (바이트)", lambda: controller.budget_bytes
+    ))
+    registry.register(CallbackMetric(
+        "ocr_admission_waiting", "처리 예산을 기다리는 요청 수", lambda: controller.waiting
+    ))
@@ -69,6 +69,40 @@ class MealListResponse(BaseModel):
     summary: MealSummary
 
 
+class DailyMeals(BaseModel):
+    """하루 단위 식사 요약 모델 (기간 조회용)"""
+    date: date
+    summary: MealSummary
+    meals: Optional[List[Meal]] = None
+
+
+class MealRangeResponse(BaseModel):
+    """기간별 식사 목록 응답 모델"""
+    start_date: date
+    end_date: date
+    days: List[DailyMeals]
+
+
+class MealHistoryResponse(BaseModel):
+    """식사 기록 페이지 응답 모델 (커서 기반 페이지네이션)"""
+    meals: List[Meal]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+class MealImportError(BaseModel):
+    """식사 일괄 등록 행 오류 모델"""
+    row: int
+    error: str
+
+
+class MealImportResult(BaseModel):
+    """식사 일괄 등록 결과 모델"""
+    imported: int
+    failed: int
+    errors: List[MealImportError]
+
+
 class ApiResponse(BaseModel):
     """API 응답 기본 모델"""
     success: bool
@@ -0,0 +1,93 @@
+"""
+쓰기 경로(식사/프로필 수정) 지연 시간 벤치마크 스크립트
+실제 데이터베이스에 임시 사용자와 식사를 만들어 측정한 뒤 정리합니다.
+
+사용법:
+    python mutation_benchmark.py [반복 횟수]
+"""
+
+import sys
+import os
+import time
+import uuid
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from meals_service import meals_service
+from user_service import user_service
+from models import MealCreate, MealUpdate, NutritionData
+from user_models import UserProfileCreate, UserProfileUpdate
+
+def measure(func, iterations):
+    """함수를 반복 실행하여 지연 시간(ms) 목록 반환"""
+    timings = []
+    for i in range(iterations):
+        start_time = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return timings
+
+def print_stats(name, timings):
+    """지연 시간 통계 출력"""
+    ordered = sorted(timings)
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    avg = sum(ordered) / len(ordered)
+    print(f"   {name:<24} 평균 {avg:7.2f}ms | p50 {p50:7.2f}ms | p95 {p95:7.2f}ms")
+
+def run_mutation_benchmark(iterations=200):
+    """쓰기 경로 지연 시간 측정"""
+    print(f"🧪 쓰기 경로 지연 시간 벤치마크를 시작합니다... (반복 {iterations}회)")
+    
+    # 임시 사용자 생성
+    suffix = uuid.uuid4().hex[:8]
+    profile = user_service.create_user_profile(UserProfileCreate(
+        google_id=f"bench-{suffix}",
+        email=f"bench-{suffix}@example.com",
+        username=f"bench-{suffix}",
+        age=30,
+        birth=date(1995, 1, 1),
+        height=170.0,
+        weight=65.0,
+        address="벤치마크"
+    ))
+    
+    nutrition = NutritionData(amount=100, calories=300, protein=15, carbs=45, fat=12, sodium=250, sugar=8)
+    meal_ids = []
+    
+    try:
+        create_timings = measure(
+            lambda i: meal_ids.append(meals_service.create_meal(
+                MealCreate(food_name=f"벤치마크 식사 {i}", nutrition_data=nutrition), profile.id
+            ).id),
+            iterations
+        )
+        update_timings = measure(
+            lambda i: meals_service.update_meal(
+                meal_ids[i], MealUpdate(food_name=f"수정된 식사 {i}", nutrition_data=nutrition)
+            ),
+            iterations
+        )
+        profile_timings = measure(
+            lambda i: user_service.update_user_profile(profile.id, UserProfileUpdate(weight=65.0 + i % 10)),
+            iterations
+        )
+        delete_timings = measure(
+            lambda i: meals_service.delete_meal(meal_ids.pop()),
+            iterations
+        )
+        
+        print(f"\n📊 쓰기 경로 지연 시간:")
+        print_stats("create_meal", create_timings)
+        print_stats("update_meal", update_timings)
+        print_stats("update_user_profile", profile_timings)
+        print_stats("delete_meal", delete_timings)
+    finally:
+        for meal_id in meal_ids:
+            meals_service.delete_meal(meal_id)
+        user_service.delete_user_profile(profile.id)
+        meals_service.rebuild_daily_totals(profile.id)
+        print("\n🗑️ 벤치마크 데이터 정리 완료")
+
+if __name__ == "__main__":
+    run_mutation_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
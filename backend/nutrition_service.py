@@ -0,0 +1,388 @@
+"""
+영양소 비교 관련 비즈니스 로직
+사용자 섭취량과 연령대별 평균 섭취량을 날짜 × 영양소 행렬로 비교합니다.
+"""
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from config import config
+from database import db
+from cache import LocalCache
+import invalidation
+from reference_data import average_nutrition_cache, AverageNutrient
+
+# NumPy는 비교 계산 시점에 불러옴 (세션 확인 등 비교를 하지 않는 경로의 시작 시간 단축)
+if TYPE_CHECKING:
+    import numpy as np
+
+# average_nutrition 영양소명 → 사용자 영양소 키
+NUTRIENT_MAPPING = {
+    '에너지 섭취량': 'calories',
+    '단백질': 'protein',
+    '탄수화물': 'carbs',
+    '지방': 'fat',
+    '나트륨': 'sodium',
+    '당 섭취량': 'sugar'
+}
+
+# 비교 대상 영양소 키 → 일별 집계 컬럼 (행렬의 열 순서)
+NUTRIENT_COLUMNS = [
+    ('calories', 'total_calories'),
+    ('protein', 'total_protein'),
+    ('carbs', 'total_carbs'),
+    ('fat', 'total_fat'),
+    ('sodium', 'total_sodium'),
+    ('sugar', 'total_sugar'),
+]
+
+# 적정 범위 (평균 대비 ±20%)
+ADEQUATE_RANGE_PERCENT = 20
+
+# average_nutrition 연령대 구분 (상한 나이, 연령대)
+AGE_GROUPS = [
+    (2, '1-2세'),
+    (5, '3-5세'),
+    (11, '6-11세'),
+    (18, '12-18세'),
+    (29, '19-29세'),
+    (49, '30-49세'),
+    (64, '50-64세'),
+]
+OLDEST_AGE_GROUP = '65세 이상'
+
+# 프로필이 없는 사용자에게 적용할 연령대
+DEFAULT_AGE_GROUP = '30-49세'
+
+def age_group_for_age(age: Optional[int]) -> str:
+    """나이에 해당하는 average_nutrition 연령대"""
+    if age is None:
+        return DEFAULT_AGE_GROUP
+    for upper_age, age_group in AGE_GROUPS:
+        if age <= upper_age:
+            return age_group
+    return OLDEST_AGE_GROUP
+
+def age_on(birth: Optional[date], fallback_age: Optional[int], target_date: date) -> Optional[int]:
+    """기준 날짜의 만 나이 (생년월일이 없으면 저장된 나이)"""
+    if birth is None:
+        return fallback_age
+    return target_date.year - birth.year - ((target_date.month, target_date.day) < (birth.month, birth.day))
+
+# SQL에서 만 나이를 연령대로 바꾸는 CASE 식 (age_group_for_age와 동일한 구분)
+AGE_GROUP_CASE_SQL = "CASE " + " ".join(
+    f"WHEN current_age <= {upper_age} THEN '{age_group}'" for upper_age, age_group in AGE_GROUPS
+) + f" ELSE '{OLDEST_AGE_GROUP}' END"
+
+class NutritionService:
+    """영양소 비교 서비스 클래스"""
+    
+    def __init__(self):
+        self.db = db
+        # 사용자 ID → (생년월일, 나이) LRU 캐시 (CACHE_TTL_SECONDS 후 만료, 프로필 수정/삭제 이벤트 수신 시 제거)
+        self._profile_ages = LocalCache(config.CACHE_MAX_ENTRIES)
+        invalidation.subscribe(self._on_invalidation)
+    
+    def remember_profile(self, user_id: int, birth: Optional[date], age: Optional[int]) -> None:
+        """세션 토큰 등으로 이미 알고 있는 프로필 나이를 캐시에 저장"""
+        self._profile_ages.set(str(user_id), (birth, age), config.CACHE_TTL_SECONDS)
+    
+    def forget_profile(self, user_id: int) -> None:
+        """프로필 나이 캐시에서 사용자 제거"""
+        self._profile_ages.delete(str(user_id))
+    
+    def _on_invalidation(self, event: Dict) -> None:
+        """캐시 무효화 이벤트 처리 (profile:id:<ID> 키가 삭제되면 나이 캐시도 제거)"""
+        if event.get("reset"):
+            self._profile_ages.clear()
+            return
+        for key in event.get("keys", []):
+            if key.startswith("profile:id:"):
+                self.forget_profile(int(key.rsplit(":", 1)[1]))
+    
+    def resolve_age_group(self, user_id: int, as_of: date) -> Tuple[Optional[int], str]:
+        """
+        사용자 프로필로 기준 날짜의 나이와 연령대 결정 (캐시 우선)
+        
+        Returns:
+            Tuple[Optional[int], str]: (만 나이, 연령대)
+        """
+        profile_age = self._profile_ages.get(str(user_id))
+        if profile_age is None:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT birth, age FROM user_profiles WHERE id = %s", (user_id,))
+                    row = cursor.fetchone()
+            if not row:
+                return None, DEFAULT_AGE_GROUP
+            profile_age = (row['birth'], row['age'])
+            self.remember_profile(user_id, *profile_age)
+        
+        birth, age = profile_age
+        current_age = age_on(birth, age, as_of)
+        return current_age, age_group_for_age(current_age)
+    
+    def compare_day(self, user_id: int, target_date: date) -> Optional[Dict]:
+        """
+        하루 영양소 섭취량을 사용자 연령대 평균과 비교 (DB 왕복 1회)
+        
+        프로필 연령대 결정, 일별 집계 조회, 평균 영양소 조회를 하나의 SQL로 처리합니다.
+        프로필 나이가 캐시되어 있으면 연령대를 바로 넘기고 프로필 조회는 생략합니다.
+        
+        Returns:
+            Optional[Dict]: 비교 결과 (해당 날짜 기록이 없으면 None)
+        """
+        import numpy as np
+        
+        try:
+            columns = ', '.join(f"totals.{column}" for _, column in NUTRIENT_COLUMNS)
+            params = {'user_id': user_id, 'target_date': target_date}
+            
+            profile_age = self._profile_ages.get(str(user_id))
+            if profile_age is not None:
+                birth, age = profile_age
+                current_age = age_on(birth, age, target_date)
+                params.update(current_age=current_age, age_group=age_group_for_age(current_age))
+                resolved_sql = """
+                    SELECT TRUE AS has_profile, NULL::date AS birth, NULL::int AS age,
+                           %(current_age)s::int AS current_age, %(age_group)s AS age_group
+                """
+            else:
+                params['default_age_group'] = DEFAULT_AGE_GROUP
+                resolved_sql = f"""
+                    SELECT profile.id IS NOT NULL AS has_profile, profile.birth, profile.age,
+                           profile.current_age,
+                           CASE WHEN profile.id IS NULL THEN %(default_age_group)s
+                                ELSE {AGE_GROUP_CASE_SQL} END AS age_group
+                    FROM (SELECT 1) AS base
+                    LEFT JOIN (
+                        SELECT id, birth, age,
+                               COALESCE(DATE_PART('year', AGE(%(target_date)s::date, birth))::int, age) AS current_age
+                        FROM user_profiles
+                        WHERE id = %(user_id)s
+                    ) AS profile ON TRUE
+                """
+            
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"""
+                        WITH resolved AS ({resolved_sql})
+                        SELECT resolved.has_profile, resolved.birth, resolved.age,
+                               resolved.current_age, resolved.age_group,
+                               totals.total_meals, {columns},
+                               a.nutrient_name, a.unit, a.average_value, a.standard_error
+                        FROM resolved
+                        LEFT JOIN daily_nutrition_totals AS totals
+                            ON totals.user_id = %(user_id)s AND totals.day = %(target_date)s
+                        LEFT JOIN average_nutrition AS a
+                            ON a.age_group = resolved.age_group
+                        ORDER BY a.nutrient_name
+                    """, params)
+                    
+                    rows = cursor.fetchall()
+            
+            first = rows[0]
+            if first['has_profile'] and profile_age is None:
+                self.remember_profile(user_id, first['birth'], first['age'])
+            
+            if not first['total_meals'] or first['total_meals'] <= 0:
+                return None
+            
+            intake = np.array([float(first[column]) for _, column in NUTRIENT_COLUMNS], dtype=np.float64)
+            averages = [
+                AverageNutrient(
+                    nutrient_name=row['nutrient_name'],
+                    unit=row['unit'],
+                    average_value=float(row['average_value']),
+                    standard_error=float(row['standard_error']) if row['standard_error'] else None
+                )
+                for row in rows if row['nutrient_name'] is not None
+            ]
+            
+            matched = self.match_average_nutrients(averages)
+            average_values = np.array([nutrient.average_value for nutrient, _ in matched], dtype=np.float64)
+            user_values = intake[np.array([index for _, index in matched], dtype=np.intp)]
+            differences, percentages, statuses = self._compare(user_values[np.newaxis, :], average_values)
+            comparisons = self._build_comparisons(
+                matched, user_values, differences[0], percentages[0], statuses[0]
+            )
+            
+            result = {
+                "user_profile": {
+                    "user_id": user_id,
+                    "age": first['current_age'],
+                    "age_group": first['age_group']
+                },
+                "comparison_date": target_date.isoformat(),
+                "total_nutrients": len(comparisons)
+            }
+            result.update(self._count_statuses(statuses[0]))
+            result["comparisons"] = comparisons
+            return result
+        except Exception as e:
+            raise Exception(f"영양소 비교 실패: {str(e)}")
+    
+    def match_average_nutrients(self, averages: List[AverageNutrient]) -> List[Tuple[AverageNutrient, int]]:
+        """
+        평균 영양소와 행렬 열 번호 매칭 (호출당 한 번만 수행)
+        
+        Returns:
+            List[Tuple[AverageNutrient, int]]: (평균 영양소, NUTRIENT_COLUMNS 열 번호)
+        """
+        column_index = {key: index for index, (key, _) in enumerate(NUTRIENT_COLUMNS)}
+        matched = []
+        for nutrient in averages:
+            for db_name, user_key in NUTRIENT_MAPPING.items():
+                if db_name in nutrient.nutrient_name:
+                    matched.append((nutrient, column_index[user_key]))
+                    break
+        return matched
+    
+    def load_intake_matrix(self, user_id: int, start_date: date, end_date: date) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        기간 내 일별 섭취량 행렬 조회 (단일 쿼리)
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (날짜 × 영양소 섭취량 행렬, 날짜별 기록 존재 여부)
+        """
+        import numpy as np
+        
+        num_days = (end_date - start_date).days + 1
+        intake = np.zeros((num_days, len(NUTRIENT_COLUMNS)), dtype=np.float64)
+        has_data = np.zeros(num_days, dtype=bool)
+        
+        columns = ', '.join(column for _, column in NUTRIENT_COLUMNS)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT day, total_meals, {columns}
+                    FROM daily_nutrition_totals
+                    WHERE user_id = %s AND day BETWEEN %s AND %s
+                """, (user_id, start_date, end_date))
+                
+                for row in cursor.fetchall():
+                    if row['total_meals'] <= 0:
+                        continue
+                    day_index = (row['day'] - start_date).days
+                    intake[day_index] = [row[column] for _, column in NUTRIENT_COLUMNS]
+                    has_data[day_index] = True
+        
+        return intake, has_data
+    
+    def compare_range(
+        self,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        age_group: Optional[str] = None
+    ) -> Dict:
+        """
+        기간 내 날짜별 영양소 섭취량을 연령대 평균과 비교
+        
+        Args:
+            user_id: 사용자 ID
+            start_date: 시작 날짜
+            end_date: 종료 날짜
+            age_group: 비교할 연령대 (없으면 종료일 기준 프로필 나이로 결정)
+        
+        Returns:
+            Dict: 날짜별 비교 결과와 기간 평균 비교 결과
+        """
+        import numpy as np
+        
+        try:
+            if age_group is None:
+                _, age_group = self.resolve_age_group(user_id, end_date)
+            matched = self.match_average_nutrients(average_nutrition_cache.get_age_group(age_group))
+            intake, has_data = self.load_intake_matrix(user_id, start_date, end_date)
+            
+            averages = np.array([nutrient.average_value for nutrient, _ in matched], dtype=np.float64)
+            column_indexes = np.array([index for _, index in matched], dtype=np.intp)
+            
+            # 날짜 × 비교 영양소 행렬 (평균 항목 순서)
+            user_values = intake[:, column_indexes]
+            differences, percentages, statuses = self._compare(user_values, averages)
+            
+            days = []
+            for day_index in range(intake.shape[0]):
+                comparisons = self._build_comparisons(
+                    matched, user_values[day_index], differences[day_index],
+                    percentages[day_index], statuses[day_index]
+                )
+                day_result = {
+                    "date": (start_date + timedelta(days=day_index)).isoformat(),
+                    "has_data": bool(has_data[day_index]),
+                    "comparisons": comparisons if has_data[day_index] else []
+                }
+                day_result.update(self._count_statuses(statuses[day_index] if has_data[day_index] else []))
+                days.append(day_result)
+            
+            # 기록이 있는 날의 하루 평균 섭취량 비교
+            days_with_data = int(has_data.sum())
+            period_comparisons = []
+            period_counts = self._count_statuses([])
+            if days_with_data:
+                period_values = user_values[has_data].mean(axis=0)
+                period_diff, period_pct, period_status = self._compare(period_values[np.newaxis, :], averages)
+                period_comparisons = self._build_comparisons(
+                    matched, period_values, period_diff[0], period_pct[0], period_status[0]
+                )
+                period_counts = self._count_statuses(period_status[0])
+            
+            return {
+                "user_profile": {
+                    "user_id": user_id,
+                    "age_group": age_group
+                },
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "total_days": len(days),
+                "days_with_data": days_with_data,
+                "total_nutrients": len(matched),
+                "days": days,
+                "period_average": dict(comparisons=period_comparisons, **period_counts)
+            }
+        except Exception as e:
+            raise Exception(f"기간별 영양소 비교 실패: {str(e)}")
+    
+    def _compare(self, user_values: "np.ndarray", averages: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """섭취량 행렬과 평균 벡터의 차이, 차이 비율(%), 상태를 한 번에 계산"""
+        import numpy as np
+        
+        differences = user_values - averages
+        safe_averages = np.where(averages > 0, averages, 1.0)
+        percentages = np.where(averages > 0, differences / safe_averages * 100, 0.0)
+        statuses = np.select(
+            [percentages < -ADEQUATE_RANGE_PERCENT, percentages > ADEQUATE_RANGE_PERCENT],
+            ["부족", "과다"],
+            default="적정"
+        )
+        return differences, percentages, statuses
+    
+    def _build_comparisons(self, matched, user_values, differences, percentages, statuses) -> List[Dict]:
+        """한 행(하루 또는 기간 평균)의 비교 결과를 응답 형식으로 변환"""
+        return [
+            {
+                "nutrient_name": nutrient.nutrient_name,
+                "unit": nutrient.unit,
+                "user_intake": user_value,
+                "average_intake": nutrient.average_value,
+                "difference": difference,
+                "percentage_diff": round(percentage, 2),
+                "status": status
+            }
+            for (nutrient, _), user_value, difference, percentage, status in zip(
+                matched, user_values.tolist(), differences.tolist(), percentages.tolist(), statuses.tolist()
+            )
+        ]
+    
+    def _count_statuses(self, statuses) -> Dict[str, int]:
+        """상태별 영양소 수 집계"""
+        statuses = list(statuses)
+        return {
+            "deficient_nutrients": statuses.count("부족"),
+            "adequate_nutrients": statuses.count("적정"),
+            "excessive_nutrients": statuses.count("과다")
+        }
+
+# 전역 서비스 인스턴스
+nutrition_service = NutritionService()
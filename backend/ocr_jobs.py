@@ -0,0 +1,610 @@
+"""
+OCR 비동기 작업 큐 모듈
+업로드 요청은 작업만 등록하고 바로 응답하며, 워커 스레드가 작업을 꺼내 처리합니다.
+네트워크가 불안정한 모바일 클라이언트가 OCR 처리 시간 동안 연결을 유지하지 않아도 됩니다.
+
+- 작업은 ocr_jobs 테이블에 저장되므로 서버를 재시작해도 남아 있으며,
+  처리 도중 프로세스가 종료된 작업은 임대 시간(OCR_JOB_LEASE_SECONDS)이 지나면 다시 처리합니다
+- 여러 워커 프로세스가 FOR UPDATE SKIP LOCKED 로 작업을 나눠 가집니다
+- 단계(upload_encode, decode, ..., clova_call, parse)가 끝날 때마다 stages 에 기록되어
+  GET /ocr/jobs/{id} 또는 SSE(/ocr/jobs/{id}/events)로 진행 상황을 볼 수 있습니다
+  (다시 처리하는 작업은 stages 를 비우고 새로 기록하며, 각 단계에는 시도 번호(attempt)가 붙습니다)
+- 작업 등록/변경은 같은 트랜잭션에서 pg_notify 로 알리고(OCR_JOB_CHANNEL), 프로세스마다 하나인 리스너가
+  워커 스레드와 SSE 스트림을 깨웁니다. 주기적인 조회(OCR_JOB_POLL_SECONDS)는 알림을 놓친 경우를 위한 것입니다
+
+작업 상태: queued → running → succeeded / failed
+"""
+
+import asyncio
+import contextvars
+import io
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+import orjson
+from psycopg2.extras import Json
+from admission import AdmissionRejected, estimate_image_memory, ocr_admission
+from clova_ocr import get_ocr_executor
+from config import config
+from database import db
+from logger import get_logger
+from metrics import OCR_JOBS
+from tracing import stage_listener
+
+logger = get_logger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED)
+
+# 조회 응답에 포함하는 컬럼 (이미지 제외)
+JOB_COLUMNS = """
+    id, status, stage, stages, params, result, error, attempts,
+    created_at, started_at, finished_at, updated_at
+"""
+
+
+def _notify(cursor, job_id: str, event: str) -> None:
+    """작업 변경 알림 발행 (트랜잭션이 커밋될 때 전달됨)"""
+    cursor.execute(
+        "SELECT pg_notify(%s, %s)",
+        (config.OCR_JOB_CHANNEL, orjson.dumps({"job_id": str(job_id), "event": event}).decode())
+    )
+
+
+class OCRJobStore:
+    """ocr_jobs 테이블 접근"""
+    
+    def __init__(self):
+        self.db = db
+    
+    def ensure_table(self) -> None:
+        """작업 테이블이 없으면 생성"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS ocr_jobs (
+                        id UUID PRIMARY KEY,
+                        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                        stage VARCHAR(30),
+                        stages JSONB NOT NULL DEFAULT '[]',
+                        params JSONB NOT NULL DEFAULT '{}',
+                        content_type VARCHAR(100),
+                        image BYTEA,
+                        result JSONB,
+                        error TEXT,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        worker VARCHAR(100),
+                        lease_expires_at TIMESTAMP,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        started_at TIMESTAMP,
+                        finished_at TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                # 처리 대기/처리 중인 작업만 색인 (완료된 작업이 쌓여도 작업 꺼내기가 느려지지 않도록)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_ocr_jobs_pending
+                    ON ocr_jobs (created_at) WHERE status IN ('queued', 'running')
+                """)
+                conn.commit()
+    
+    def create(self, image: bytes, content_type: str, params: Dict[str, Any]) -> str:
+        """작업 등록 후 작업 ID 반환"""
+        job_id = str(uuid.uuid4())
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO ocr_jobs (id, params, content_type, image)
+                    VALUES (%s, %s, %s, %s)
+                """, (job_id, Json(params), content_type, memoryview(image)))
+                _notify(cursor, job_id, STATUS_QUEUED)
+                conn.commit()
+        return job_id
+    
+    def count_queued(self) -> int:
+        """처리 대기 중인 작업 수"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) AS count FROM ocr_jobs WHERE status = 'queued'")
+                return cursor.fetchone()['count']
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회 (이미지 제외)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT {JOB_COLUMNS} FROM ocr_jobs WHERE id = %s", (job_id,))
+                row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def claim(self, worker: str, lease_seconds: int, max_attempts: int) -> Optional[Dict[str, Any]]:
+        """
+        처리할 작업 하나를 꺼내 running 으로 변경
+        
+        대기 중인 작업 또는 임대 시간이 지난 처리 중 작업(처리하던 프로세스가 종료된 경우)을
+        오래된 순으로 꺼냅니다. 최대 시도 횟수를 넘긴 작업은 fail_exhausted 에서 실패 처리합니다.
+        이전 시도에서 기록한 단계는 비웁니다.
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE ocr_jobs
+                    SET status = 'running', attempts = attempts + 1, worker = %s, stage = NULL, stages = '[]',
+                        started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP,
+                        lease_expires_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second'
+                    WHERE id = (
+                        SELECT id FROM ocr_jobs
+                        WHERE status = 'queued'
+                           OR (status = 'running' AND lease_expires_at < CURRENT_TIMESTAMP AND attempts < %s)
+                        ORDER BY created_at
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, params, content_type, image, attempts
+                """, (worker, lease_seconds, max_attempts))
+                row = cursor.fetchone()
+                if row:
+                    _notify(cursor, row['id'], STATUS_RUNNING)
+                conn.commit()
+        return dict(row) if row else None
+    
+    def fail_exhausted(self, max_attempts: int) -> int:
+        """임대 시간이 지났고 최대 시도 횟수에 도달한 작업을 실패 처리"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE ocr_jobs
+                    SET status = 'failed', error = '최대 처리 시도 횟수 초과', image = NULL,
+                        finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE status = 'running' AND lease_expires_at < CURRENT_TIMESTAMP AND attempts >= %s
+                    RETURNING id
+                """, (max_attempts,))
+                rows = cursor.fetchall()
+                for row in rows:
+                    _notify(cursor, row['id'], STATUS_FAILED)
+                conn.commit()
+        return len(rows)
+    
+    @contextmanager
+    def stage_recorder(self, job_id: str, lease_seconds: int):
+        """
+        작업 하나를 처리하는 동안 끝난 단계를 기록하는 함수 (임대 시간도 연장)
+        
+        단계마다 새로 연결하지 않도록 처리하는 동안 연결 하나를 계속 사용합니다.
+        """
+        with self.db.get_connection() as conn:
+            def record(stage: Dict[str, Any]) -> None:
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute("""
+                            UPDATE ocr_jobs
+                            SET stage = %s, stages = stages || %s::jsonb, updated_at = CURRENT_TIMESTAMP,
+                                lease_expires_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second'
+                            WHERE id = %s
+                        """, (stage["stage"], orjson.dumps([stage]).decode(), lease_seconds, job_id))
+                        _notify(cursor, job_id, "stage")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            
+            yield record
+    
+    def renew_lease(self, job_id: str, lease_seconds: int) -> None:
+        """처리 중인 작업의 임대 시간 연장 (처리 예산을 기다리는 동안 다른 워커가 가져가지 않도록)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE ocr_jobs
+                    SET lease_expires_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second'
+                    WHERE id = %s AND status = 'running'
+                """, (lease_seconds, job_id))
+                conn.commit()
+    
+    def requeue(self, job_id: str) -> None:
+        """처리를 시작하지 못한 작업을 대기 상태로 되돌림 (시도 횟수에 포함하지 않음)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE ocr_jobs
+                    SET status = 'queued', attempts = GREATEST(attempts - 1, 0), worker = NULL,
+                        lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s AND status = 'running'
+                """, (job_id,))
+                _notify(cursor, job_id, STATUS_QUEUED)
+                conn.commit()
+    
+    def finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]], error: Optional[str]) -> None:
+        """처리 결과 저장 (이미지는 더 이상 필요 없으므로 삭제)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE ocr_jobs
+                    SET status = %s, result = %s, error = %s, image = NULL, lease_expires_at = NULL,
+                        finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (status, Json(result) if result is not None else None, error, job_id))
+                _notify(cursor, job_id, status)
+                conn.commit()
+    
+    def purge(self, retention_hours: float) -> int:
+        """보관 기간이 지난 완료 작업 삭제"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    DELETE FROM ocr_jobs
+                    WHERE status IN ('succeeded', 'failed')
+                      AND finished_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 hour'
+                """, (retention_hours,))
+                deleted = cursor.rowcount
+                conn.commit()
+        return deleted
+
+
+class OCRJobRunner:
+    """
+    작업 처리 워커 (프로세스마다 OCR_JOB_WORKERS 개의 스레드)
+    
+    실제 이미지 처리는 OCR 전용 스레드 풀에서 실행하므로 /ocr/upload 와 같은 CPU 예산을 나눠 씁니다.
+    """
+    
+    # 완료 작업 정리 간격 (초)
+    PURGE_INTERVAL = 600
+    
+    def __init__(self, store: OCRJobStore):
+        self.store = store
+        self.process: Optional[Callable[..., Dict[str, Any]]] = None
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._last_purge = 0.0
+        self._last_fail_check = 0.0
+        self._maintenance_lock = threading.Lock()
+    
+    def start(self, process: Callable[..., Dict[str, Any]]) -> None:
+        """
+        워커 스레드 시작
+        
+        Args:
+            process: process(이미지 bytes, content_type, use_roi, roi_bbox, trace) -> 결과 dict
+        """
+        self.process = process
+        self._stop.clear()
+        try:
+            self.store.ensure_table()
+        except Exception as e:
+            logger.warning("OCR 작업 테이블 확인 실패: %s", e)
+        
+        worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._threads = [
+            threading.Thread(target=self._run, args=(f"{worker_prefix}:{index}",), name=f"ocr-job-{index}", daemon=True)
+            for index in range(config.OCR_JOB_WORKERS)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self) -> None:
+        """워커 스레드 종료 (처리 중인 작업은 끝날 때까지 기다리지 않음 - 임대 시간 후 다시 처리됨)"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+    
+    def notify(self) -> None:
+        """새 작업 등록 알림 (워커를 바로 깨움, 다른 프로세스에서 등록한 작업은 리스너가 호출)"""
+        self._wakeup.set()
+    
+    def _run(self, worker: str) -> None:
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim(worker, config.OCR_JOB_LEASE_SECONDS, config.OCR_JOB_MAX_ATTEMPTS)
+                backoff = 1
+            except Exception as e:
+                logger.warning("OCR 작업 조회 실패, %s초 후 재시도: %s", backoff, e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+            
+            if job is None:
+                self._maintain_if_due()
+                self._wakeup.wait(config.OCR_JOB_POLL_SECONDS)
+                self._wakeup.clear()
+                continue
+            
+            self._execute(job)
+    
+    def _execute(self, job: Dict[str, Any]) -> None:
+        job_id = str(job["id"])
+        params = job["params"]
+        if job["attempts"] > 1:
+            OCR_JOBS.inc(status="retried")
+        logger.info("OCR 작업 처리 시작", extra={"job_id": job_id, "attempt": job["attempts"]})
+        
+        def on_stage(stage: str, duration_ms: float, error: Optional[str]) -> None:
+            entry = {"stage": stage, "duration_ms": duration_ms, "finished_at": time.time(), "attempt": job["attempts"]}
+            if error:
+                entry["error"] = error
+            record_stage(entry)
+        
+        try:
+            image = bytes(job["image"])
+            with stage_listener(on_stage):
+                context = contextvars.copy_context()
+            # /ocr/upload 와 같은 처리 예산 사용 (예산이 빌 때까지 대기)
+            cost = estimate_image_memory(io.BytesIO(image), len(image))
+            if not self._acquire(job_id, cost):
+                logger.info("OCR 작업 대기열로 반환 (워커 종료)", extra={"job_id": job_id})
+                return
+            try:
+                with self.store.stage_recorder(job_id, config.OCR_JOB_LEASE_SECONDS) as record_stage:
+                    result = get_ocr_executor().submit(
+                        context.run, self.process, image, job["content_type"],
+                        params.get("use_roi", True), params.get("roi_bbox"), params.get("trace", False)
+                    ).result()
+            finally:
+                ocr_admission.release(cost)
+            
+            if result.get("success"):
+                status, error = STATUS_SUCCEEDED, None
+            else:
+                status, error = STATUS_FAILED, result.get("error", "OCR 처리 실패")
+        except AdmissionRejected as e:
+            # 전체 예산보다 큰 이미지는 다시 처리해도 같으므로 바로 실패 처리
+            logger.warning("OCR 작업 거절: %s", e, extra={"job_id": job_id, "reason": e.reason})
+            status, result, error = STATUS_FAILED, None, str(e)
+        except Exception as e:
+            logger.exception("OCR 작업 처리 실패: %s", e, extra={"job_id": job_id})
+            status, result, error = STATUS_FAILED, None, f"OCR 처리 중 오류 발생: {e}"
+        
+        try:
+            self.store.finish(job_id, status, result, error)
+        except Exception as e:
+            # 결과를 저장하지 못하면 임대 시간이 지난 뒤 다시 처리됨
+            logger.error("OCR 작업 결과 저장 실패: %s", e, extra={"job_id": job_id})
+            return
+        
+        OCR_JOBS.inc(status=status)
+        logger.info("OCR 작업 처리 완료", extra={"job_id": job_id, "status": status})
+    
+    def _acquire(self, job_id: str, cost: int) -> bool:
+        """
+        처리 예산 확보
+        
+        요청 대기열과 별도로 기다리며, 기다리는 동안 임대 시간을 연장하여 다른 워커가 같은 작업을 가져가지 않도록 합니다.
+        워커가 종료되면 작업을 대기 상태로 되돌리고 False 를 반환합니다.
+        
+        Raises:
+            AdmissionRejected: 이미지가 전체 예산보다 큰 경우 (too_large)
+        """
+        wait_seconds = max(1.0, config.OCR_JOB_LEASE_SECONDS / 3)
+        while True:
+            try:
+                ocr_admission.acquire(cost, wait_seconds, queue=False)
+                return True
+            except AdmissionRejected as e:
+                if e.reason == "too_large":
+                    raise
+            
+            try:
+                if self._stop.is_set():
+                    self.store.requeue(job_id)
+                    return False
+                self.store.renew_lease(job_id, config.OCR_JOB_LEASE_SECONDS)
+            except Exception as e:
+                # 연장하지 못해도 기다리기는 계속 (임대 시간이 지나면 다른 워커가 다시 처리할 수 있음)
+                logger.warning("OCR 작업 임대 시간 연장 실패: %s", e, extra={"job_id": job_id})
+                if self._stop.is_set():
+                    return False
+    
+    def _maintain_if_due(self) -> None:
+        """
+        작업이 없을 때 주기적인 정리 작업 실행 (프로세스에서 한 스레드만)
+        
+        - 임대 시간마다: 최대 시도 횟수에 도달한 채 임대 시간이 지난 작업 실패 처리
+        - PURGE_INTERVAL 마다: 보관 기간이 지난 완료 작업 삭제
+        """
+        now = time.monotonic()
+        fail_due = now - self._last_fail_check >= config.OCR_JOB_LEASE_SECONDS
+        purge_due = now - self._last_purge >= self.PURGE_INTERVAL
+        if not (fail_due or purge_due) or not self._maintenance_lock.acquire(blocking=False):
+            return
+        try:
+            if fail_due:
+                self._last_fail_check = now
+                failed = self.store.fail_exhausted(config.OCR_JOB_MAX_ATTEMPTS)
+                if failed:
+                    OCR_JOBS.inc(failed, status=STATUS_FAILED)
+                    logger.warning("최대 처리 시도 횟수를 넘긴 OCR 작업 실패 처리", extra={"jobs": failed})
+            if purge_due:
+                self._last_purge = now
+                deleted = self.store.purge(config.OCR_JOB_RETENTION_HOURS)
+                if deleted:
+                    logger.info("완료된 OCR 작업 정리", extra={"deleted": deleted})
+        except Exception as e:
+            logger.warning("OCR 작업 정리 실패: %s", e)
+        finally:
+            self._maintenance_lock.release()
+
+
+class JobWatchers:
+    """작업별 SSE 스트림 대기자 (작업 변경 알림을 받으면 해당 스트림을 깨움)"""
+    
+    def __init__(self):
+        self._watchers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, job_id: str) -> asyncio.Event:
+        """이벤트 루프에서 호출 (반환된 이벤트는 작업이 바뀌면 set 됨)"""
+        event = asyncio.Event()
+        with self._lock:
+            self._watchers.setdefault(job_id, set()).add((asyncio.get_running_loop(), event))
+        return event
+    
+    def remove(self, job_id: str, event: asyncio.Event) -> None:
+        with self._lock:
+            watchers = self._watchers.get(job_id, set())
+            watchers.difference_update({watcher for watcher in watchers if watcher[1] is event})
+            if not watchers:
+                self._watchers.pop(job_id, None)
+    
+    def wake(self, job_id: Optional[str] = None) -> None:
+        """작업 변경 알림 (job_id 가 None 이면 모든 스트림을 깨움 - 알림을 놓쳤을 수 있는 경우)"""
+        with self._lock:
+            if job_id is None:
+                watchers = [watcher for job_watchers in self._watchers.values() for watcher in job_watchers]
+            else:
+                watchers = list(self._watchers.get(job_id, ()))
+        for loop, event in watchers:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료됨
+                pass
+
+
+class OCRJobListener:
+    """작업 변경 알림 백그라운드 리스너 (프로세스당 하나, 연결 하나를 계속 사용)"""
+    
+    def __init__(self, runner: OCRJobRunner, watchers: JobWatchers, channel: str = None, poll_timeout: float = 5.0):
+        self.runner = runner
+        self.watchers = watchers
+        self.channel = channel or config.OCR_JOB_CHANNEL
+        self.poll_timeout = poll_timeout
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+    
+    def start(self) -> None:
+        """리스너 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="ocr-job-listener", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """리스너 스레드 종료"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_timeout + 1)
+    
+    def _run(self) -> None:
+        """연결이 끊기면 재연결하며 알림 수신"""
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                with db.get_connection() as conn:
+                    conn.autocommit = True
+                    with conn.cursor() as cursor:
+                        cursor.execute(f'LISTEN "{self.channel}"')
+                    
+                    # 연결 전이나 끊긴 동안 놓친 알림이 있을 수 있으므로 모두 한 번 다시 확인
+                    self.runner.notify()
+                    self.watchers.wake()
+                    backoff = 1
+                    logger.info("OCR 작업 알림 리스너 시작", extra={"channel": self.channel})
+                    
+                    self._listen(conn)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning("OCR 작업 알림 리스너 연결 실패, %s초 후 재시도: %s", backoff, e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+    
+    def _listen(self, conn) -> None:
+        """알림이 오면 즉시 깨어나 처리"""
+        while not self._stop.is_set():
+            if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                try:
+                    event = orjson.loads(notify.payload)
+                except ValueError:
+                    continue
+                if event.get("event") == STATUS_QUEUED:
+                    self.runner.notify()
+                self.watchers.wake(event.get("job_id"))
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def job_events(job_id: str, is_disconnected: Callable, poll_interval: float = 15.0,
+                     keepalive: float = 15.0) -> AsyncIterator[bytes]:
+    """
+    작업 진행 상황 SSE 스트림
+    
+    작업 변경 알림을 받을 때만 다시 조회하며, 알림이 없어도 poll_interval 마다 한 번 확인합니다.
+    
+    - stage: 단계가 끝날 때마다 (단계명, 소요 시간)
+    - status: 상태가 바뀔 때 (queued/running)
+    - done: 처리가 끝나면 작업 전체 (결과 포함) 후 스트림 종료
+    """
+    loop = asyncio.get_running_loop()
+    sent_stages = 0
+    sent_attempt = None
+    last_status = None
+    last_sent = time.monotonic()
+    changed = job_watchers.add(job_id)
+    
+    try:
+        while True:
+            # 조회 전에 초기화 (조회하는 동안 들어온 알림도 다음 대기에서 받도록)
+            changed.clear()
+            job = await loop.run_in_executor(None, ocr_job_store.get, job_id)
+            if job is None:
+                yield _sse("error", {"job_id": job_id, "error": "작업을 찾을 수 없습니다."})
+                return
+            
+            # 다시 처리하는 작업은 stages 가 비워지므로 새 시도의 단계부터 다시 전송 (각 단계의 attempt 로 구분)
+            if job["attempts"] != sent_attempt:
+                sent_attempt = job["attempts"]
+                sent_stages = 0
+            for stage in job["stages"][sent_stages:]:
+                yield _sse("stage", stage)
+                last_sent = time.monotonic()
+            sent_stages = len(job["stages"])
+            
+            if job["status"] in FINISHED_STATUSES:
+                yield _sse("done", job)
+                return
+            
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield _sse("status", {"job_id": job_id, "status": last_status, "attempts": job["attempts"]})
+                last_sent = time.monotonic()
+            
+            if time.monotonic() - last_sent >= keepalive:
+                # 프록시가 유휴 연결을 끊지 않도록 주석 전송
+                yield b": keepalive\n\n"
+                last_sent = time.monotonic()
+            
+            if await is_disconnected():
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=min(poll_interval, keepalive))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        job_watchers.remove(job_id, changed)
+
+
+# 전역 작업 저장소/워커 인스턴스
+ocr_job_store = OCRJobStore()
+ocr_job_runner = OCRJobRunner(ocr_job_store)
+job_watchers = JobWatchers()
+ocr_job_listener = OCRJobListener(ocr_job_runner, job_watchers)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+nutrition_records 월별 파티션 관리
+기존 테이블의 파티션 전환, 미래 파티션 생성, 오래된 파티션 보관을 처리합니다.
+
+사용법:
+    python partition_manager.py migrate            # 기존 테이블을 월별 파티션 테이블로 전환
+    python partition_manager.py ensure [개월 수]     # 앞으로 N개월 파티션 미리 생성
+    python partition_manager.py archive [개월 수]    # N개월보다 오래된 파티션을 보관 스키마로 분리
+"""
+
+import re
+import sys
+from datetime import date
+from typing import List, Optional, Tuple
+from config import config
+from database import db
+
+PARENT_TABLE = "nutrition_records"
+DEFAULT_PARTITION = "nutrition_records_default"
+PARTITION_NAME_PATTERN = re.compile(r"^nutrition_records_y(\d{4})m(\d{2})$")
+
+# 여러 워커가 동시에 시작해도 파티션 생성/보관을 한 번에 하나만 수행하도록 잡는 advisory lock 키
+PARTITION_SETUP_LOCK = 7242002
+
+# 파티션 전환 후 부모 테이블에 다시 만드는 인덱스 (create_nutrition_records_indexes.sql과 동일)
+PARTITIONED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_nutrition_records_user_date "
+    "ON nutrition_records(user_id, intake_date, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_nutrition_records_user_created "
+    "ON nutrition_records(user_id, created_at DESC, id DESC)",
+]
+
+def month_start(day: date) -> date:
+    """해당 날짜가 속한 달의 1일"""
+    return day.replace(day=1)
+
+def add_months(day: date, months: int) -> date:
+    """월 단위 날짜 이동 (항상 1일 반환)"""
+    month_index = day.year * 12 + (day.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    """월별 파티션 테이블 이름"""
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+class PartitionManager:
+    """nutrition_records 파티션 관리 클래스"""
+    
+    def __init__(self):
+        self.db = db
+    
+    def is_partitioned(self, cursor) -> bool:
+        """nutrition_records가 파티션 테이블인지 확인"""
+        cursor.execute("""
+            SELECT c.relkind
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = %s AND n.nspname = current_schema()
+        """, (PARENT_TABLE,))
+        row = cursor.fetchone()
+        return bool(row) and row['relkind'] == 'p'
+    
+    def list_partitions(self, cursor) -> List[Tuple[str, date]]:
+        """월별 파티션 목록 (이름, 시작 월) 반환"""
+        cursor.execute("""
+            SELECT child.relname AS name
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_namespace n ON n.oid = parent.relnamespace
+            WHERE parent.relname = %s AND n.nspname = current_schema()
+        """, (PARENT_TABLE,))
+        
+        partitions = []
+        for row in cursor.fetchall():
+            match = PARTITION_NAME_PATTERN.match(row['name'])
+            if match:
+                partitions.append((row['name'], date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+    
+    def create_month_partition(self, cursor, month: date) -> bool:
+        """
+        월별 파티션 생성 (이미 있으면 건너뜀)
+        
+        기본 파티션에 해당 월의 행이 들어와 있으면 새 파티션으로 옮긴 뒤 연결합니다.
+        """
+        name = partition_name(month)
+        cursor.execute("SELECT to_regclass(%s) AS oid", (name,))
+        if cursor.fetchone()['oid']:
+            return False
+        
+        next_month = add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        
+        cursor.execute("SELECT to_regclass(%s) AS oid", (DEFAULT_PARTITION,))
+        if cursor.fetchone()['oid']:
+            cursor.execute(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE intake_date >= %s AND intake_date < %s
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """, (month, next_month))
+        
+        cursor.execute(f"""
+            ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name}
+            FOR VALUES FROM (%s) TO (%s)
+        """, (month, next_month))
+        return True
+    
+    def ensure_future_partitions(self, months_ahead: Optional[int] = None) -> List[str]:
+        """이번 달부터 앞으로 N개월 파티션을 미리 생성"""
+        months_ahead = config.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+        created = []
+        
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                if not self.is_partitioned(cursor):
+                    return created
+                
+                # 서버 워커마다 시작 시 호출되므로 먼저 잠금을 잡은 워커만 생성하고 나머지는 생성된 파티션을 확인
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (PARTITION_SETUP_LOCK,))
+                current = month_start(date.today())
+                for offset in range(months_ahead + 1):
+                    month = add_months(current, offset)
+                    if self.create_month_partition(cursor, month):
+                        created.append(partition_name(month))
+                
+                conn.commit()
+        return created
+    
+    def migrate(self) -> int:
+        """
+        기존 nutrition_records 테이블을 월별 파티션 테이블로 전환
+        
+        하나의 트랜잭션에서 기존 테이블 이름 변경 → 파티션 테이블 생성 →
+        데이터 복사 → 기존 테이블 삭제를 수행하므로 실패하면 원상태로 돌아갑니다.
+        
+        Returns:
+            int: 옮긴 행 수
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                if self.is_partitioned(cursor):
+                    return 0
+                
+                old_table = f"{PARENT_TABLE}_unpartitioned"
+                cursor.execute(f"LOCK TABLE {PARENT_TABLE} IN ACCESS EXCLUSIVE MODE")
+                cursor.execute(f"ALTER TABLE {PARENT_TABLE} RENAME TO {old_table}")
+                
+                # 파티션 키는 기본키에 포함되어야 하므로 기본키는 (id, intake_date)로 구성
+                cursor.execute(f"""
+                    CREATE TABLE {PARENT_TABLE} (
+                        LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+                    ) PARTITION BY RANGE (intake_date)
+                """)
+                cursor.execute(f"ALTER TABLE {PARENT_TABLE} ALTER COLUMN intake_date SET NOT NULL")
+                
+                # id 시퀀스가 기존 테이블과 함께 삭제되지 않도록 소유권 이전
+                cursor.execute("SELECT pg_get_serial_sequence(%s, 'id') AS seq", (old_table,))
+                sequence = cursor.fetchone()['seq']
+                if sequence:
+                    cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {PARENT_TABLE}.id")
+                
+                # 기존 데이터 범위 + 앞으로 N개월 파티션 생성
+                cursor.execute(f"SELECT MIN(intake_date) AS first_day FROM {old_table}")
+                first_day = cursor.fetchone()['first_day'] or date.today()
+                month = month_start(first_day)
+                last_month = add_months(month_start(date.today()), config.PARTITION_MONTHS_AHEAD)
+                while month <= last_month:
+                    self.create_month_partition(cursor, month)
+                    month = add_months(month, 1)
+                cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT")
+                
+                cursor.execute(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {old_table}")
+                moved = cursor.rowcount
+                
+                # 기존 테이블의 인덱스 이름과 겹치지 않도록 삭제 후 기본키/인덱스 생성
+                cursor.execute(f"DROP TABLE {old_table}")
+                cursor.execute(f"ALTER TABLE {PARENT_TABLE} ADD PRIMARY KEY (id, intake_date)")
+                for statement in PARTITIONED_INDEXES:
+                    cursor.execute(statement)
+                
+                conn.commit()
+                return moved
+    
+    def archive_partitions(self, older_than_months: Optional[int] = None) -> List[str]:
+        """
+        N개월보다 오래된 파티션을 분리하여 보관 스키마로 이동
+        
+        분리된 파티션은 더 이상 조회/VACUUM/인덱스 유지 대상에 포함되지 않습니다.
+        PostgreSQL 14 이상에서는 보관 스키마에 nutrition_data를 lz4로 압축하는 테이블을 새로 만들어
+        데이터를 다시 쓰고, 그 외 버전에서는 파티션을 그대로 보관 스키마로 옮깁니다.
+        """
+        older_than_months = (
+            config.PARTITION_ARCHIVE_AFTER_MONTHS if older_than_months is None else older_than_months
+        )
+        cutoff = add_months(month_start(date.today()), -older_than_months)
+        archived = []
+        
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                if not self.is_partitioned(cursor):
+                    return archived
+                
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (PARTITION_SETUP_LOCK,))
+                cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {config.PARTITION_ARCHIVE_SCHEMA}")
+                cursor.execute("SHOW server_version_num")
+                supports_lz4 = int(cursor.fetchone()['server_version_num']) >= 140000
+                
+                for name, month in self.list_partitions(cursor):
+                    if month >= cutoff:
+                        continue
+                    
+                    cursor.execute(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+                    if supports_lz4:
+                        self.rewrite_compressed(cursor, name)
+                    else:
+                        cursor.execute(f"ALTER TABLE {name} SET SCHEMA {config.PARTITION_ARCHIVE_SCHEMA}")
+                    archived.append(name)
+                
+                conn.commit()
+        return archived
+
+    def rewrite_compressed(self, cursor, name: str) -> None:
+        """
+        분리한 파티션을 nutrition_data를 lz4로 압축하는 보관 테이블로 다시 쓰고 원래 테이블 삭제
+        
+        SET COMPRESSION은 이후에 저장되는 값에만 적용되고, INSERT ... SELECT도 이미 압축된 값은
+        그대로 복사하므로 nutrition_data를 텍스트로 풀었다가 다시 변환해 새로 압축되게 합니다.
+        """
+        archive_table = f"{config.PARTITION_ARCHIVE_SCHEMA}.{name}"
+        cursor.execute(f"CREATE TABLE {archive_table} (LIKE {name} INCLUDING ALL)")
+        cursor.execute(f"ALTER TABLE {archive_table} ALTER COLUMN nutrition_data SET COMPRESSION lz4")
+        
+        cursor.execute("""
+            SELECT attname, format_type(atttypid, atttypmod) AS type
+            FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+            ORDER BY attnum
+        """, (name,))
+        columns = [
+            f"{row['attname']}::text::{row['type']}" if row['attname'] == 'nutrition_data' else row['attname']
+            for row in cursor.fetchall()
+        ]
+        
+        cursor.execute(f"INSERT INTO {archive_table} SELECT {', '.join(columns)} FROM {name}")
+        cursor.execute(f"DROP TABLE {name}")
+
+# 전역 파티션 관리 인스턴스
+partition_manager = PartitionManager()
+
+def main():
+    """메인 실행 함수"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ("migrate", "ensure", "archive"):
+        print(__doc__)
+        sys.exit(1)
+    
+    command = sys.argv[1]
+    months = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    
+    try:
+        if command == "migrate":
+            print("🚀 nutrition_records 월별 파티션 전환 시작")
+            moved = partition_manager.migrate()
+            print(f"✅ 파티션 전환 완료: {moved}개 행 이동")
+        elif command == "ensure":
+            created = partition_manager.ensure_future_partitions(months)
+            print(f"✅ 파티션 생성 완료: {', '.join(created) if created else '새로 만든 파티션 없음'}")
+        else:
+            archived = partition_manager.archive_partitions(months)
+            print(f"✅ 파티션 보관 완료: {', '.join(archived) if archived else '보관할 파티션 없음'}")
+    except Exception as e:
+        print(f"❌ 파티션 작업 실패: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+운영용 다중 프로세스 서버 모듈
+부모 프로세스가 소켓을 열고 공용 데이터를 미리 읽은 뒤 워커 프로세스를 fork 합니다.
+
+- 참조 테이블 등 읽기 전용 데이터는 fork 전에 한 번만 읽어 워커들이 메모리 페이지를 공유 (copy-on-write)
+- 워커는 요청을 WORKER_MAX_REQUESTS (+ 무작위 지터) 건 처리하면 처리 중인 요청을 마치고 종료하며,
+  부모가 새 워커를 띄웁니다 (OpenCV 등 네이티브 라이브러리의 메모리 누수가 계속 쌓이지 않도록)
+- 비정상 종료한 워커도 다시 띄웁니다
+- SIGTERM/SIGINT 를 받으면 워커에 종료 신호를 보내고 WORKER_GRACEFUL_TIMEOUT 만큼 기다립니다
+- 워커별 메트릭은 METRICS_DIR(비우면 임시 디렉터리)에 기록되어 /metrics 가 모든 워커 값을 합산합니다
+
+fork 를 사용하므로 Linux/macOS 에서만 동작합니다.
+"""
+
+import atexit
+import gc
+import os
+import random
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from typing import Callable, Dict, Optional
+import uvicorn
+from uvicorn.importer import import_from_string
+from logger import get_logger
+import metrics
+
+logger = get_logger(__name__)
+
+# 이보다 빨리 종료한 워커는 잠시 기다렸다가 다시 띄움 (시작 직후 계속 죽는 경우 과도한 재시작 방지)
+MIN_WORKER_LIFETIME = 1.0
+
+
+class PreforkServer:
+    """fork 기반 워커 관리 (부모 프로세스는 요청을 처리하지 않고 워커 상태만 관리)"""
+    
+    def __init__(self, app: str, host: str, port: int, workers: int,
+                 max_requests: int = 0, max_requests_jitter: int = 0,
+                 graceful_timeout: float = 30, log_level: str = "warning", metrics_dir: str = ""):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.metrics_dir = metrics_dir
+        self._children: Dict[int, float] = {}
+        self._stopping = False
+    
+    def run(self, preload: Optional[Callable[[], None]] = None) -> None:
+        """소켓 생성, 공용 데이터 로드, 워커 실행 후 종료 신호를 받을 때까지 워커 관리"""
+        sock = self._bind()
+        app = import_from_string(self.app)
+        if preload:
+            preload()
+        
+        temp_metrics_dir = None
+        if not self.metrics_dir:
+            temp_metrics_dir = tempfile.mkdtemp(prefix="kiumbapsang-metrics-")
+        metrics.enable_multiprocess(self.metrics_dir or temp_metrics_dir)
+        
+        # fork 전에 만든 객체를 GC 대상에서 제외 (워커에서 GC가 이 객체들을 건드려 페이지가 복사되지 않도록)
+        gc.collect()
+        gc.freeze()
+        
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        
+        logger.info("운영 서버 시작", extra={"host": self.host, "port": self.port, "workers": self.workers})
+        for _ in range(self.workers):
+            self._spawn(app, sock)
+        
+        try:
+            while not self._stopping:
+                self._reap(app, sock)
+                time.sleep(0.5)
+        finally:
+            self._shutdown()
+            sock.close()
+            if temp_metrics_dir:
+                shutil.rmtree(temp_metrics_dir, ignore_errors=True)
+    
+    def _bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+    
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+    
+    def _spawn(self, app, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = time.monotonic()
+            return
+        
+        # 워커 프로세스 (부모의 코드로 돌아가지 않도록 os._exit 로 종료)
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            metrics.multiprocess.start_worker()
+            self._serve(app, sock)
+        except BaseException:
+            logger.exception("워커 실행 실패")
+            code = 1
+        finally:
+            # os._exit 는 atexit 처리를 건너뛰므로 남은 로그/추적 기록을 직접 내보냄
+            atexit._run_exitfuncs()
+            os._exit(code)
+    
+    def _serve(self, app, sock: socket.socket) -> None:
+        """워커에서 uvicorn 실행 (처리 요청 수 제한에 도달하면 정상 종료)"""
+        limit = None
+        if self.max_requests > 0:
+            limit = self.max_requests + random.randint(0, max(0, self.max_requests_jitter))
+        server = uvicorn.Server(uvicorn.Config(
+            app,
+            log_level=self.log_level,
+            limit_max_requests=limit,
+            timeout_graceful_shutdown=self.graceful_timeout
+        ))
+        server.run(sockets=[sock])
+    
+    def _reap(self, app, sock: socket.socket) -> None:
+        """종료한 워커를 정리하고 새 워커로 교체"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            
+            started = self._children.pop(pid, None)
+            lifetime = time.monotonic() - started if started is not None else 0
+            metrics.multiprocess.mark_dead(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if code == 0:
+                logger.info("워커 교체", extra={"pid": pid, "lifetime_seconds": round(lifetime, 1)})
+            else:
+                logger.warning("워커 비정상 종료", extra={"pid": pid, "exit_code": code})
+            
+            if self._stopping:
+                continue
+            if lifetime < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            self._spawn(app, sock)
+    
+    def _shutdown(self) -> None:
+        """워커에 종료 신호를 보내고, 제한 시간이 지나도 남은 워커는 강제 종료"""
+        logger.info("운영 서버 종료", extra={"workers": len(self._children)})
+        for pid in list(self._children):
+            self._signal(pid, signal.SIGTERM)
+        
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self._children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        
+        for pid in list(self._children):
+            logger.warning("워커 강제 종료", extra={"pid": pid})
+            self._signal(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self._children.clear()
+    
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,199 @@
+"""
+요청 프로파일링 모듈
+운영 트래픽 중 일부 요청을 통계적 샘플링 방식으로 프로파일링하여
+flamegraph.pl / speedscope 에서 바로 열 수 있는 folded stack 파일로 저장합니다.
+
+설정 (환경 변수, 재배포 없이 켜고 끌 수 있음):
+    PROFILE_SAMPLE_RATE=0.01          전체 요청 중 프로파일링할 비율 (0이면 끔)
+    PROFILE_ROUTES=/ocr/*,/meals/*    항상 프로파일링할 경로 (fnmatch 패턴)
+    PROFILE_DIR=profiles              결과 저장 디렉터리
+    PROFILE_INTERVAL_MS=5             스택 샘플링 간격
+    PROFILE_MAX_FILES=200             보관할 최대 파일 수 (오래된 것부터 삭제)
+    PROFILE_MAX_AGE_HOURS=72          보관 기간
+
+결과 파일 한 줄 형식: "모듈.함수;모듈.함수;... 샘플수"
+
+요청 처리 중 다른 스레드에서 실행하는 작업(OCR 스레드 풀 등)은 run_profiled 로 감싸면 함께 샘플링됩니다.
+"""
+
+import asyncio
+import contextvars
+import fnmatch
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set
+from config import config
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _frame_label(code, module: str) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module}.{name}"
+
+
+class StackSampler:
+    """대상 스레드들의 호출 스택을 일정 간격으로 수집하는 샘플러 (별도 스레드에서 실행)"""
+    
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_ids: Set[int] = {thread_id}
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+    
+    def add_thread(self, thread_id: int) -> None:
+        self.thread_ids = self.thread_ids | {thread_id}
+    
+    def remove_thread(self, thread_id: int) -> None:
+        self.thread_ids = self.thread_ids - {thread_id}
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self.thread_ids:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[self._stack(frame)] += 1
+    
+    def _stack(self, frame) -> str:
+        """가장 바깥 호출부터 세미콜론으로 이은 스택 문자열"""
+        names: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _frame_label(code, frame.f_globals.get("__name__", "?"))
+            names.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(names))
+    
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+# 현재 요청의 샘플러 (프로파일링하지 않는 요청이면 None)
+_current_sampler: contextvars.ContextVar[Optional[StackSampler]] = contextvars.ContextVar("profile_sampler", default=None)
+
+
+def run_profiled(func, *args):
+    """
+    요청의 컨텍스트를 복사해 다른 스레드에서 실행할 때 사용 (context.run(run_profiled, func, ...))
+    
+    요청을 프로파일링 중이면 실행하는 동안 이 스레드도 샘플링합니다.
+    """
+    sampler = _current_sampler.get()
+    if sampler is None:
+        return func(*args)
+    
+    thread_id = threading.get_ident()
+    sampler.add_thread(thread_id)
+    try:
+        return func(*args)
+    finally:
+        sampler.remove_thread(thread_id)
+
+
+class ProfileStore:
+    """프로파일 결과 저장 및 보관 기간/개수 관리"""
+    
+    def __init__(self, directory: str, max_files: int, max_age_hours: float):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_age_seconds = max_age_hours * 3600
+    
+    def save(self, method: str, route: str, duration_ms: float, folded: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        filename = (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{os.urandom(3).hex()}"
+            f"-{method}-{slug}-{int(duration_ms)}ms.folded"
+        )
+        path = os.path.join(self.directory, filename)
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(folded)
+        self.prune()
+        return path
+    
+    def prune(self) -> None:
+        """오래된 파일과 개수 제한을 넘는 파일 삭제"""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith(".folded")
+            ]
+        except FileNotFoundError:
+            return
+        
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        cutoff = time.time() - self.max_age_seconds
+        for index, entry in enumerate(entries):
+            if index >= self.max_files or entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class ProfilingMiddleware:
+    """
+    요청 프로파일링 ASGI 미들웨어
+    
+    라우트 핸들러는 이벤트 루프 스레드에서 실행되므로 그 스레드를 샘플링하고,
+    run_profiled 로 실행한 다른 스레드의 작업(OCR 처리 등)도 실행되는 동안 함께 샘플링합니다.
+    같은 시간에 이벤트 루프에서 처리 중인 다른 요청의 스택도 함께 섞일 수 있습니다.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self.sample_rate = config.PROFILE_SAMPLE_RATE
+        self.route_patterns = [pattern.strip() for pattern in config.PROFILE_ROUTES.split(",") if pattern.strip()]
+        self.interval = config.PROFILE_INTERVAL_MS / 1000
+        self.store = ProfileStore(config.PROFILE_DIR, config.PROFILE_MAX_FILES, config.PROFILE_MAX_AGE_HOURS)
+    
+    def should_profile(self, path: str) -> bool:
+        if any(fnmatch.fnmatchcase(path, pattern) for pattern in self.route_patterns):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.should_profile(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        start = time.perf_counter()
+        sampler.start()
+        token = _current_sampler.set(sampler)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_sampler.reset(token)
+            sampler.stop()
+            duration_ms = (time.perf_counter() - start) * 1000
+            route = getattr(scope.get("route"), "path", scope["path"])
+            if sampler.samples:
+                # 파일 쓰기는 응답이 끝난 뒤 스레드 풀에서 처리
+                loop = asyncio.get_running_loop()
+                loop.run_in_executor(None, self._save, scope["method"], route, duration_ms, sampler.folded())
+    
+    def _save(self, method: str, route: str, duration_ms: float, folded: str) -> None:
+        try:
+            path = self.store.save(method, route, duration_ms, folded)
+            logger.debug("요청 프로파일 저장", extra={"path": path, "route": route, "duration_ms": round(duration_ms, 1)})
+        except Exception as e:
+            logger.warning("요청 프로파일 저장 실패: %s", e)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일별 영양소 집계 테이블 재계산 스크립트
+nutrition_records 원본 데이터로 daily_nutrition_totals 테이블을 다시 채웁니다.
+
+사용법:
+    python rebuild_daily_totals.py            # 전체 사용자
+    python rebuild_daily_totals.py <user_id>  # 특정 사용자
+"""
+
+import sys
+from meals_service import meals_service
+
+def main():
+    """메인 실행 함수"""
+    user_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    target = f"사용자 {user_id}" if user_id else "전체 사용자"
+    
+    print(f"🚀 일별 영양소 집계 재계산 시작: {target}")
+    
+    try:
+        rebuilt = meals_service.rebuild_daily_totals(user_id)
+        print(f"✅ 재계산 완료: {rebuilt}개 일자")
+    except Exception as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
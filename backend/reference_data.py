@@ -0,0 +1,128 @@
+"""
+참조 데이터 캐시 모듈
+average_nutrition 테이블을 프로세스 단위로 한 번만 읽어 메모리에 보관합니다.
+테이블은 data/insert_nutrition_data.py 실행 시에만 바뀌며, 스크립트가 발행하는
+무효화 이벤트를 받으면 다음 조회 때 다시 읽습니다.
+"""
+
+import hashlib
+import orjson
+from types import MappingProxyType
+from typing import List, Mapping, NamedTuple, Optional, Tuple
+from database import db
+import invalidation
+
+
+class AverageNutrient(NamedTuple):
+    """연령대별 평균 영양소 섭취량 한 항목"""
+    nutrient_name: str
+    unit: str
+    average_value: float
+    standard_error: Optional[float]
+    
+    def to_dict(self) -> dict:
+        """JSON 응답용 dict로 변환"""
+        return {
+            "nutrient_name": self.nutrient_name,
+            "unit": self.unit,
+            "average_value": self.average_value,
+            "standard_error": self.standard_error
+        }
+
+
+class AverageNutritionCache:
+    """average_nutrition 테이블 캐시 (연령대 → 영양소명 → 평균값)"""
+    
+    def __init__(self):
+        self.db = db
+        # (연령대 인덱스, 전체 연령대 응답 본문, 데이터 버전) - 항상 함께 교체
+        self._state: Optional[Tuple[Mapping[str, Mapping[str, AverageNutrient]], bytes, str]] = None
+        invalidation.subscribe(self._on_invalidation)
+    
+    def _on_invalidation(self, event: dict) -> None:
+        """average_nutrition 변경 이벤트 수신 시 캐시를 버리고 다음 조회 때 다시 읽음"""
+        if event.get("reset") or "average_nutrition" in event.get("tables", []):
+            self._state = None
+    
+    def reload(self) -> int:
+        """
+        테이블을 다시 읽어 캐시 교체
+        
+        새 인덱스와 응답 본문을 완성한 뒤 한 번에 교체하므로 읽는 쪽은 잠금 없이
+        항상 완전한 이전/새 데이터 중 하나를 보게 됩니다.
+        
+        Returns:
+            int: 읽은 항목 수
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT age_group, nutrient_name, unit, average_value, standard_error
+                    FROM average_nutrition
+                    ORDER BY age_group, nutrient_name
+                """)
+                rows = cursor.fetchall()
+        
+        by_group = {}
+        for row in rows:
+            by_group.setdefault(row['age_group'], {})[row['nutrient_name']] = AverageNutrient(
+                nutrient_name=row['nutrient_name'],
+                unit=row['unit'],
+                average_value=float(row['average_value']),
+                standard_error=float(row['standard_error']) if row['standard_error'] else None
+            )
+        
+        frozen = MappingProxyType({
+            age_group: MappingProxyType(nutrients) for age_group, nutrients in by_group.items()
+        })
+        
+        # 전체 연령대 응답은 미리 직렬화해 두고 그대로 반환
+        payload = orjson.dumps({
+            "success": True,
+            "message": "전체 연령대 평균 영양소 섭취량 조회 성공",
+            "data": {
+                "age_groups": [
+                    {
+                        "age_group": age_group,
+                        "nutrition_data": [nutrient.to_dict() for nutrient in nutrients.values()]
+                    }
+                    for age_group, nutrients in frozen.items()
+                ]
+            }
+        })
+        
+        # 응답 본문 해시를 데이터 버전으로 사용 (내용이 같으면 다시 읽어도 ETag 유지)
+        version = hashlib.sha1(payload).hexdigest()
+        
+        self._state = (frozen, payload, version)
+        return len(rows)
+    
+    def _ensure_loaded(self) -> Tuple[Mapping[str, Mapping[str, AverageNutrient]], bytes, str]:
+        """처음 사용할 때 한 번만 로드"""
+        if self._state is None:
+            self.reload()
+        return self._state
+    
+    def get_age_group(self, age_group: str) -> List[AverageNutrient]:
+        """연령대의 평균 영양소 목록 (영양소명 순)"""
+        return list(self._ensure_loaded()[0].get(age_group, {}).values())
+    
+    def get_nutrient(self, age_group: str, nutrient_name: str) -> Optional[AverageNutrient]:
+        """연령대/영양소명으로 평균값 조회"""
+        return self._ensure_loaded()[0].get(age_group, {}).get(nutrient_name)
+    
+    def age_groups(self) -> List[str]:
+        """캐시된 연령대 목록"""
+        return list(self._ensure_loaded()[0].keys())
+    
+    def all_groups_payload(self) -> bytes:
+        """전체 연령대 응답 본문 (미리 직렬화된 JSON)"""
+        return self._ensure_loaded()[1]
+    
+    def version(self) -> str:
+        """캐시된 데이터 버전 (ETag 생성용)"""
+        return self._ensure_loaded()[2]
+
+
+# 전역 캐시 인스턴스
+average_nutrition_cache = AverageNutritionCache()
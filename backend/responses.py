@@ -0,0 +1,101 @@
+"""
+API 응답 모듈
+orjson 기반 응답 클래스와 Meal/MealSummary/UserProfile 공용 직렬화를 제공합니다.
+"""
+
+import hashlib
+from decimal import Decimal
+from typing import Any, Optional
+import orjson
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+
+
+def serialize(value: Any) -> Any:
+    """
+    orjson이 직접 처리하지 못하는 값을 변환 (orjson default 훅)
+
+    Meal, MealSummary, UserProfile 등 Pydantic 모델은 dict로, Decimal은 float로 바꿉니다.
+    date/datetime, numpy 배열은 orjson이 직접 직렬화합니다.
+    """
+    if isinstance(value, BaseModel):
+        # Pydantic v2의 .dict()는 호출마다 경고를 거치므로 model_dump를 우선 사용
+        return value.model_dump() if hasattr(value, "model_dump") else value.dict()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"직렬화할 수 없는 타입입니다: {type(value).__name__}")
+
+
+class APIResponse(ORJSONResponse):
+    """
+    orjson 기반 JSON 응답
+
+    모델 객체를 그대로 content에 넣을 수 있으며, 라우트에서
+    필드별 dict 변환이나 .isoformat() 호출이 필요하지 않습니다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=serialize,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+def api_response(
+    message: str,
+    data: Optional[Any] = None,
+    success: bool = True,
+    etag: Optional[str] = None
+) -> APIResponse:
+    """{"success", "message", "data"} 형식의 표준 응답 생성 (etag 지정 시 조건부 요청 헤더 포함)"""
+    return APIResponse(
+        content={
+            "success": success,
+            "message": message,
+            "data": data
+        },
+        headers=etag_headers(etag) if etag else None
+    )
+
+
+# ===== 조건부 요청 (ETag / If-None-Match) =====
+
+def make_etag(*parts: Any) -> str:
+    """
+    데이터 버전 값들로 약한 ETag 생성
+
+    응답 본문 대신 사용자/날짜별 데이터 버전(집계 행 updated_at, 프로필 updated_at 등)으로
+    만들기 때문에 본문을 만들지 않고도 변경 여부를 판단할 수 있습니다.
+    """
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_headers(etag: str) -> dict:
+    """ETag 응답 헤더 (브라우저가 매번 재검증하도록 no-cache 지정)"""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """
+    If-None-Match가 현재 ETag와 일치하면 304 응답 반환, 아니면 None
+
+    사용 예:
+        etag = make_etag("profile", user_id, version)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+    """
+    header = request.headers.get("if-none-match")
+    if not etag or not header:
+        return None
+
+    # 약한 비교: W/ 접두어는 무시
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == current:
+            return Response(status_code=304, headers=etag_headers(etag))
+    return None
@@ -3,13 +3,18 @@ ROI(Region of Interest) 처리 모듈
 영양성분표 영역을 자동으로 감지하고 추출하여 OCR 인식률을 향상시키는 기능
 """
 
-import cv2
-import numpy as np
-from PIL import Image
 import base64
 import io
-from typing import Tuple, List, Optional, Dict
+from typing import TYPE_CHECKING, Tuple, List, Optional, Dict
 import re
+from logger import get_logger
+from tracing import ocr_stage
+
+# OpenCV/NumPy/PIL은 이미지 처리 시점에 불러옴 (서버/스크립트 시작 시간 단축)
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = get_logger(__name__)
 
 
 class ROIProcessor:
@@ -17,8 +22,6 @@ class ROIProcessor:
     
     def __init__(self):
         """ROI 프로세서 초기화"""
-        print("🔍 ROI 프로세서를 초기화하는 중...")
-        
         # 영양성분표 관련 키워드 (한국어/영어)
         self.nutrition_keywords = [
             '영양성분', '영양정보', 'nutrition', 'nutrition facts',
@@ -28,10 +31,8 @@ class ROIProcessor:
             '포화지방', 'saturated', '트랜스지방', 'trans',
             '콜레스테롤', 'cholesterol', '식이섬유', 'fiber'
         ]
-        
-        print("✅ ROI 프로세서 초기화 완료!")
     
-    def detect_nutrition_table_region(self, image: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    def detect_nutrition_table_region(self, image: "np.ndarray") -> Optional[Tuple[int, int, int, int]]:
         """
         이미지에서 영양성분표 영역을 감지
         
@@ -41,6 +42,9 @@ class ROIProcessor:
         Returns:
             Tuple[int, int, int, int]: (x, y, width, height) 또는 None
         """
+        import cv2
+        import numpy as np
+        
         try:
             # 이미지 전처리
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
@@ -94,10 +98,10 @@ class ROIProcessor:
             return best_candidate['bbox']
             
         except Exception as e:
-            print(f"❌ 영양성분표 영역 감지 실패: {str(e)}")
+            logger.error("영양성분표 영역 감지 실패: %s", e)
             return None
     
-    def extract_roi_from_image(self, image: np.ndarray, bbox: Tuple[int, int, int, int]) -> np.ndarray:
+    def extract_roi_from_image(self, image: "np.ndarray", bbox: Tuple[int, int, int, int]) -> "np.ndarray":
         """
         이미지에서 ROI 영역 추출
         
@@ -121,7 +125,7 @@ class ROIProcessor:
         
         return roi
     
-    def preprocess_roi(self, roi_image: np.ndarray) -> np.ndarray:
+    def preprocess_roi(self, roi_image: "np.ndarray") -> "np.ndarray":
         """
         ROI 이미지 전처리 (OCR 인식률 향상)
         
@@ -131,6 +135,9 @@ class ROIProcessor:
         Returns:
             np.ndarray: 전처리된 이미지
         """
+        import cv2
+        import numpy as np
+        
         try:
             # 그레이스케일 변환
             if len(roi_image.shape) == 3:
@@ -157,10 +164,10 @@ class ROIProcessor:
             return processed
             
         except Exception as e:
-            print(f"❌ ROI 전처리 실패: {str(e)}")
+            logger.error("ROI 전처리 실패: %s", e)
             return roi_image
     
-    def detect_text_regions_in_roi(self, roi_image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    def detect_text_regions_in_roi(self, roi_image: "np.ndarray") -> List[Tuple[int, int, int, int]]:
         """
         ROI 내에서 텍스트 영역들을 감지
         
@@ -170,6 +177,8 @@ class ROIProcessor:
         Returns:
             List[Tuple[int, int, int, int]]: 텍스트 영역들의 바운딩 박스 리스트
         """
+        import cv2
+        
         try:
             # 그레이스케일 변환
             if len(roi_image.shape) == 3:
@@ -203,7 +212,7 @@ class ROIProcessor:
             return text_regions
             
         except Exception as e:
-            print(f"❌ 텍스트 영역 감지 실패: {str(e)}")
+            logger.error("텍스트 영역 감지 실패: %s", e)
             return []
     
     def process_image_with_roi(self, image_data: str) -> Dict:
@@ -216,6 +225,10 @@ class ROIProcessor:
         Returns:
             Dict: 처리 결과
         """
+        import cv2
+        import numpy as np
+        from PIL import Image
+        
         try:
             # base64 데이터를 이미지로 변환
             if image_data.startswith('data:'):
@@ -224,29 +237,40 @@ class ROIProcessor:
                 image_base64 = image_data
             
             # base64를 OpenCV 이미지로 변환
-            image_bytes = base64.b64decode(image_base64)
-            pil_image = Image.open(io.BytesIO(image_bytes))
-            opencv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+            with ocr_stage("decode") as span:
+                image_bytes = base64.b64decode(image_base64)
+                pil_image = Image.open(io.BytesIO(image_bytes))
+                opencv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+                span.set("bytes_in", len(image_bytes))
+                span.set("bytes_out", opencv_image.nbytes)
+                span.set("image_size", (opencv_image.shape[1], opencv_image.shape[0]))
             
             # 영양성분표 영역 감지
-            bbox = self.detect_nutrition_table_region(opencv_image)
-            
-            if bbox is None:
-                print("⚠️ 영양성분표 영역을 찾을 수 없습니다. 전체 이미지를 사용합니다.")
-                # 전체 이미지 사용
-                processed_image = self.preprocess_roi(opencv_image)
-                roi_bbox = (0, 0, opencv_image.shape[1], opencv_image.shape[0])
-            else:
-                print(f"✅ 영양성분표 영역 감지: {bbox}")
-                # ROI 추출
-                roi_image = self.extract_roi_from_image(opencv_image, bbox)
-                # ROI 전처리
-                processed_image = self.preprocess_roi(roi_image)
-                roi_bbox = bbox
+            with ocr_stage("roi_detect") as span:
+                bbox = self.detect_nutrition_table_region(opencv_image)
+                span.set("roi_bbox", bbox)
+            
+            with ocr_stage("preprocess") as span:
+                if bbox is None:
+                    logger.debug("영양성분표 영역을 찾을 수 없어 전체 이미지를 사용합니다")
+                    # 전체 이미지 사용
+                    processed_image = self.preprocess_roi(opencv_image)
+                    roi_bbox = (0, 0, opencv_image.shape[1], opencv_image.shape[0])
+                else:
+                    logger.debug("영양성분표 영역 감지", extra={"roi_bbox": bbox})
+                    # ROI 추출
+                    roi_image = self.extract_roi_from_image(opencv_image, bbox)
+                    # ROI 전처리
+                    processed_image = self.preprocess_roi(roi_image)
+                    roi_bbox = bbox
+                span.set("bytes_out", processed_image.nbytes)
             
             # 전처리된 이미지를 base64로 변환
-            _, buffer = cv2.imencode('.jpg', processed_image)
-            processed_base64 = base64.b64encode(buffer).decode('utf-8')
+            with ocr_stage("encode") as span:
+                _, buffer = cv2.imencode('.jpg', processed_image)
+                processed_base64 = base64.b64encode(buffer).decode('utf-8')
+                span.set("bytes_in", processed_image.nbytes)
+                span.set("bytes_out", len(buffer))
             
             return {
                 'success': True,
@@ -303,7 +327,7 @@ class ROIProcessor:
             return enhanced_text
             
         except Exception as e:
-            print(f"❌ 텍스트 후처리 실패: {str(e)}")
+            logger.error("텍스트 후처리 실패: %s", e)
             return text
 
 
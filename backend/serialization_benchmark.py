@@ -0,0 +1,152 @@
+"""
+API 응답 직렬화 벤치마크 스크립트
+기존 방식(필드별 dict 변환 + 표준 json)과 orjson 응답 클래스의 렌더링 시간을 비교합니다.
+데이터베이스 없이 메모리에서 만든 Meal/MealSummary 객체로 측정합니다.
+
+사용법:
+    python serialization_benchmark.py [반복 횟수]
+"""
+
+import sys
+import os
+import time
+from datetime import date, datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.responses import JSONResponse
+from models import Meal, MealSummary, NutritionData, DailyMeals, MealRangeResponse
+from responses import api_response
+
+def make_meals(day, count):
+    """테스트용 식사 목록 생성"""
+    nutrition = NutritionData(
+        amount=100, calories=300, protein=15, carbs=45, fat=12,
+        sodium=250, sugar=8, cholesterol=30, saturated_fat=3, trans_fat=0.1
+    )
+    return [
+        Meal(
+            id=i + 1,
+            user_id=1,
+            food_name=f"벤치마크 식사 {i}",
+            nutrition_data=nutrition,
+            intake_date=day,
+            created_at=datetime.combine(day, datetime.min.time()) + timedelta(minutes=i * 10)
+        )
+        for i in range(count)
+    ]
+
+def make_summary(day, meals):
+    """테스트용 일별 요약 생성"""
+    return MealSummary(
+        date=day,
+        total_meals=len(meals),
+        total_calories=sum(meal.nutrition_data.calories for meal in meals),
+        total_protein=sum(meal.nutrition_data.protein for meal in meals),
+        total_carbs=sum(meal.nutrition_data.carbs for meal in meals),
+        total_fat=sum(meal.nutrition_data.fat for meal in meals),
+        total_sodium=sum(meal.nutrition_data.sodium for meal in meals),
+        total_sugar=sum(meal.nutrition_data.sugar for meal in meals),
+        meals_by_period={"아침": len(meals)}
+    )
+
+def legacy_meal_dict(meal):
+    """기존 라우트의 필드별 변환"""
+    return {
+        "id": meal.id,
+        "user_id": meal.user_id,
+        "food_name": meal.food_name,
+        "nutrition_data": {
+            "amount": meal.nutrition_data.amount,
+            "calories": meal.nutrition_data.calories,
+            "protein": meal.nutrition_data.protein,
+            "carbs": meal.nutrition_data.carbs,
+            "fat": meal.nutrition_data.fat,
+            "sodium": meal.nutrition_data.sodium,
+            "sugar": meal.nutrition_data.sugar,
+            "cholesterol": meal.nutrition_data.cholesterol,
+            "saturated_fat": meal.nutrition_data.saturated_fat,
+            "trans_fat": meal.nutrition_data.trans_fat
+        },
+        "intake_date": meal.intake_date.isoformat(),
+        "created_at": meal.created_at.isoformat()
+    }
+
+def legacy_summary_dict(summary):
+    """기존 라우트의 요약 변환"""
+    summary_data = summary.dict()
+    summary_data['date'] = summary.date.isoformat()
+    return summary_data
+
+def measure(func, iterations):
+    """함수를 반복 실행하여 평균 지연 시간(ms)과 응답 크기 반환"""
+    body = func()
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start_time) * 1000 / iterations, len(body)
+
+def run_serialization_benchmark(iterations=200):
+    """하루 100끼 / 한 달 범위 응답 직렬화 시간 비교"""
+    print(f"🧪 API 응답 직렬화 벤치마크를 시작합니다... (반복 {iterations}회)")
+    
+    today = date.today()
+    day_meals = make_meals(today, 100)
+    day_summary = make_summary(today, day_meals)
+    
+    month_start = today.replace(day=1)
+    month_days = []
+    for offset in range(31):
+        day = month_start + timedelta(days=offset)
+        meals = make_meals(day, 5)
+        month_days.append(DailyMeals(date=day, summary=make_summary(day, meals), meals=meals))
+    month = MealRangeResponse(start_date=month_start, end_date=month_days[-1].date, days=month_days)
+    
+    cases = {
+        "하루 100끼 (/meals/{date})": (
+            lambda: JSONResponse(content={
+                "success": True,
+                "message": "식사 목록 조회 성공",
+                "data": {
+                    "date": today.isoformat(),
+                    "meals": [legacy_meal_dict(meal) for meal in day_meals],
+                    "summary": legacy_summary_dict(day_summary)
+                }
+            }).body,
+            lambda: api_response("식사 목록 조회 성공", {
+                "date": today,
+                "meals": day_meals,
+                "summary": day_summary
+            }).body
+        ),
+        "한 달 범위 (/meals/range)": (
+            lambda: JSONResponse(content={
+                "success": True,
+                "message": "기간별 식사 조회 성공",
+                "data": {
+                    "start_date": month.start_date.isoformat(),
+                    "end_date": month.end_date.isoformat(),
+                    "days": [
+                        {
+                            "date": day.date.isoformat(),
+                            "summary": legacy_summary_dict(day.summary),
+                            "meals": [legacy_meal_dict(meal) for meal in day.meals]
+                        }
+                        for day in month.days
+                    ]
+                }
+            }).body,
+            lambda: api_response("기간별 식사 조회 성공", month.dict()).body
+        )
+    }
+    
+    print(f"\n📊 응답 렌더링 시간:")
+    for name, (legacy, current) in cases.items():
+        legacy_ms, legacy_size = measure(legacy, iterations)
+        current_ms, current_size = measure(current, iterations)
+        print(f"   {name}")
+        print(f"      기존 (dict + json)  {legacy_ms:7.3f}ms | {legacy_size:,} bytes")
+        print(f"      orjson 응답         {current_ms:7.3f}ms | {current_size:,} bytes")
+        print(f"      개선율              {legacy_ms / current_ms:6.2f}배")
+
+if __name__ == "__main__":
+    run_serialization_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,185 @@
+"""
+이미지 처리 입장 제어 테스트 스크립트
+동시 처리 수/메모리 예산 계산, 대기와 시간 초과, 거절 사유, 취소된 대기 요청의 예산 반환을 확인합니다.
+"""
+
+import sys
+import os
+import io
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from admission import AdmissionController, AdmissionRejected, estimate_image_memory
+
+SAMPLE_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "KakaoTalk_20250912_181150961.jpg")
+
+def expect_rejected(reason, func, *args, **kwargs):
+    """func 가 주어진 사유로 거절되는지 확인"""
+    try:
+        func(*args, **kwargs)
+    except AdmissionRejected as e:
+        assert e.reason == reason, e.reason
+        return
+    raise AssertionError(f"{reason} 거절이 발생하지 않음")
+
+def test_accounting():
+    """동시 처리 수와 메모리 예산을 함께 계산하고 반환하는지 확인"""
+    print("🔍 처리 수/메모리 예산 계산 확인")
+    controller = AdmissionController(max_concurrent=2, budget_bytes=100, max_waiting=0, timeout=1)
+    
+    controller.acquire(60)
+    assert (controller.active, controller.bytes_in_use) == (1, 60)
+    # 처리 수는 남았지만 메모리 예산 초과
+    expect_rejected("busy", controller.acquire, 50, wait=False)
+    controller.acquire(40)
+    assert (controller.active, controller.bytes_in_use) == (2, 100)
+    # 메모리는 남았지만 (0 바이트) 처리 수 초과
+    controller.release(40)
+    controller.acquire(0)
+    expect_rejected("busy", controller.acquire, 0, wait=False)
+    
+    controller.release(0)
+    controller.release(60)
+    assert (controller.active, controller.bytes_in_use) == (0, 0)
+    
+    with controller.admit(100):
+        assert controller.bytes_in_use == 100
+    assert (controller.active, controller.bytes_in_use) == (0, 0)
+    print("   ✅ 확보/반환 후 처리 수와 예산이 원래대로 돌아옴")
+
+def test_wait_and_timeout():
+    """예산이 빌 때까지 기다리고, 대기열이 차거나 시간이 지나면 거절하는지 확인"""
+    print("🔍 대기와 시간 초과 확인")
+    controller = AdmissionController(max_concurrent=1, budget_bytes=100, max_waiting=1, timeout=1)
+    controller.acquire(10)
+    
+    # 다른 처리가 끝나면 대기 중인 요청이 처리됨
+    admitted = threading.Event()
+    waiter = threading.Thread(target=lambda: (controller.acquire(10, timeout=5), admitted.set()))
+    waiter.start()
+    time.sleep(0.1)
+    assert controller.waiting == 1 and not admitted.is_set()
+    
+    # 대기열(max_waiting=1)이 차 있으면 바로 거절
+    expect_rejected("queue_full", controller.acquire, 10, timeout=5)
+    # OCR 작업 워커는 요청 대기열과 별도로 기다림
+    expect_rejected("timeout", controller.acquire, 10, timeout=0.05, queue=False)
+    
+    controller.release(10)
+    waiter.join(timeout=2)
+    assert admitted.is_set() and controller.waiting == 0 and controller.active == 1
+    print("   ✅ 반환되면 대기 요청 처리, 대기열이 차면 queue_full")
+    
+    started = time.perf_counter()
+    expect_rejected("timeout", controller.acquire, 10, timeout=0.1)
+    assert 0.1 <= time.perf_counter() - started < 1 and controller.waiting == 0
+    controller.release(10)
+    print("   ✅ 대기 시간이 지나면 timeout")
+
+def test_too_large():
+    """전체 예산보다 큰 이미지는 기다리지 않고 거절하는지 확인"""
+    print("🔍 너무 큰 이미지 거절 확인")
+    controller = AdmissionController(max_concurrent=1, budget_bytes=100, max_waiting=1, timeout=1)
+    expect_rejected("too_large", controller.acquire, 101)
+    expect_rejected("too_large", controller.check_size, 101)
+    controller.check_size(100)
+    assert (controller.active, controller.bytes_in_use, controller.waiting) == (0, 0, 0)
+    print("   ✅ too_large 거절, 예산 변화 없음")
+
+def test_cancelled_waiter_releases():
+    """대기 중 취소된 요청이 나중에 확보한 예산을 반환하는지 확인"""
+    print("🔍 취소된 대기 요청의 예산 반환 확인")
+    controller = AdmissionController(max_concurrent=1, budget_bytes=100, max_waiting=1, timeout=5)
+    
+    async def scenario():
+        controller.acquire(10)
+        
+        async def request():
+            async with controller.admit_async(20):
+                await asyncio.sleep(10)
+        
+        task = asyncio.create_task(request())
+        await asyncio.sleep(0.1)
+        assert controller.waiting == 1
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        
+        # 취소된 요청의 대기 스레드가 예산을 확보한 뒤 바로 반환해야 함
+        controller.release(10)
+        for _ in range(50):
+            if controller.active == 0:
+                break
+            await asyncio.sleep(0.02)
+    
+    asyncio.run(scenario())
+    assert (controller.active, controller.bytes_in_use, controller.waiting) == (0, 0, 0)
+    print("   ✅ 취소 후 처리 수/예산 모두 반환")
+
+def test_waiters_use_own_executor():
+    """대기 요청이 기본 스레드 풀을 막지 않는지 확인 (기본 스레드 풀이 모두 사용 중이어도 대기/처리 가능)"""
+    print("🔍 대기 전용 스레드 풀 확인")
+    controller = AdmissionController(max_concurrent=1, budget_bytes=100, max_waiting=2, timeout=5)
+    
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        default_executor = ThreadPoolExecutor(max_workers=1)
+        loop.set_default_executor(default_executor)
+        blocker = threading.Event()
+        busy = loop.run_in_executor(None, blocker.wait)
+        
+        try:
+            controller.acquire(10)
+            
+            async def request():
+                async with controller.admit_async(20):
+                    pass
+            
+            task = asyncio.create_task(request())
+            await asyncio.sleep(0.1)
+            assert controller.waiting == 1
+            controller.release(10)
+            await asyncio.wait_for(task, timeout=2)
+        finally:
+            blocker.set()
+            await busy
+    
+    asyncio.run(scenario())
+    assert (controller.active, controller.bytes_in_use, controller.waiting) == (0, 0, 0)
+    assert controller._wait_executor is not None
+    print("   ✅ 기본 스레드 풀이 모두 사용 중이어도 대기 요청 처리")
+
+def test_estimate_resets_position():
+    """메모리 추정이 헤더만 읽고 파일 위치를 되돌리는지 확인"""
+    print("🔍 메모리 추정 후 파일 위치 확인")
+    with open(SAMPLE_IMAGE, "rb") as image_file:
+        contents = image_file.read()
+    
+    file = io.BytesIO(contents)
+    estimate = estimate_image_memory(file, len(contents))
+    assert estimate > len(contents)
+    assert file.tell() == 0 and file.read() == contents
+    
+    # 이미 일부를 읽은 파일도 원래 위치로 되돌림
+    file.seek(5)
+    estimate_image_memory(file, len(contents))
+    assert file.tell() == 5
+    
+    # 이미지가 아니면 크기 기준으로만 계산
+    file = io.BytesIO(b"not an image")
+    assert estimate_image_memory(file, 12) == int(12 * (1 + 4 / 3 + 1)) and file.tell() == 0
+    print(f"   ✅ 추정 {estimate / 1024 / 1024:.1f}MB, 파일 위치 유지")
+
+if __name__ == "__main__":
+    test_accounting()
+    test_wait_and_timeout()
+    test_too_large()
+    test_cancelled_waiter_releases()
+    test_waiters_use_own_executor()
+    test_estimate_resets_position()
+    print("🎉 입장 제어 테스트 완료!")
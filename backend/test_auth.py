@@ -0,0 +1,123 @@
+"""
+세션 토큰 테스트 스크립트
+토큰 발급/검증, 위조·만료 토큰 거절, 프로필 변경 후 토큰의 나이 정보 무시를 확인합니다.
+"""
+
+import sys
+import os
+import json
+import time
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import HTTPException
+from config import config
+from auth import SessionManager, _b64decode, _b64encode, require_admin
+
+def test_issue_and_verify():
+    """발급한 토큰의 사용자 ID/생년월일/연령대를 그대로 돌려받는지 확인"""
+    print("🔍 토큰 발급/검증 확인")
+    manager = SessionManager("secret", 3600)
+    token = manager.issue(7, date(2015, 3, 1), None)
+    
+    claims = manager.verify(token)
+    assert claims is not None and claims.user_id == 7 and claims.birth == date(2015, 3, 1)
+    assert claims.age is None and claims.age_group and claims.expires_at > time.time()
+    # 검증 결과 캐시에서 다시 확인해도 같은 결과
+    assert manager.verify(token) == claims
+    print(f"   ✅ user_id={claims.user_id}, 연령대={claims.age_group}")
+
+def test_tampered_tokens_rejected():
+    """내용이나 서명을 바꾼 토큰, 다른 키로 서명한 토큰을 거절하는지 확인"""
+    print("🔍 위조 토큰 거절 확인")
+    manager = SessionManager("secret", 3600)
+    token = manager.issue(7, None, 10)
+    version, body, signature = token.split(".")
+    
+    payload = json.loads(_b64decode(body))
+    payload["uid"] = 1
+    forged_body = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    forged_signature = ("A" if signature[0] != "A" else "B") + signature[1:]
+    
+    for forged in (
+        f"{version}.{forged_body}.{signature}",
+        f"{version}.{body}.{forged_signature}",
+        f"v0.{body}.{signature}",
+        f"{version}.{body}",
+        "not-a-token",
+        SessionManager("other-secret", 3600).issue(7, None, 10),
+    ):
+        assert manager.verify(forged) is None, forged
+    print("   ✅ 내용 변경, 서명 변경, 버전 불일치, 형식 오류, 다른 키 모두 거절")
+
+def test_expired_token_rejected():
+    """만료된 토큰은 검증 결과 캐시에 있어도 거절하는지 확인"""
+    print("🔍 만료 토큰 거절 확인")
+    manager = SessionManager("secret", 1)
+    token = manager.issue(7, None, 10)
+    assert manager.verify(token) is not None
+    
+    expired = SessionManager("secret", -1).issue(7, None, 10)
+    assert manager.verify(expired) is None
+    
+    time.sleep(1.1)
+    assert manager.verify(token) is None
+    print("   ✅ 만료 토큰 거절 (캐시된 토큰 포함)")
+
+def test_profile_staleness():
+    """프로필 변경 이벤트, 이벤트 유실(reset), 프로세스 시작 이전에 발급된 토큰의 나이 정보를 무시하는지 확인"""
+    print("🔍 프로필 변경 후 토큰 나이 정보 확인")
+    issuer = SessionManager("secret", 3600)
+    old_token = issuer.issue(7, date(2015, 3, 1), None)
+    time.sleep(0.01)
+    
+    # 토큰 발급 이후 시작한 프로세스는 변경 여부를 알 수 없으므로 사용하지 않음
+    manager = SessionManager("secret", 3600)
+    assert not manager.profile_is_current(manager.verify(old_token))
+    
+    token = manager.issue(7, date(2015, 3, 1), None)
+    other_user = manager.issue(8, None, 40)
+    assert manager.profile_is_current(manager.verify(token))
+    
+    # 프로필 변경 이벤트 이후에는 변경 전 토큰만 무시
+    time.sleep(0.01)
+    manager._on_invalidation({"keys": ["profile:id:7"]})
+    assert not manager.profile_is_current(manager.verify(token))
+    assert manager.profile_is_current(manager.verify(other_user))
+    time.sleep(0.01)
+    assert manager.profile_is_current(manager.verify(manager.issue(7, date(2014, 3, 1), None)))
+    
+    # 이벤트를 놓쳤을 수 있으면 (리스너 재연결) 그 이전 토큰은 모두 무시
+    time.sleep(0.01)
+    manager._on_invalidation({"reset": True})
+    assert not manager.profile_is_current(manager.verify(other_user))
+    print("   ✅ 변경 이벤트/reset/프로세스 시작 이전 토큰의 나이 정보 무시")
+
+def test_admin_key():
+    """관리용 API 키가 없으면 모두 거절(403), 헤더가 없거나 다르면 401인지 확인"""
+    print("🔍 관리용 API 키 확인")
+    def status(key):
+        try:
+            require_admin(key)
+        except HTTPException as e:
+            return e.status_code
+        return 200
+    
+    original = config.ADMIN_API_KEY
+    try:
+        config.ADMIN_API_KEY = ""
+        assert status(None) == 403 and status("") == 403 and status("anything") == 403
+        
+        config.ADMIN_API_KEY = "admin-secret"
+        assert status(None) == 401 and status("wrong") == 401 and status("admin-secret") == 200
+    finally:
+        config.ADMIN_API_KEY = original
+    print("   ✅ 키 미설정 403, 잘못된 키 401, 올바른 키 허용")
+
+if __name__ == "__main__":
+    test_issue_and_verify()
+    test_tampered_tokens_rejected()
+    test_expired_token_rejected()
+    test_profile_staleness()
+    test_admin_key()
+    print("🎉 세션 토큰 테스트 완료!")
@@ -0,0 +1,228 @@
+"""
+캐시 기능 테스트 스크립트
+프로세스 내 캐시와 Redis 프로토콜 캐시(메모리 가짜 서버)를 같은 시나리오로 확인합니다.
+"""
+
+import sys
+import os
+import fnmatch
+from datetime import date, datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+from contextlib import contextmanager
+from cache import LocalCache, RedisCache, ModelCache, cache, profile_key, summary_key, day_version_key
+import invalidation
+from models import MealSummary
+from user_models import UserProfile
+
+class FakeRedis:
+    """redis-py 클라이언트의 get/set/delete/scan_iter만 흉내 내는 메모리 서버"""
+    
+    def __init__(self):
+        self.store = {}
+    
+    def get(self, key):
+        return self.store.get(key)
+    
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+    
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.store) if fnmatch.fnmatch(key, match)]
+
+def make_profile():
+    """테스트용 프로필 생성"""
+    return UserProfile(
+        id=1, google_id="google-1", email="test@example.com", username="테스트",
+        age=30, birth=date(1995, 1, 1), height=170.0, weight=65.0, address="서울",
+        created_at=datetime(2025, 1, 1, 9, 0), updated_at=datetime(2025, 1, 2, 9, 0)
+    )
+
+def make_summary(day):
+    """테스트용 일별 요약 생성"""
+    return MealSummary(
+        date=day, total_meals=2, total_calories=800, total_protein=30, total_carbs=100,
+        total_fat=20, total_sodium=900, total_sugar=10, meals_by_period={"아침": 1, "점심": 1}
+    )
+
+def run_backend_scenario(name, cache):
+    """조회/저장/삭제/비우기 시나리오 확인"""
+    print(f"🧪 {name} 캐시 테스트를 시작합니다...")
+    today = date(2025, 1, 2)
+    profile = make_profile()
+    summary = make_summary(today)
+    
+    assert cache.get(profile_key(1), UserProfile) is None
+    
+    cache.set(profile_key(1), profile)
+    cache.set(summary_key(1, today), summary)
+    cache.set(day_version_key(1, today), "2025-01-02T09:00:00|2")
+    
+    assert cache.get(profile_key(1), UserProfile) == profile
+    assert cache.get(summary_key(1, today), MealSummary) == summary
+    assert cache.get(day_version_key(1, today)) == "2025-01-02T09:00:00|2"
+    print("   ✅ 저장/조회 (모델 복원 포함)")
+    
+    cache.delete(profile_key(1))
+    assert cache.get(profile_key(1), UserProfile) is None
+    print("   ✅ 쓰기 후 키 삭제")
+    
+    cache.clear("summary:")
+    assert cache.get(summary_key(1, today), MealSummary) is None
+    assert cache.get(day_version_key(1, today)) is None
+    print("   ✅ 네임스페이스 비우기")
+    
+    stats = cache.stats()
+    print(f"   📊 적중 {stats['hits']}회 / 미스 {stats['misses']}회")
+
+def test_local_backend():
+    """프로세스 내 캐시 시나리오"""
+    run_backend_scenario("프로세스 내", ModelCache(LocalCache()))
+
+def test_redis_backend():
+    """Redis 프로토콜 캐시 시나리오 (메모리 가짜 서버)"""
+    run_backend_scenario("Redis 프로토콜 (가짜 서버)", ModelCache(RedisCache(client=FakeRedis())))
+
+def test_local_expiry():
+    """프로세스 내 캐시 TTL/최대 항목 수 확인"""
+    backend = LocalCache(max_entries=2)
+    backend.set("a", 1, ttl=-1)
+    assert backend.get("a") is None
+    
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+    assert backend.get("b") is None and backend.get("a") == 1
+    print("   ✅ 만료/LRU 제거")
+
+def test_backend_failure():
+    """캐시 서버 오류 시 미스로 처리되는지 확인"""
+    class BrokenRedis(FakeRedis):
+        def get(self, key):
+            raise ConnectionError("연결 끊김")
+    
+    cache = ModelCache(RedisCache(client=BrokenRedis()))
+    assert cache.get(profile_key(1), UserProfile) is None
+    print("   ✅ 캐시 서버 오류 시 데이터베이스 조회로 대체")
+
+def test_invalidation_events():
+    """무효화 이벤트 분할 발행과 현재 프로세스 반영 확인"""
+    class FakeCursor:
+        def __init__(self):
+            self.payloads = []
+        
+        def execute(self, query, params):
+            self.payloads.append(params[1])
+    
+    cursor = FakeCursor()
+    keys = [summary_key(1, date(2025, 1, 1).replace(day=1 + i % 28)) + f"-{i}" for i in range(1000)]
+    invalidation.publish(cursor, keys=keys, clear=["summary:"])
+    
+    events = [json.loads(payload) for payload in cursor.payloads]
+    assert len(events) > 1
+    assert all(len(payload.encode("utf-8")) < 8000 for payload in cursor.payloads)
+    assert sum(len(event["keys"]) for event in events) == len(keys)
+    assert events[0]["clear"] == ["summary:"] and events[0]["sender"] == invalidation.sender_id()
+    print(f"   ✅ 키 {len(keys)}개를 이벤트 {len(events)}개로 분할 발행")
+    
+    received = []
+    invalidation.subscribe(received.append)
+    try:
+        cache.set(profile_key(7), make_profile())
+        invalidation.apply({"keys": [profile_key(7)]})
+        assert cache.get(profile_key(7), UserProfile) is None and received
+    finally:
+        invalidation.unsubscribe(received.append)
+    print("   ✅ 수신 이벤트로 캐시 키 삭제 및 등록된 처리 함수 호출")
+
+def test_stale_fill_rejected():
+    """조회 전 세대 이후 무효화된 키/네임스페이스는 채우지 않는지 확인"""
+    print("🔍 무효화와 엇갈린 캐시 채우기 확인")
+    cache = ModelCache(LocalCache())
+    today = date(2025, 1, 2)
+    
+    generation = cache.generation()
+    cache.delete(day_version_key(1, today))
+    cache.set(day_version_key(1, today), "old", generation=generation)
+    cache.set(day_version_key(2, today), "other", generation=generation)
+    assert cache.get(day_version_key(1, today)) is None
+    assert cache.get(day_version_key(2, today)) == "other"
+    
+    generation = cache.generation()
+    cache.clear("summary:")
+    cache.set(summary_key(2, today), make_summary(today), generation=generation)
+    assert cache.get(summary_key(2, today), MealSummary) is None
+    
+    # 무효화 이후 시작한 조회는 정상 저장
+    cache.set(day_version_key(1, today), "new", generation=cache.generation())
+    assert cache.get(day_version_key(1, today)) == "new"
+    
+    # 기록이 넘쳐 잊은 무효화 이전에 시작한 조회는 저장하지 않음
+    cache.MAX_TRACKED_INVALIDATIONS = 1
+    generation = cache.generation()
+    cache.delete("a")
+    cache.delete("b")
+    cache.set("a", 1, generation=generation)
+    assert cache.get("a") is None and cache.stats()["stale_fills"] == 3
+    print("   ✅ 조회 중 무효화된 키는 저장하지 않음")
+
+def test_day_version_race():
+    """버전 조회와 식사 추가 커밋이 엇갈려도 이전 버전이 캐시에 남지 않는지 확인"""
+    print("🔍 ETag 버전 조회/쓰기 경합 확인")
+    from meals_service import meals_service
+    today = date(2025, 1, 2)
+    key = day_version_key(1, today)
+    versions = [datetime(2025, 1, 2, 9, 0), datetime(2025, 1, 2, 9, 5)]
+    
+    class RacingCursor:
+        """이전 행을 읽은 직후 다른 요청의 쓰기가 커밋되어 무효화되는 상황"""
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *args):
+            return False
+        
+        def execute(self, query, params):
+            self.row = {"updated_at": versions[0], "total_meals": 1}
+            versions.pop(0)
+            invalidation.apply({"keys": [key]})
+        
+        def fetchone(self):
+            return self.row
+    
+    class RacingDb:
+        @contextmanager
+        def get_connection(self):
+            class Connection:
+                def cursor(self):
+                    return RacingCursor()
+            yield Connection()
+    
+    original = meals_service.db
+    meals_service.db = RacingDb()
+    try:
+        cache.delete(key)
+        assert meals_service.get_day_version(1, today).startswith("2025-01-02T09:00:00")
+        # 캐시에 이전 버전이 남았다면 두 번째 조회가 데이터베이스를 읽지 않음
+        assert meals_service.get_day_version(1, today).startswith("2025-01-02T09:05:00")
+        assert not versions
+    finally:
+        meals_service.db = original
+        cache.delete(key)
+    print("   ✅ 조회 중 커밋된 변경 이후 이전 버전을 캐시하지 않음")
+
+if __name__ == "__main__":
+    test_local_backend()
+    test_local_expiry()
+    test_redis_backend()
+    test_backend_failure()
+    test_invalidation_events()
+    test_stale_fill_rejected()
+    test_day_version_race()
+    print("🎉 캐시 테스트 완료!")
@@ -0,0 +1,77 @@
+"""
+모듈 import 시간 테스트 스크립트
+OCR 외 모듈을 불러올 때 OpenCV/NumPy/PIL/requests 가 함께 로드되지 않는지,
+import 시간이 예산 안에 드는지 `python -X importtime` 으로 확인합니다.
+
+예산은 IMPORT_BUDGET_MS 환경 변수로 바꿀 수 있습니다 (기본 300ms).
+pytest 로 실행하면 모듈마다 따로 테스트합니다.
+"""
+
+import sys
+import os
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "300"))
+
+# 이미지 처리 시점에만 불러와야 하는 무거운 패키지
+HEAVY_MODULES = ("cv2", "numpy", "PIL", "requests")
+
+# 어느 모듈이든 쓰는 외부 패키지는 미리 불러와서 측정 대상에서 뺌
+BASELINE_IMPORTS = "import fastapi, pydantic, psycopg2, psycopg2.extras, orjson, dotenv"
+
+MODULES = [
+    "config",
+    "database",
+    "cache",
+    "invalidation",
+    "meals_service",
+    "user_service",
+    "reference_data",
+    "nutrition_service",
+    "auth",
+    "api_routes",
+]
+
+try:
+    import pytest
+    parametrize_modules = pytest.mark.parametrize("module", MODULES)
+except ImportError:
+    # 스크립트로 실행할 때는 pytest 없이도 동작
+    parametrize_modules = lambda func: func
+
+def measure_import(module):
+    """모듈 import 시 로드된 모듈별 누적 시간(us) 반환"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{BASELINE_IMPORTS}\nimport {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+    
+    # 형식: "import time: self [us] | cumulative | imported package"
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+@parametrize_modules
+def test_module_import(module):
+    """무거운 패키지가 로드되지 않고 예산 안에 드는지 확인"""
+    timings = measure_import(module)
+    loaded = sorted({name for name in timings if name.split(".")[0] in HEAVY_MODULES})
+    assert not loaded, f"{module} import 시 로드됨: {', '.join(loaded)}"
+    
+    elapsed_ms = timings.get(module, 0) / 1000
+    assert elapsed_ms < BUDGET_MS, f"{module} import {elapsed_ms:.1f}ms (예산 {BUDGET_MS:.0f}ms)"
+    print(f"   ✅ {module}: {elapsed_ms:.1f}ms")
+
+if __name__ == "__main__":
+    print(f"🔍 모듈 import 시간 확인 (예산 {BUDGET_MS:.0f}ms)")
+    for module in MODULES:
+        test_module_import(module)
+    print("🎉 import 시간 테스트 완료!")
@@ -0,0 +1,53 @@
+"""
+메트릭 테스트 스크립트
+운영 모드에서 워커별 파일로 기록한 메트릭이 /metrics 응답에 합산되는지 확인합니다.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from metrics import CallbackMetric, Counter, Histogram, MultiprocessStore, Registry
+
+def make_registry():
+    """워커마다 같은 메트릭 정의를 가진 레지스트리 (fork 한 워커와 같은 상황)"""
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "요청 수", ("route",)))
+    latency = registry.register(Histogram("latency_seconds", "처리 시간", buckets=(0.1, 1.0)))
+    active = {"value": 0}
+    registry.register(CallbackMetric("active", "처리 중", lambda: active["value"]))
+    return registry, requests, latency, active
+
+def test_multiprocess_merge():
+    """살아 있는 워커와 종료한 워커의 카운터/히스토그램은 합산, 게이지는 살아 있는 워커만 worker 레이블로 출력"""
+    print("🔍 워커 간 메트릭 합산 확인")
+    with tempfile.TemporaryDirectory() as directory:
+        # 다른 워커 두 개 (하나는 종료)
+        for pid, count in ((111, 2), (222, 3)):
+            registry, requests, latency, active = make_registry()
+            requests.inc(count, route="/ocr/upload")
+            latency.observe(0.5)
+            active["value"] = 1
+            MultiprocessStore(directory, registry)._write(f"{pid}.json", registry.snapshot())
+        
+        registry, requests, latency, active = make_registry()
+        store = MultiprocessStore(directory, registry)
+        store.mark_dead(222)
+        assert not os.path.exists(os.path.join(directory, "222.json"))
+        
+        # 현재 워커
+        requests.inc(route="/ocr/upload")
+        latency.observe(2.0)
+        active["value"] = 2
+        output = store.render()
+    
+    assert 'requests_total{route="/ocr/upload"} 6' in output, output
+    assert 'latency_seconds_bucket{le="1"} 2' in output and "latency_seconds_count 3" in output, output
+    assert 'active{worker="111"} 1' in output and f'active{{worker="{os.getpid()}"}} 2' in output, output
+    assert 'worker="222"' not in output and "dead" not in output, output
+    print("   ✅ 카운터/히스토그램 합산 (종료한 워커 포함), 게이지는 워커별")
+
+if __name__ == "__main__":
+    test_multiprocess_merge()
+    print("🎉 메트릭 테스트 완료!")
@@ -0,0 +1,199 @@
+"""
+OCR 비동기 작업 테스트 스크립트
+작업 저장소를 메모리 가짜 저장소로 바꿔 워커 처리와 SSE 이벤트 순서를 확인합니다.
+(작업 변경 알림은 리스너 대신 가짜 저장소가 직접 보냄)
+"""
+
+import sys
+import os
+import copy
+import json
+import uuid
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import ocr_jobs
+from api_routes import process_ocr_upload
+
+SAMPLE_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "KakaoTalk_20250912_181150961.jpg")
+
+class FakeJobStore:
+    """OCRJobStore의 메서드를 흉내 내는 메모리 저장소"""
+    
+    def __init__(self):
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.stage_connections = 0
+    
+    def ensure_table(self):
+        pass
+    
+    def create(self, image, content_type, params):
+        job_id = str(uuid.uuid4())
+        self.jobs[job_id] = {
+            "id": job_id, "status": "queued", "stage": None, "stages": [], "params": params,
+            "content_type": content_type, "image": image, "result": None, "error": None, "attempts": 0
+        }
+        return job_id
+    
+    def get(self, job_id):
+        with self.lock:
+            job = copy.deepcopy(self.jobs.get(job_id))
+        if job:
+            job.pop("image")
+        return job
+    
+    def claim(self, worker, lease_seconds, max_attempts):
+        with self.lock:
+            for job in self.jobs.values():
+                if job["status"] == "queued":
+                    job["status"] = "running"
+                    job["attempts"] += 1
+                    job["stage"], job["stages"] = None, []
+                    ocr_jobs.job_watchers.wake(job["id"])
+                    return dict(job)
+        return None
+    
+    @contextmanager
+    def stage_recorder(self, job_id, lease_seconds):
+        self.stage_connections += 1
+        
+        def record(stage):
+            with self.lock:
+                self.jobs[job_id]["stages"].append(stage)
+                self.jobs[job_id]["stage"] = stage["stage"]
+            ocr_jobs.job_watchers.wake(job_id)
+        
+        yield record
+    
+    def renew_lease(self, job_id, lease_seconds):
+        with self.lock:
+            self.jobs[job_id]["renewed"] = self.jobs[job_id].get("renewed", 0) + 1
+    
+    def requeue(self, job_id):
+        with self.lock:
+            self.jobs[job_id]["status"] = "queued"
+            self.jobs[job_id]["attempts"] -= 1
+    
+    def finish(self, job_id, status, result, error):
+        with self.lock:
+            self.jobs[job_id].update(status=status, result=result, error=error, image=None)
+        ocr_jobs.job_watchers.wake(job_id)
+    
+    def purge(self, retention_hours):
+        return 0
+
+async def collect_events(job_id):
+    """작업이 끝날 때까지 SSE 이벤트 이름과 내용 수집"""
+    async def is_disconnected():
+        return False
+    
+    events = []
+    async for chunk in ocr_jobs.job_events(job_id, is_disconnected):
+        lines = chunk.decode("utf-8").split("\n")
+        events.append((lines[0][len("event: "):], lines[1][len("data: "):]))
+    return events
+
+def test_job_processing():
+    """등록한 작업이 처리되고 단계별 이벤트 후 done 이벤트로 끝나는지 확인"""
+    print("🔍 OCR 작업 처리 확인")
+    store = FakeJobStore()
+    ocr_jobs.ocr_job_store = store
+    runner = ocr_jobs.OCRJobRunner(store)
+    
+    with open(SAMPLE_IMAGE, "rb") as image_file:
+        job_id = store.create(image_file.read(), "image/jpeg", {"use_roi": True, "roi_bbox": "0,0,300,300", "trace": True})
+    
+    runner.start(process_ocr_upload)
+    started = time.monotonic()
+    try:
+        events = asyncio.run(collect_events(job_id))
+    finally:
+        runner.stop()
+    # 주기적인 조회(15초)를 기다리지 않고 알림으로 바로 전송
+    assert time.monotonic() - started < 10
+    
+    names = [name for name, _ in events]
+    assert names[-1] == "done", names
+    assert "stage" in names and names.index("stage") < names.index("done")
+    print(f"   ✅ 이벤트 순서: {' → '.join(names)}")
+    
+    job = store.get(job_id)
+    assert job["status"] == "succeeded" and job["result"]["success"]
+    assert [stage["stage"] for stage in job["stages"]] == ["upload_encode", "decode", "encode"]
+    assert store.jobs[job_id]["image"] is None
+    # 단계마다 새로 연결하지 않고 작업 하나에 연결 하나
+    assert store.stage_connections == 1
+    print("   ✅ 결과 저장, 단계 기록 (연결 1개), 이미지 삭제")
+
+def test_retried_job_stages():
+    """다시 처리하는 작업은 이전 시도의 단계를 비우고 SSE로도 새 시도의 단계만 보내는지 확인"""
+    print("🔍 재처리 작업 단계 기록 확인")
+    store = FakeJobStore()
+    ocr_jobs.ocr_job_store = store
+    runner = ocr_jobs.OCRJobRunner(store)
+    
+    with open(SAMPLE_IMAGE, "rb") as image_file:
+        job_id = store.create(image_file.read(), "image/jpeg", {"use_roi": True, "roi_bbox": "0,0,300,300"})
+    # 첫 시도가 decode 후 중단된 상황 (임대 시간이 지나 다시 처리 대상이 됨)
+    store.jobs[job_id].update(attempts=1, stage="decode", stages=[{"stage": "decode", "duration_ms": 1.0, "attempt": 1}])
+    
+    runner.start(process_ocr_upload)
+    try:
+        events = asyncio.run(collect_events(job_id))
+    finally:
+        runner.stop()
+    
+    job = store.get(job_id)
+    assert job["status"] == "succeeded" and job["attempts"] == 2
+    assert [(stage["stage"], stage["attempt"]) for stage in job["stages"]] == [("upload_encode", 2), ("decode", 2), ("encode", 2)]
+    sent = [json.loads(data) for name, data in events if name == "stage"]
+    assert sent[-3:] == job["stages"], sent
+    print(f"   ✅ 이전 시도 단계 제거, SSE 단계 {len(sent)}개 (마지막 시도 {len(job['stages'])}개)")
+
+def test_job_admission():
+    """처리 예산이 없으면 요청 대기열을 쓰지 않고 기다리며 임대 시간을 연장하고, 너무 큰 이미지만 실패 처리하는지 확인"""
+    print("🔍 OCR 작업 처리 예산 확인")
+    from admission import AdmissionController
+    
+    admission = AdmissionController(max_concurrent=1, budget_bytes=1 << 30, max_waiting=0, timeout=1)
+    original_admission, original_lease = ocr_jobs.ocr_admission, ocr_jobs.config.OCR_JOB_LEASE_SECONDS
+    ocr_jobs.ocr_admission = admission
+    ocr_jobs.config.OCR_JOB_LEASE_SECONDS = 3
+    store = FakeJobStore()
+    runner = ocr_jobs.OCRJobRunner(store)
+    runner.process = lambda *args: {"success": True}
+    try:
+        # 다른 처리가 예산을 모두 쓰는 동안 (HTTP 대기열 0 이어도 queue_full 로 실패하지 않음)
+        admission.acquire(1)
+        job_id = store.create(b"image", "image/jpeg", {})
+        worker = threading.Thread(target=runner._execute, args=(store.claim("w", 120, 3),))
+        worker.start()
+        worker.join(timeout=1.5)
+        assert worker.is_alive() and store.jobs[job_id]["status"] == "running"
+        assert admission.waiting == 0
+        
+        # 워커 종료 시 작업은 대기 상태로 되돌아감 (시도 횟수 유지)
+        runner._stop.set()
+        worker.join(timeout=3)
+        job = store.jobs[job_id]
+        assert job["status"] == "queued" and job["attempts"] == 0 and job["renewed"] >= 1, job
+        print(f"   ✅ 대기 중 임대 연장 {job['renewed']}회, 종료 시 대기열로 반환")
+        admission.release(1)
+        
+        # 예산보다 큰 이미지는 실패 처리
+        admission.budget_bytes = 10
+        runner._execute(store.claim("w", 120, 3))
+        assert store.jobs[job_id]["status"] == "failed" and "너무 커서" in store.jobs[job_id]["error"]
+        print("   ✅ 너무 큰 이미지는 실패 처리")
+    finally:
+        ocr_jobs.ocr_admission, ocr_jobs.config.OCR_JOB_LEASE_SECONDS = original_admission, original_lease
+
+if __name__ == "__main__":
+    test_job_processing()
+    test_retried_job_stages()
+    test_job_admission()
+    print("🎉 OCR 작업 테스트 완료!")
@@ -0,0 +1,51 @@
+"""
+요청 프로파일링 테스트 스크립트
+프로파일링한 요청의 결과에 OCR 스레드 풀에서 실행한 이미지 처리 스택이 포함되는지 확인합니다.
+"""
+
+import sys
+import os
+import base64
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config import config
+from clova_ocr import get_ocr_engine, run_ocr
+from profiling import ProfilingMiddleware
+
+SAMPLE_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "KakaoTalk_20250912_181150961.jpg")
+
+def test_profiled_ocr_request_samples_ocr_thread():
+    """OCR 스레드에서 실행한 ROI 처리(roi_processor) 스택이 요청 프로파일에 포함되는지 확인"""
+    print("🔍 OCR 요청 프로파일링 확인")
+    with open(SAMPLE_IMAGE, "rb") as image_file:
+        image_base64 = base64.b64encode(image_file.read()).decode("utf-8")
+
+    app = FastAPI()
+
+    @app.post("/ocr/roi")
+    async def roi():
+        result = await run_ocr(get_ocr_engine().roi_processor.process_image_with_roi, image_base64)
+        return {"success": result["success"]}
+
+    original = config.PROFILE_ROUTES, config.PROFILE_INTERVAL_MS
+    config.PROFILE_ROUTES, config.PROFILE_INTERVAL_MS = "/ocr/*", 1
+    try:
+        middleware = ProfilingMiddleware(app)
+    finally:
+        config.PROFILE_ROUTES, config.PROFILE_INTERVAL_MS = original
+
+    profiles = []
+    middleware._save = lambda method, route, duration_ms, folded: profiles.append(folded)
+    response = TestClient(middleware).post("/ocr/roi")
+
+    assert response.status_code == 200 and response.json()["success"]
+    assert len(profiles) == 1
+    stacks = [line for line in profiles[0].splitlines() if "roi_processor." in line]
+    assert stacks, profiles[0]
+    print(f"   ✅ roi_processor 스택 {sum(int(line.rsplit(' ', 1)[1]) for line in stacks)}개 샘플")
+
+if __name__ == "__main__":
+    test_profiled_ocr_request_samples_ocr_thread()
+    print("🎉 프로파일링 테스트 완료!")
@@ -0,0 +1,64 @@
+"""
+OCR 처리 단계 추적 테스트 스크립트
+업로드 OCR 경로별로 base64 인코딩과 ROI 처리 단계가 추적 결과에 포함되는지 확인합니다.
+(클로바 OCR API 호출은 가짜 세션으로 대신함)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import config
+from clova_ocr import get_ocr_engine
+from api_routes import process_ocr_upload
+
+SAMPLE_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "KakaoTalk_20250912_181150961.jpg")
+
+class FakeResponse:
+    status_code = 200
+    content = b'{"images": []}'
+    text = '{"images": []}'
+    
+    def json(self):
+        return {"images": [{"fields": [{"inferText": "나트륨 100mg"}]}]}
+
+class FakeSession:
+    """클로바 OCR 요청 대신 고정 응답을 돌려주는 세션"""
+    def post(self, url, headers=None, json=None):
+        return FakeResponse()
+
+def traced_stages(use_roi, roi_bbox):
+    """가짜 OCR API로 업로드 처리 후 추적된 단계 이름 목록 반환"""
+    with open(SAMPLE_IMAGE, "rb") as image_file:
+        contents = image_file.read()
+    
+    # is_api_configured는 클래스 속성을 확인하므로 클래스에 설정
+    settings = type(config)
+    engine = get_ocr_engine()
+    original = settings.CLOVA_OCR_API_URL, settings.CLOVA_OCR_SECRET_KEY, engine.session
+    settings.CLOVA_OCR_API_URL, settings.CLOVA_OCR_SECRET_KEY = "https://ocr.example.com", "test-key"
+    engine.session = FakeSession()
+    try:
+        result = process_ocr_upload(contents, "image/jpeg", use_roi, roi_bbox, True)
+    finally:
+        settings.CLOVA_OCR_API_URL, settings.CLOVA_OCR_SECRET_KEY, engine.session = original
+    
+    assert result["success"], result
+    return [stage["stage"] for stage in result["model_info"]["trace"]["stages"]]
+
+def test_upload_trace_stages():
+    """자동 ROI, 사용자 지정 ROI, ROI 미사용 경로의 추적 단계 확인"""
+    print("🔍 업로드 OCR 경로별 추적 단계 확인")
+    paths = {
+        "자동 ROI": (True, None, ["upload_encode", "decode", "roi_detect", "preprocess", "encode", "clova_call", "parse"]),
+        "사용자 지정 ROI": (True, "0,0,300,300", ["upload_encode", "decode", "encode", "clova_call", "parse"]),
+        "ROI 미사용": (False, None, ["upload_encode", "clova_call", "parse"]),
+    }
+    for name, (use_roi, roi_bbox, expected) in paths.items():
+        stages = traced_stages(use_roi, roi_bbox)
+        assert stages == expected, (name, stages)
+        print(f"   ✅ {name}: {' → '.join(stages)}")
+
+if __name__ == "__main__":
+    test_upload_trace_stages()
+    print("🎉 추적 테스트 완료!")
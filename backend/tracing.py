@@ -0,0 +1,291 @@
+"""
+OCR 처리 추적 모듈
+OCR 요청 한 건을 단계별 구간(span)으로 기록하여 어느 단계가 느렸는지 확인할 수 있게 합니다.
+
+- ?trace=true 로 요청하면 단계별 시간/바이트 크기를 응답의 model_info.trace 에 포함
+- OCR_TRACE_FILE 을 지정하면 추적 결과를 OTLP JSON 형식(한 줄에 하나)으로 파일에 기록
+  (OpenTelemetry Collector의 otlpjsonfile 수신기 등으로 읽을 수 있음)
+
+사용 예:
+    with start_trace("ocr.upload", requested=True) as trace:
+        with ocr_stage("decode") as span:
+            ...
+            span.set("bytes_out", len(image_bytes))
+"""
+
+import atexit
+import contextvars
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+import orjson
+from config import config
+from logger import get_logger
+from metrics import OCR_STAGE_LATENCY
+
+logger = get_logger(__name__)
+
+# 현재 요청의 추적 정보 (추적하지 않는 요청은 None)
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("ocr_trace", default=None)
+
+# 단계가 끝날 때마다 호출할 함수 (OCR 작업 진행 상황 기록용, 없으면 None)
+_stage_listener: contextvars.ContextVar = contextvars.ContextVar("ocr_stage_listener", default=None)
+
+# OTLP span kind / status 코드
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_ERROR = 2
+
+
+class Span:
+    """추적 구간 (이름, 시작/종료 시각, 속성)"""
+    
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = trace.now_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+    
+    def set(self, key: str, value: Any) -> None:
+        """속성 추가 (바이트 크기, 이미지 크기 등)"""
+        self.attributes[key] = value
+    
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = self.trace.now_ns()
+    
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else self.trace.now_ns()
+        return round((end_ns - self.start_ns) / 1e6, 3)
+
+
+class _NoopSpan:
+    """추적하지 않는 요청에서 사용하는 빈 구간"""
+    
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """요청 한 건의 추적 정보 (루트 구간 + 단계별 구간)"""
+    
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.trace_id = os.urandom(16).hex()
+        # 시각은 단조 시계로 재고 벽시계 기준점에 더함 (시계 조정에 영향받지 않도록)
+        self._origin_wall_ns = time.time_ns()
+        self._origin_perf_ns = time.perf_counter_ns()
+        self.root = Span(self, name, None, attributes)
+        self.spans: List[Span] = []
+    
+    def now_ns(self) -> int:
+        return self._origin_wall_ns + (time.perf_counter_ns() - self._origin_perf_ns)
+    
+    def start_span(self, name: str) -> Span:
+        span = Span(self, name, self.root.span_id, {})
+        self.spans.append(span)
+        return span
+    
+    def summary(self) -> Dict[str, Any]:
+        """응답에 포함할 단계별 시간/크기 요약"""
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": self.root.duration_ms(),
+            "stages": [
+                {"stage": span.name, "duration_ms": span.duration_ms(), **span.attributes}
+                for span in self.spans
+            ]
+        }
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP JSON (ExportTraceServiceRequest) 형식으로 변환"""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": config.OCR_TRACE_SERVICE_NAME})},
+                "scopeSpans": [{
+                    "scope": {"name": "kiumbapsang.ocr"},
+                    "spans": [self._otlp_span(span) for span in [self.root] + self.spans]
+                }]
+            }]
+        }
+    
+    def _otlp_span(self, span: Span) -> Dict[str, Any]:
+        data = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": SPAN_KIND_SERVER if span is self.root else SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns if span.end_ns is not None else span.start_ns),
+            "attributes": _otlp_attributes(span.attributes)
+        }
+        if span.parent_id:
+            data["parentSpanId"] = span.parent_id
+        if span.error:
+            data["status"] = {"code": STATUS_ERROR, "message": span.error}
+        return data
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """속성을 OTLP AnyValue 목록으로 변환"""
+    result = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            any_value = {"boolValue": value}
+        elif isinstance(value, int):
+            any_value = {"intValue": str(value)}
+        elif isinstance(value, float):
+            any_value = {"doubleValue": value}
+        elif isinstance(value, (list, tuple)):
+            any_value = {"stringValue": ",".join(str(item) for item in value)}
+        else:
+            any_value = {"stringValue": str(value)}
+        result.append({"key": key, "value": any_value})
+    return result
+
+
+class FileSpanExporter:
+    """
+    추적 결과를 파일에 기록하는 내보내기 (OTLP JSON Lines)
+    
+    요청 처리 스레드는 큐에 넣기만 하고 백그라운드 스레드가 파일에 씁니다.
+    """
+    
+    def __init__(self, path: str, queue_size: int = 1000):
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+    
+    def export(self, trace: Trace) -> None:
+        if not self.enabled:
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+    
+    def flush(self) -> None:
+        """큐에 남은 추적 결과를 모두 기록"""
+        self._write_pending(block=False)
+    
+    def _ensure_thread(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="ocr-trace-exporter", daemon=True)
+            self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            self._write_pending(block=True)
+    
+    def _write_pending(self, block: bool) -> None:
+        traces = []
+        try:
+            traces.append(self._queue.get(block=block))
+            while True:
+                traces.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not traces:
+            return
+        
+        try:
+            with self._lock, open(self.path, "ab") as output:
+                for trace in traces:
+                    output.write(orjson.dumps(trace.to_otlp()) + b"\n")
+        except Exception as e:
+            logger.warning("OCR 추적 기록 실패: %s", e, extra={"path": self.path})
+
+
+# 전역 추적 내보내기 인스턴스
+exporter = FileSpanExporter(config.OCR_TRACE_FILE)
+atexit.register(exporter.flush)
+
+
+@contextmanager
+def start_trace(name: str, requested: bool = False, **attributes):
+    """
+    요청 추적 시작
+    
+    requested(?trace=true)이거나 파일 내보내기가 켜져 있고 샘플링된 경우에만 추적하며,
+    추적하지 않으면 None을 돌려주고 ocr_stage는 메트릭만 기록합니다.
+    """
+    sampled = exporter.enabled and random.random() < config.OCR_TRACE_SAMPLE_RATE
+    if not (requested or sampled):
+        yield None
+        return
+    
+    trace = Trace(name, attributes)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except Exception as e:
+        trace.root.error = str(e)
+        raise
+    finally:
+        _current_trace.reset(token)
+        trace.root.end()
+        exporter.export(trace)
+
+
+@contextmanager
+def ocr_stage(stage: str):
+    """
+    OCR 처리 단계 시간 기록 (upload_encode, decode, roi_detect, preprocess, encode, clova_call, parse)
+    
+    항상 메트릭 히스토그램에 기록하고, 추적 중인 요청이면 구간도 추가합니다.
+    """
+    trace = _current_trace.get()
+    span = trace.start_span(stage) if trace else NOOP_SPAN
+    start = time.perf_counter()
+    error = None
+    try:
+        yield span
+    except Exception as e:
+        error = str(e)
+        if trace:
+            span.error = error
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        OCR_STAGE_LATENCY.observe(elapsed, stage=stage)
+        if trace:
+            span.end()
+        listener = _stage_listener.get()
+        if listener:
+            try:
+                listener(stage, round(elapsed * 1000, 3), error)
+            except Exception as e:
+                logger.warning("OCR 단계 알림 처리 실패: %s", e, extra={"stage": stage})
+
+
+@contextmanager
+def stage_listener(callback: Callable[[str, float, Optional[str]], None]):
+    """블록 안에서 OCR 단계가 끝날 때마다 callback(단계, 소요 시간(ms), 오류 메시지) 호출"""
+    token = _stage_listener.set(callback)
+    try:
+        yield
+    finally:
+        _stage_listener.reset(token)
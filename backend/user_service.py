@@ -2,29 +2,46 @@
 사용자 프로필 관련 비즈니스 로직
 """
 from datetime import datetime, date
-from typing import Optional
+from typing import List, Optional
 from database import db
+from cache import cache, profile_key, profile_google_key
+import invalidation
 from user_models import UserProfile, UserProfileCreate, UserProfileUpdate
 import psycopg2
 
+# 프로필 조회/반환에 사용하는 컬럼 목록
+PROFILE_COLUMNS = """
+    id, google_id, email, username, age, birth, height, weight,
+    address, protector_name, protector_phone, protector_relationship,
+    created_at, updated_at
+"""
+
+# 수정 가능한 프로필 필드
+UPDATABLE_PROFILE_FIELDS = [
+    'username', 'age', 'birth', 'height', 'weight', 'address',
+    'protector_name', 'protector_phone', 'protector_relationship'
+]
+
 class UserService:
     """사용자 서비스 클래스"""
     
     def __init__(self):
         self.db = db
     
-    def create_user_profile(self, profile_data: UserProfileCreate) -> UserProfile:
-        """사용자 프로필 생성"""
+    def create_user_profile(self, profile_data: UserProfileCreate) -> Optional[UserProfile]:
+        """사용자 프로필 생성 (같은 구글 ID가 이미 있으면 None 반환)"""
         try:
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("""
+                    cursor.execute(f"""
                         INSERT INTO user_profiles (
-                            google_id, email, username, age, birth, height, weight, 
+                            google_id, email, username, age, birth, height, weight,
                             address, protector_name, protector_phone, protector_relationship
                         ) VALUES (
                             %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                        ) RETURNING id, created_at, updated_at
+                        )
+                        ON CONFLICT (google_id) DO NOTHING
+                        RETURNING {PROFILE_COLUMNS}
                     """, (
                         profile_data.google_id,
                         profile_data.email,
@@ -40,165 +57,92 @@ class UserService:
                     ))
                     
                     result = cursor.fetchone()
-                    profile_id = result['id']
-                    created_at = result['created_at']
-                    updated_at = result['updated_at']
-                    
                     conn.commit()
                     
-                    return UserProfile(
-                        id=profile_id,
-                        google_id=profile_data.google_id,
-                        email=profile_data.email,
-                        username=profile_data.username,
-                        age=profile_data.age,
-                        birth=profile_data.birth,
-                        height=profile_data.height,
-                        weight=profile_data.weight,
-                        address=profile_data.address,
-                        protector_name=profile_data.protector_name,
-                        protector_phone=profile_data.protector_phone,
-                        protector_relationship=profile_data.protector_relationship,
-                        created_at=created_at,
-                        updated_at=updated_at
-                    )
+                    return self._dict_to_profile(result) if result else None
         except Exception as e:
             raise Exception(f"사용자 프로필 생성 실패: {str(e)}")
     
     def get_user_profile_by_google_id(self, google_id: str) -> Optional[UserProfile]:
-        """구글 ID로 사용자 프로필 조회"""
+        """구글 ID로 사용자 프로필 조회 (로그인마다 호출되므로 캐시 우선)"""
+        cached = cache.get(profile_google_key(google_id), UserProfile)
+        if cached:
+            return cached
+        
+        generation = cache.generation()
         try:
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT id, google_id, email, username, age, birth, height, weight,
-                               address, protector_name, protector_phone, protector_relationship,
-                               created_at, updated_at
-                        FROM user_profiles 
+                    cursor.execute(f"""
+                        SELECT {PROFILE_COLUMNS}
+                        FROM user_profiles
                         WHERE google_id = %s
                     """, (google_id,))
                     
                     result = cursor.fetchone()
-                    if not result:
-                        return None
-                    
-                    return UserProfile(
-                        id=result['id'],
-                        google_id=result['google_id'],
-                        email=result['email'],
-                        username=result['username'],
-                        age=result['age'],
-                        birth=result['birth'],
-                        height=result['height'],
-                        weight=result['weight'],
-                        address=result['address'],
-                        protector_name=result['protector_name'],
-                        protector_phone=result['protector_phone'],
-                        protector_relationship=result['protector_relationship'],
-                        created_at=result['created_at'],
-                        updated_at=result['updated_at']
-                    )
+            
+            return self._cache_profile(result, generation) if result else None
         except Exception as e:
             raise Exception(f"사용자 프로필 조회 실패: {str(e)}")
     
     def get_user_profile_by_id(self, user_id: int) -> Optional[UserProfile]:
-        """ID로 사용자 프로필 조회"""
+        """ID로 사용자 프로필 조회 (캐시 우선)"""
+        cached = cache.get(profile_key(user_id), UserProfile)
+        if cached:
+            return cached
+        
+        generation = cache.generation()
         try:
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT id, google_id, email, username, age, birth, height, weight,
-                               address, protector_name, protector_phone, protector_relationship,
-                               created_at, updated_at
-                        FROM user_profiles 
+                    cursor.execute(f"""
+                        SELECT {PROFILE_COLUMNS}
+                        FROM user_profiles
                         WHERE id = %s
                     """, (user_id,))
                     
                     result = cursor.fetchone()
-                    if not result:
-                        return None
-                    
-                    return UserProfile(
-                        id=result['id'],
-                        google_id=result['google_id'],
-                        email=result['email'],
-                        username=result['username'],
-                        age=result['age'],
-                        birth=result['birth'],
-                        height=result['height'],
-                        weight=result['weight'],
-                        address=result['address'],
-                        protector_name=result['protector_name'],
-                        protector_phone=result['protector_phone'],
-                        protector_relationship=result['protector_relationship'],
-                        created_at=result['created_at'],
-                        updated_at=result['updated_at']
-                    )
+            
+            return self._cache_profile(result, generation) if result else None
         except Exception as e:
             raise Exception(f"사용자 프로필 조회 실패: {str(e)}")
     
-    def update_user_profile(self, user_id: int, profile_data: UserProfileUpdate) -> UserProfile:
-        """사용자 프로필 수정"""
+    def update_user_profile(self, user_id: int, profile_data: UserProfileUpdate) -> Optional[UserProfile]:
+        """사용자 프로필 수정 (수정된 프로필을 같은 쿼리에서 반환)"""
         try:
+            # 업데이트할 필드들 동적 생성
+            update_fields = []
+            values = []
+            
+            for field in UPDATABLE_PROFILE_FIELDS:
+                value = getattr(profile_data, field)
+                if value is not None:
+                    update_fields.append(f"{field} = %s")
+                    values.append(value)
+            
+            if not update_fields:
+                raise Exception("수정할 필드가 없습니다")
+            
+            # updated_at 필드 추가
+            update_fields.append("updated_at = CURRENT_TIMESTAMP")
+            values.append(user_id)
+            
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    # 업데이트할 필드들 동적 생성
-                    update_fields = []
-                    values = []
-                    
-                    if profile_data.username is not None:
-                        update_fields.append("username = %s")
-                        values.append(profile_data.username)
-                    
-                    if profile_data.age is not None:
-                        update_fields.append("age = %s")
-                        values.append(profile_data.age)
-                    
-                    if profile_data.birth is not None:
-                        update_fields.append("birth = %s")
-                        values.append(profile_data.birth)
-                    
-                    if profile_data.height is not None:
-                        update_fields.append("height = %s")
-                        values.append(profile_data.height)
-                    
-                    if profile_data.weight is not None:
-                        update_fields.append("weight = %s")
-                        values.append(profile_data.weight)
-                    
-                    if profile_data.address is not None:
-                        update_fields.append("address = %s")
-                        values.append(profile_data.address)
-                    
-                    if profile_data.protector_name is not None:
-                        update_fields.append("protector_name = %s")
-                        values.append(profile_data.protector_name)
-                    
-                    if profile_data.protector_phone is not None:
-                        update_fields.append("protector_phone = %s")
-                        values.append(profile_data.protector_phone)
-                    
-                    if profile_data.protector_relationship is not None:
-                        update_fields.append("protector_relationship = %s")
-                        values.append(profile_data.protector_relationship)
-                    
-                    if not update_fields:
-                        raise Exception("수정할 필드가 없습니다")
-                    
-                    # updated_at 필드 추가
-                    update_fields.append("updated_at = CURRENT_TIMESTAMP")
-                    values.append(user_id)
-                    
                     cursor.execute(f"""
-                        UPDATE user_profiles 
+                        UPDATE user_profiles
                         SET {', '.join(update_fields)}
                         WHERE id = %s
+                        RETURNING {PROFILE_COLUMNS}
                     """, values)
                     
-                    conn.commit()
+                    result = cursor.fetchone()
+                    if not result:
+                        conn.commit()
+                        return None
                     
-                    # 수정된 프로필 조회
-                    return self.get_user_profile_by_id(user_id)
+                    invalidation.commit(conn, cursor, keys=self.profile_cache_keys(user_id, result['google_id']))
+                    return self._dict_to_profile(result)
         except Exception as e:
             raise Exception(f"사용자 프로필 수정 실패: {str(e)}")
     
@@ -207,16 +151,48 @@ class UserService:
         try:
             with self.db.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("DELETE FROM user_profiles WHERE id = %s", (user_id,))
+                    cursor.execute(
+                        "DELETE FROM user_profiles WHERE id = %s RETURNING google_id", (user_id,)
+                    )
                     
-                    if cursor.rowcount == 0:
+                    deleted = cursor.fetchone()
+                    if not deleted:
                         raise Exception("삭제할 사용자 프로필을 찾을 수 없습니다")
                     
-                    conn.commit()
+                    invalidation.commit(conn, cursor, keys=self.profile_cache_keys(user_id, deleted['google_id']))
                     return True
         except Exception as e:
             raise Exception(f"사용자 프로필 삭제 실패: {str(e)}")
+    
+    def profile_cache_keys(self, user_id: int, google_id: str) -> List[str]:
+        """프로필 캐시 키 (쓰기 경로에서 invalidation.commit에 전달)"""
+        return [profile_key(user_id), profile_google_key(google_id)]
+    
+    def _cache_profile(self, row: dict, generation: int) -> UserProfile:
+        """조회한 프로필을 ID/구글 ID 두 키로 캐시 (generation 이후 무효화된 키는 저장하지 않음)"""
+        profile = self._dict_to_profile(row)
+        cache.set(profile_key(profile.id), profile, generation=generation)
+        cache.set(profile_google_key(profile.google_id), profile, generation=generation)
+        return profile
+    
+    def _dict_to_profile(self, row: dict) -> UserProfile:
+        """데이터베이스 행을 UserProfile 객체로 변환"""
+        return UserProfile(
+            id=row['id'],
+            google_id=row['google_id'],
+            email=row['email'],
+            username=row['username'],
+            age=row['age'],
+            birth=row['birth'],
+            height=row['height'],
+            weight=row['weight'],
+            address=row['address'],
+            protector_name=row['protector_name'],
+            protector_phone=row['protector_phone'],
+            protector_relationship=row['protector_relationship'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
 
 # 전역 서비스 인스턴스
 user_service = UserService()
-
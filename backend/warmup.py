@@ -0,0 +1,126 @@
+"""
+서버 시작 준비 모듈
+배포 직후 첫 요청이 느려지지 않도록 서버 시작 시 무거운 초기화를 미리 수행합니다.
+
+- 데이터베이스 연결 확인 (드라이버/DNS/인증 초기화)
+- 평균 영양소 참조 데이터 캐시 로드
+- NumPy 로드 (영양소 비교 계산용)
+- 작은 합성 이미지로 ROI 처리 한 번 실행 (OpenCV/PIL 초기화)
+- 클로바 OCR API 서버에 미리 연결 (TLS 핸드셰이크)
+
+모든 단계가 끝나야 /ready 가 200을 반환합니다. 단계가 실패해도 서버는 계속 동작하며,
+실패 내용은 로그와 /ready 응답에 남습니다.
+"""
+
+import base64
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from clova_ocr import get_ocr_engine, get_ocr_executor
+from config import config
+from database import db
+from logger import get_logger
+from reference_data import average_nutrition_cache
+
+logger = get_logger(__name__)
+
+
+def _check_database() -> Any:
+    if not db.test_connection():
+        raise RuntimeError("데이터베이스 연결 실패")
+    return "ok"
+
+
+def _load_reference_data() -> Any:
+    # 운영 모드에서 부모 프로세스가 미리 읽어 둔 경우에는 다시 읽지 않음 (워커 간 메모리 공유 유지)
+    return {"age_groups": len(average_nutrition_cache.age_groups())}
+
+
+def _load_numpy() -> Any:
+    import numpy
+    return numpy.__version__
+
+
+def synthetic_label_image() -> str:
+    """ROI 처리 준비용 작은 합성 영양성분표 이미지 (base64 JPEG)"""
+    import cv2
+    import numpy as np
+    
+    image = np.full((240, 180, 3), 255, dtype=np.uint8)
+    cv2.rectangle(image, (20, 20), (160, 220), (0, 0, 0), 2)
+    for y in range(50, 220, 24):
+        cv2.line(image, (20, y), (160, y), (0, 0, 0), 1)
+        cv2.putText(image, "kcal 100", (28, y - 6), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
+    _, encoded = cv2.imencode(".jpg", image)
+    return base64.b64encode(encoded.tobytes()).decode("utf-8")
+
+
+def _run_roi_processor() -> Any:
+    # 실제 요청과 같은 OCR 스레드 풀에서 실행 (스레드 풀과 OpenCV 스레드 설정도 함께 준비)
+    executor = get_ocr_executor()
+    result = executor.submit(get_ocr_engine().roi_processor.process_image_with_roi, synthetic_label_image()).result()
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+    return {"roi_bbox": result["roi_bbox"]}
+
+
+def _preconnect_ocr() -> Any:
+    if not (config.WARMUP_OCR_PRECONNECT and config.is_api_configured()):
+        return "skipped"
+    return {"status_code": get_ocr_engine().preconnect(timeout=config.WARMUP_TIMEOUT_SECONDS)}
+
+
+class Warmup:
+    """서버 시작 준비 단계 실행 및 준비 상태 관리"""
+    
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any]]]):
+        self.steps = steps
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+    
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+    
+    def mark_ready(self) -> None:
+        """준비 작업 없이 바로 준비 완료로 표시 (WARMUP_ENABLED=false)"""
+        self._done.set()
+    
+    def run(self) -> None:
+        """준비 단계를 순서대로 실행 (단계 실패는 기록만 하고 다음 단계 진행)"""
+        self.started_at = time.time()
+        for name, step in self.steps:
+            start = time.perf_counter()
+            try:
+                detail = step()
+                self.results[name] = {"ok": True, "detail": detail}
+            except Exception as e:
+                self.results[name] = {"ok": False, "error": str(e)}
+                logger.warning("서버 시작 준비 단계 실패: %s", e, extra={"step": name})
+            self.results[name]["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        
+        self.finished_at = time.time()
+        self._done.set()
+        logger.info(
+            "서버 시작 준비 완료",
+            extra={"duration_ms": round((self.finished_at - self.started_at) * 1000, 1), "steps": self.results}
+        )
+    
+    def status(self) -> Dict[str, Any]:
+        """/ready 응답 본문"""
+        return {
+            "ready": self.ready,
+            "steps": self.results
+        }
+
+
+# 전역 준비 작업 인스턴스
+warmup = Warmup([
+    ("database", _check_database),
+    ("reference_data", _load_reference_data),
+    ("numpy", _load_numpy),
+    ("roi_processor", _run_roi_processor),
+    ("ocr_preconnect", _preconnect_ocr),
+])
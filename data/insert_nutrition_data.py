@@ -12,6 +12,8 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 # database.py의 Database 클래스를 사용
 from database import Database
+# 실행 중인 서버들의 평균 영양소 캐시 무효화용
+from invalidation import publish
 
 def get_db():
     """데이터베이스 인스턴스 반환"""
@@ -146,6 +148,9 @@ def insert_data_to_db(db, data_list):
                 """
                 
                 cursor.executemany(insert_query, data_list)
+                
+                # 커밋과 함께 실행 중인 서버 프로세스에 평균 영양소 캐시 갱신 알림
+                publish(cursor, tables=["average_nutrition"])
                 conn.commit()
                 
                 print(f"✅ 데이터 삽입 완료: {len(data_list)}개 레코드")
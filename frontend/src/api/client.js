@@ -13,6 +13,30 @@ const asyncResponse = (data, error = null, delay = 300) => {
   });
 };
 
+// 세션 토큰 (로그인/프로필 생성·수정 응답에서 받아 저장)
+const SESSION_TOKEN_KEY = 'session_token';
+
+const saveSessionToken = (data) => {
+  if (data?.session_token) {
+    localStorage.setItem(SESSION_TOKEN_KEY, data.session_token);
+  }
+};
+
+// 저장된 세션 토큰이 있으면 Authorization 헤더 추가
+const authHeaders = (headers = {}) => {
+  const token = localStorage.getItem(SESSION_TOKEN_KEY);
+  return token ? { ...headers, Authorization: `Bearer ${token}` } : headers;
+};
+
+// 세션 토큰이 있으면 서버가 토큰의 사용자를 사용하므로 user_id 파라미터를 보내지 않음
+const userIdParam = (userId) => (localStorage.getItem(SESSION_TOKEN_KEY) ? null : userId);
+
+// 로그아웃/탈퇴 시 저장된 사용자 정보와 세션 토큰 삭제
+export const clearSession = () => {
+  localStorage.removeItem('user_id');
+  localStorage.removeItem(SESSION_TOKEN_KEY);
+};
+
 // API 요청 함수들
 export const api = {
   
@@ -21,11 +45,12 @@ export const api = {
     // 특정 날짜의 식사 목록 조회
     getMealsByDate: async (date, userId = null) => {
       try {
+        userId = userIdParam(userId);
         const url = userId 
           ? `http://localhost:8000/meals/${date}?user_id=${userId}`
           : `http://localhost:8000/meals/${date}`;
         
-        const response = await fetch(url);
+        const response = await fetch(url, { headers: authHeaders() });
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -37,18 +62,42 @@ export const api = {
       }
     },
     
+    // 기간 내 날짜별 식사 목록 조회 (한 번의 요청)
+    getMealsByRange: async (startDate, endDate, userId = null, include = 'summary') => {
+      try {
+        userId = userIdParam(userId);
+        const params = new URLSearchParams({ start: startDate, end: endDate, include });
+        if (userId) {
+          params.append('user_id', userId);
+        }
+        
+        const response = await fetch(`http://localhost:8000/meals/range?${params.toString()}`, {
+          headers: authHeaders(),
+        });
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const result = await response.json();
+        return { data: result.data, error: null };
+      } catch (error) {
+        console.error('기간별 식사 조회 오류:', error);
+        return { data: null, error: error.message };
+      }
+    },
+    
     // 식사 추가
     addMeal: async (mealData, userId = null) => {
       try {
+        userId = userIdParam(userId);
         const url = userId 
           ? `http://localhost:8000/meals?user_id=${userId}`
           : 'http://localhost:8000/meals';
         
         const response = await fetch(url, {
           method: 'POST',
-          headers: {
+          headers: authHeaders({
             'Content-Type': 'application/json',
-          },
+          }),
           body: JSON.stringify(mealData),
         });
         
@@ -124,11 +173,12 @@ export const api = {
     // 식사 요약 조회
     getMealSummary: async (date, userId = null) => {
       try {
+        userId = userIdParam(userId);
         const url = userId 
           ? `http://localhost:8000/meals/summary/${date}?user_id=${userId}`
           : `http://localhost:8000/meals/summary/${date}`;
         
-        const response = await fetch(url);
+        const response = await fetch(url, { headers: authHeaders() });
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -180,7 +230,9 @@ export const api = {
     // 사용자 영양소와 평균 비교
     compareUserNutrition: async (userId, targetDate) => {
       try {
-        const response = await fetch(`http://localhost:8000/nutrition/compare/${userId}/${targetDate}`);
+        const response = await fetch(`http://localhost:8000/nutrition/compare/${userId}/${targetDate}`, {
+          headers: authHeaders(),
+        });
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -201,9 +253,9 @@ export const api = {
         
         const response = await fetch(url, {
           method: 'POST',
-          headers: {
+          headers: authHeaders({
             'Content-Type': 'application/json',
-          },
+          }),
           body: JSON.stringify(nutritionData),
         });
         
@@ -222,7 +274,9 @@ export const api = {
     // 영양소 기록 조회
     getNutritionRecords: async (userId, targetDate) => {
       try {
-        const response = await fetch(`http://localhost:8000/nutrition/records/${userId}/${targetDate}`);
+        const response = await fetch(`http://localhost:8000/nutrition/records/${userId}/${targetDate}`, {
+          headers: authHeaders(),
+        });
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -296,6 +350,7 @@ export const api = {
         }
         
         const result = await response.json();
+        saveSessionToken(result.data);
         return { data: result.data, error: null };
       } catch (error) {
         console.error('구글 인증 오류:', error);
@@ -319,6 +374,7 @@ export const api = {
         }
         
         const result = await response.json();
+        saveSessionToken(result.data);
         return { data: result.data, error: null };
       } catch (error) {
         console.error('사용자 프로필 생성 오류:', error);
@@ -329,7 +385,7 @@ export const api = {
     // 사용자 프로필 조회
     getProfile: async (userId) => {
       try {
-        const response = await fetch(`http://localhost:8000/user/profile/${userId}`, {headers: {'Accept': 'application/json'}});
+        const response = await fetch(`http://localhost:8000/user/profile/${userId}`, {headers: authHeaders({'Accept': 'application/json'})});
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -346,9 +402,9 @@ export const api = {
       try {
         const response = await fetch(`http://localhost:8000/user/profile/${userId}`, {
           method: 'PUT',
-          headers: {
+          headers: authHeaders({
             'Content-Type': 'application/json',
-          },
+          }),
           body: JSON.stringify(profileData),
         });
         
@@ -357,6 +413,7 @@ export const api = {
         }
         
         const result = await response.json();
+        saveSessionToken(result.data);
         return { data: result.data, error: null };
       } catch (error) {
         console.error('사용자 프로필 수정 오류:', error);
@@ -369,6 +426,7 @@ export const api = {
       try {
         const response = await fetch(`http://localhost:8000/user/profile/${userId}`, {
           method: 'DELETE',
+          headers: authHeaders(),
         });
         
         if (!response.ok) {
@@ -318,7 +318,7 @@ export const AddMealModal: React.FC<AddMealModalProps> = ({
         console.log('✅ 식사 수정 성공');
       } else {
         // 추가 모드
-        const { data, error } = await api.meals.addMeal(backendMealData, 1 as any); // user_id: 1
+        const { data, error } = await api.meals.addMeal(backendMealData, localStorage.getItem('user_id') as any);
         if (error) {
           setValidationError(`식사 추가 실패: ${error}`);
           return;
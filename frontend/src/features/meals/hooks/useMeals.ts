@@ -42,7 +42,7 @@ export const useMeals = () => {
   // 특정 날짜의 식사 목록을 API에서 가져오기
   const fetchMealsByDate = useCallback(async (date: Date) => {
     const dateString = toKoreanDateString(date);
-    const userId = 1; // 임시로 1번 사용자 사용
+    const userId = localStorage.getItem('user_id'); // 세션 토큰이 있으면 서버가 토큰의 사용자를 사용
     console.log(`🔍 식사 목록 조회 시작: ${dateString}, user_id: ${userId}`);
     setLoading(true);
     setError(null);
@@ -83,6 +83,41 @@ export const useMeals = () => {
     }
   }, []); // 빈 의존성 배열로 고정
 
+  // 기간 내 모든 날짜의 식사 목록을 한 번의 API 호출로 가져오기 (날짜 문자열별 식사 목록 반환)
+  const fetchMealsByRange = useCallback(async (startDate: Date, endDate: Date): Promise<Record<string, Meal[]>> => {
+    const startString = toKoreanDateString(startDate);
+    const endString = toKoreanDateString(endDate);
+    const userId = localStorage.getItem('user_id'); // 세션 토큰이 있으면 서버가 토큰의 사용자를 사용
+    setLoading(true);
+    setError(null);
+    
+    try {
+      const { data, error: apiError } = await api.meals.getMealsByRange(startString, endString, userId as any, 'meals');
+      
+      if (apiError) {
+        setError(apiError);
+        return {};
+      }
+      
+      const mealsByDate: Record<string, Meal[]> = {};
+      if (data && data.days) {
+        for (const day of data.days) {
+          mealsByDate[day.date] = (day.meals || []).map(convertApiMealToMeal);
+        }
+        setMeals(prev => ({
+          ...prev,
+          ...mealsByDate
+        }));
+      }
+      return mealsByDate;
+    } catch (err) {
+      setError(err instanceof Error ? err.message : '식사 목록을 가져오는데 실패했습니다.');
+      return {};
+    } finally {
+      setLoading(false);
+    }
+  }, []);
+
   const getMealsByDate = (date: Date) => {
     const dateString = toKoreanDateString(date);
     return (meals[dateString] || []).sort((a, b) => {
@@ -167,6 +202,7 @@ export const useMeals = () => {
     updateMeal,
     addMeal,
     fetchMealsByDate,
+    fetchMealsByRange,
     loading,
     error
   };
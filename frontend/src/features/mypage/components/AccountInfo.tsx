@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { api } from '../../../api/client';
+import { api, clearSession } from '../../../api/client';
 import { Input } from '../../.././components/ui/Input';
 import { Select } from '../../../components/ui/Select';
 import { Button } from '../../../components/ui/Button';
@@ -351,8 +351,7 @@ export const AccountInfo: React.FC = () => {
               )}
             </div>
             <Button type="submit" className="w-full mt-6 bg-gray-400" onClick={() => {
-              localStorage.removeItem('user_id');
-              // localStorage.removeItem('token');
+              clearSession();
               window.location.href = '/login';
             }}>
               로그아웃
@@ -1,4 +1,5 @@
 import { create } from 'zustand';
+import { clearSession } from '../api/client';
 
 export const useAuthStore = create((set) => ({
   user: null,
@@ -14,6 +15,7 @@ export const useAuthStore = create((set) => ({
     await new Promise(resolve => setTimeout(resolve, 1000)); // 가상의 API 딜레이
   },
   logout: () => {
+    clearSession();
     set({ user: null, isAuthenticated: false });
   },
   setUser: (user) => {
@@ -15,7 +15,7 @@ export const CalendarPage = () => {
   const [selectedMeal, setSelectedMeal] = useState<Meal | null>(null);
   const [mealToDelete, setMealToDelete] = useState<Meal | null>(null);
   
-  const { getMealsByDate, deleteMeal, updateMeal, fetchMealsByDate, loading, error } = useMeals();
+  const { getMealsByDate, deleteMeal, updateMeal, fetchMealsByDate, fetchMealsByRange, loading, error } = useMeals();
   const [isFutureModalOpen, setIsFutureModalOpen] = useState(false);
 
   // 현재 월의 시작일과 마지막일
@@ -48,18 +48,10 @@ export const CalendarPage = () => {
     setSelectedDate(getKoreanDate());
   };
 
-  // 월이 변경될 때 해당 월의 모든 날짜에 대해 식사 데이터 미리 로드
+  // 월이 변경될 때 해당 월의 식사 데이터를 한 번의 요청으로 미리 로드
   useEffect(() => {
-    const loadMonthMeals = async () => {
-      for (const date of calendarDays) {
-        if (isSameMonth(date, currentDate)) {
-          fetchMealsByDate(date);
-        }
-      }
-    };
-    
-    loadMonthMeals();
-  }, [currentDate, fetchMealsByDate]);
+    fetchMealsByRange(startOfMonth(currentDate), endOfMonth(currentDate));
+  }, [currentDate, fetchMealsByRange]);
 
   // 날짜 클릭 핸들러
   const handleDateClick = (date: Date) => {
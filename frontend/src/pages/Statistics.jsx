@@ -33,7 +33,7 @@ export const StatisticsPage = () => {
     meals: []
   });
   
-  const { getMealsByDate, fetchMealsByDate } = useMeals();
+  const { fetchMealsByRange } = useMeals();
 
   // 현재 주의 시작일과 마지막일 계산
   const weekStart = startOfWeek(currentWeek, { weekStartsOn: 0 }); // 일요일 시작
@@ -51,13 +51,12 @@ export const StatisticsPage = () => {
     console.log('📊 Statistics: 주간 통계 계산 시작');
     console.log('📅 주간 날짜들:', weekDays.map(d => toKoreanDateString(d)));
 
-    // 주간의 각 날짜에 대해 데이터 로드 및 통계 계산
+    // 한 주의 식사를 기간 조회 한 번으로 가져와 날짜별로 계산
+    const mealsByDate = await fetchMealsByRange(weekStart, weekEnd);
+
     for (const date of weekDays) {
       const dateString = toKoreanDateString(date);
-      console.log(`🔍 날짜 ${dateString} 데이터 로드 중...`);
-      
-      await fetchMealsByDate(date);
-      const meals = getMealsByDate(date);
+      const meals = mealsByDate[dateString] || [];
       
       console.log(`📋 ${dateString} 조회된 식사 수:`, meals.length);
       console.log(`🍽️ ${dateString} 식사 데이터:`, meals);
@@ -96,13 +95,13 @@ export const StatisticsPage = () => {
     console.log('📅 일일 칼로리:', dailyCalories.map(d => ({ date: toKoreanDateString(d.date), calories: d.calories })));
 
     setWeeklyStats(stats);
-  }, [weekDays, getMealsByDate, fetchMealsByDate]);
+  }, [currentWeek, fetchMealsByRange]);
 
   // 오늘의 영양소 분석 계산
   const calculateTodayStats = useCallback(async () => {
     const today = getKoreanDate();
-    await fetchMealsByDate(today);
-    const meals = getMealsByDate(today);
+    const mealsByDate = await fetchMealsByRange(today, today);
+    const meals = mealsByDate[toKoreanDateString(today)] || [];
     
     const stats = {
       totalCalories: meals.reduce((sum, meal) => sum + (meal.calories || 0), 0),
@@ -118,7 +117,7 @@ export const StatisticsPage = () => {
     };
     
     setTodayStats(stats);
-  }, [getMealsByDate, fetchMealsByDate]);
+  }, [fetchMealsByRange]);
 
   // 주 변경 시 통계 재계산
   useEffect(() => {